@@ -4,31 +4,17 @@
 Interface graphique pour la connexion au serveur Robont et récupération de configuration switch
 """
 
-import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext, filedialog
-import time
 import threading
 import re
 from datetime import datetime
 import os
 import sys
 
-# Vérifier et installer paramiko si nécessaire
-try:
-    import paramiko
-except ImportError:
-    print("Installation de paramiko en cours...")
-    try:
-        import subprocess
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "paramiko"])
-        import paramiko
-        print("Paramiko installé avec succès!")
-    except Exception as e:
-        messagebox.showerror("Erreur de dépendance", 
-            f"Impossible d'installer paramiko: {e}\n\n"
-            "Veuillez installer manuellement:\n"
-            "pip install paramiko")
-        sys.exit(1)
+# tkinter n'est chargé qu'au lancement de l'interface, paramiko (installé si
+# nécessaire) à la première connexion
+from network_management_suite import (ConfigurationParser, AccessPortClassifier, RobontSession, LazyTextInserter,
+                                      UIEventQueue, TEMPLATES, config_digest, summarize_config,
+                                      tk, ttk, messagebox, scrolledtext, filedialog, paramiko)
 
 class RobontSwitchGUI:
     def __init__(self, root):
@@ -37,13 +23,23 @@ class RobontSwitchGUI:
         self.root.geometry("1200x900")
         self.root.configure(bg='#f0f0f0')
         
+        # File d'événements : les threads de travail ne touchent jamais Tk directement
+        self.ui = UIEventQueue(self.root)
+        self.ui.start()
+        
+        # La session Robont vit aussi longtemps que la fenêtre
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
         # Variables
-        self.ssh_client = None
-        self.channel = None
+        self.robont_session = None
+        self.text_loaders = {}
         self.switch_hostname = None
         self.is_connecting = False
         self.config_data = ""
+        self.config_parser = None
+        self.config_summary = None
         self.current_view = "dashboard"
+        self.views = {}
         self.access_interfaces = []
         self.ise_config_generated = ""
         
@@ -126,22 +122,29 @@ class RobontSwitchGUI:
         
         self.current_view = view_name
         
-        # Effacer la zone principale
-        for widget in self.main_area.winfo_children():
-            widget.destroy()
-        
-        # Afficher la vue correspondante
-        if view_name == "dashboard":
-            self.show_dashboard()
-        elif view_name == "robont":
-            self.show_robont_manager()
-        elif view_name == "ise":
-            self.show_ise_config()
+        # Masquer la vue affichée (les widgets et leur contenu sont conservés)
+        for name, view in self.views.items():
+            if name != view_name:
+                view.pack_forget()
+        
+        # Construire la vue au premier affichage seulement
+        view = self.views.get(view_name)
+        if view is None:
+            builders = {
+                "dashboard": self.show_dashboard,
+                "robont": self.show_robont_manager,
+                "ise": self.show_ise_config,
+            }
+            view = tk.Frame(self.main_area, bg='#f0f0f0')
+            builders[view_name](view)
+            self.views[view_name] = view
+        
+        view.pack(fill='both', expand=True)
     
-    def show_dashboard(self):
+    def show_dashboard(self, parent):
         """Affiche le tableau de bord"""
         # Titre
-        title_frame = tk.Frame(self.main_area, bg='#3498db', height=80)
+        title_frame = tk.Frame(parent, bg='#3498db', height=80)
         title_frame.pack(fill='x', padx=0, pady=0)
         title_frame.pack_propagate(False)
         
@@ -150,7 +153,7 @@ class RobontSwitchGUI:
         title_label.pack(pady=25)
         
         # Contenu principal
-        content_frame = tk.Frame(self.main_area, bg='#f0f0f0')
+        content_frame = tk.Frame(parent, bg='#f0f0f0')
         content_frame.pack(fill='both', expand=True, padx=30, pady=30)
         
         # Cards de statut
@@ -223,10 +226,10 @@ class RobontSwitchGUI:
         info_text.insert(tk.END, info_content)
         info_text.config(state='disabled')
     
-    def show_robont_manager(self):
+    def show_robont_manager(self, parent):
         """Affiche le gestionnaire Robont (interface originale)"""
         # Titre
-        title_frame = tk.Frame(self.main_area, bg='#2c3e50', height=60)
+        title_frame = tk.Frame(parent, bg='#2c3e50', height=60)
         title_frame.pack(fill='x', padx=0, pady=0)
         title_frame.pack_propagate(False)
         
@@ -235,7 +238,7 @@ class RobontSwitchGUI:
         title_label.pack(pady=15)
         
         # Frame principal avec scroll
-        main_frame = tk.Frame(self.main_area, bg='#f0f0f0')
+        main_frame = tk.Frame(parent, bg='#f0f0f0')
         main_frame.pack(fill='both', expand=True, padx=20, pady=20)
         
         # === SECTION SERVEUR ROBONT ===
@@ -360,10 +363,10 @@ class RobontSwitchGUI:
                                      font=('Arial', 9, 'italic'), bg='#f0f0f0', fg='#27ae60')
         self.hostname_label.pack(side='right', padx=5)
     
-    def show_ise_config(self):
+    def show_ise_config(self, parent):
         """Affiche l'interface ISE Switch Config avec fonctionnalités complètes"""
         # Titre
-        title_frame = tk.Frame(self.main_area, bg='#e67e22', height=60)
+        title_frame = tk.Frame(parent, bg='#e67e22', height=60)
         title_frame.pack(fill='x', padx=0, pady=0)
         title_frame.pack_propagate(False)
         
@@ -372,7 +375,7 @@ class RobontSwitchGUI:
         title_label.pack(pady=15)
         
         # Frame principal
-        main_frame = tk.Frame(self.main_area, bg='#f0f0f0')
+        main_frame = tk.Frame(parent, bg='#f0f0f0')
         main_frame.pack(fill='both', expand=True, padx=20, pady=20)
         
         # === SECTION STATUT ===
@@ -460,8 +463,12 @@ class RobontSwitchGUI:
                 self.generate_btn.config(state='disabled')
                 return
             
-            # Analyser les interfaces en mode access
-            self.access_interfaces = self.find_access_interfaces(self.config_data)
+            # Analyser les interfaces en mode access (résumé de la récupération s'il est à jour)
+            summary = self.config_summary
+            if summary and summary['sha256'] == config_digest(self.config_data):
+                self.access_interfaces = list(summary['access_interfaces'])
+            else:
+                self.access_interfaces = self.find_access_interfaces(self.config_data)
             
             # Mettre à jour l'interface
             self.interfaces_listbox.delete(0, tk.END)
@@ -498,45 +505,11 @@ class RobontSwitchGUI:
         access_interfaces = []
         
         try:
-            lines = config_data.split('\n')
-            interface_configs = {}
-            
-            # Analyser chaque ligne de configuration
-            for line in lines:
-                line = line.strip()
-                if not line or line.startswith('#'):
-                    continue
-                
-                # Rechercher les configurations d'interface
-                interface_match = re.search(r'set interfaces (ge-\d+/\d+/\d+)', line)
-                if interface_match:
-                    interface = interface_match.group(1)
-                    if interface not in interface_configs:
-                        interface_configs[interface] = []
-                    interface_configs[interface].append(line)
-            
-            # Identifier les interfaces en mode access
-            for interface, configs in interface_configs.items():
-                is_access = False
-                has_vlan = False
-                is_trunk = False
-                
-                for config in configs:
-                    # Vérifier si c'est un port access
-                    if 'interface-mode access' in config:
-                        is_access = True
-                    elif 'interface-mode trunk' in config:
-                        is_trunk = True
-                    elif 'vlan members' in config and 'interface-mode' not in config:
-                        has_vlan = True
-                
-                # Une interface est access si elle a le mode access explicite
-                # ou si elle a un VLAN assigné sans être trunk
-                if is_access or (has_vlan and not is_trunk):
-                    access_interfaces.append(interface)
-            
-            # Trier les interfaces
-            access_interfaces.sort(key=lambda x: [int(i) for i in re.findall(r'\d+', x)])
+            # Classification en un seul passage (ELS / non-ELS, ge-/xe-/mge-/et-,
+            # trunks exclus) sur la configuration avec ranges et groupes résolus
+            self.config_parser = ConfigurationParser(config_data)
+            expanded_lines = self.config_parser.get_expanded_lines()
+            access_interfaces = [port['name'] for port in AccessPortClassifier.classify(expanded_lines)]
             
         except Exception as e:
             print(f"Erreur analyse interfaces: {e}")
@@ -557,8 +530,7 @@ class RobontSwitchGUI:
             self.ise_config_generated = ise_config
             
             # Afficher dans la zone de texte
-            self.ise_results_text.delete(1.0, tk.END)
-            self.ise_results_text.insert(tk.END, ise_config)
+            self.show_text(self.ise_results_text, ise_config)
             
             # Activer les boutons de sauvegarde
             self.ise_save_btn.config(state='normal')
@@ -579,86 +551,69 @@ class RobontSwitchGUI:
         except Exception as e:
             messagebox.showerror("Erreur", f"Erreur lors de la génération de la configuration ISE: {str(e)}")
     
-    def create_ise_configuration(self):
-        """Crée la configuration ISE complète"""
-        config_lines = []
-        
+    def iter_ise_configuration(self):
+        """Génère la configuration ISE ligne par ligne (écriture directe vers un fichier ou socket)"""
         # En-tête
-        config_lines.append("# Configuration ISE générée automatiquement")
-        config_lines.append(f"# Générée le: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
+        yield "# Configuration ISE générée automatiquement"
+        yield f"# Générée le: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}"
         if self.switch_hostname:
-            config_lines.append(f"# Switch: {self.switch_hostname}")
-        config_lines.append(f"# Nombre d'interfaces configurées: {len(self.access_interfaces)}")
-        config_lines.append("#" + "="*60)
-        config_lines.append("")
+            yield f"# Switch: {self.switch_hostname}"
+        yield f"# Nombre d'interfaces configurées: {len(self.access_interfaces)}"
+        yield "#" + "="*60
+        yield ""
         
         # 1. Configuration RADIUS
-        config_lines.append("# ===== CONFIGURATION RADIUS =====")
-        config_lines.append("")
-        
-        radius_config = [
-            "set access radius-server 10.147.32.47 port 1812",
-            "set access radius-server 10.147.32.47 secret \"$9$qfTF69tBRcP5Qn9tREdbwsoJUjH.fT\"",
-            "set access radius-server 10.147.32.47 source-address 10.148.62.185",
-            "set access radius-server 10.147.160.47 port 1812",
-            "set access radius-server 10.147.160.47 secret \"$9$72Vw2oJUkm5dbs4JUmPBIREreM8XNVw\"",
-            "set access radius-server 10.147.160.47 source-address 10.148.62.185",
-            "set access profile 802.1x-auth accounting-order radius",
-            "set access profile 802.1x-auth authentication-order radius",
-            "set access profile 802.1x-auth radius authentication-server 10.147.32.47",
-            "set access profile 802.1x-auth radius authentication-server 10.147.160.47",
-            "set access profile 802.1x-auth radius accounting-server 10.147.32.47",
-            "set access profile 802.1x-auth radius accounting-server 10.147.160.47",
-            "set protocols dot1x authenticator authentication-profile-name 802.1x-auth"
-        ]
+        yield "# ===== CONFIGURATION RADIUS ====="
+        yield ""
+        
+        # Changeset minimal : les déclarations déjà présentes sur le switch sont omises
+        parser = self.config_parser or ConfigurationParser(self.config_data)
+        profile = TEMPLATES.get_profile()
+        radius_config = TEMPLATES.render_radius_block("10.148.62.185")
         
-        config_lines.extend(radius_config)
-        config_lines.append("")
+        yield from (line for line in radius_config if not parser.has_statement(line))
+        yield ""
         
         # 2. Configuration des interfaces access
-        config_lines.append("# ===== CONFIGURATION DOT1X PAR INTERFACE =====")
-        config_lines.append("")
+        yield "# ===== CONFIGURATION DOT1X PAR INTERFACE ====="
+        yield ""
         
         for interface in self.access_interfaces:
-            config_lines.append(f"# Configuration pour {interface}")
-            dot1x_config = [
-                f"set protocols dot1x authenticator interface {interface} supplicant multiple",
-                f"set protocols dot1x authenticator interface {interface} retries 3",
-                f"set protocols dot1x authenticator interface {interface} transmit-period 1",
-                f"set protocols dot1x authenticator interface {interface} reauthentication 3600",
-                f"set protocols dot1x authenticator interface {interface} supplicant-timeout 10",
-                f"set protocols dot1x authenticator interface {interface} maximum-requests 3",
-                f"set protocols dot1x authenticator interface {interface} mac-radius"
-            ]
-            config_lines.extend(dot1x_config)
-            config_lines.append("")
+            yield f"# Configuration pour {interface}"
+            dot1x_config = TEMPLATES.render_dot1x_block(interface)
+            yield from (line for line in dot1x_config if not parser.has_statement(line))
+            yield ""
         
         # 3. Suppression des configurations secure-access-port
-        config_lines.append("# ===== SUPPRESSION DES CONFIGURATIONS SECURE-ACCESS-PORT =====")
-        config_lines.append("")
+        yield "# ===== SUPPRESSION DES CONFIGURATIONS SECURE-ACCESS-PORT ====="
+        yield ""
         
         for interface in self.access_interfaces:
-            config_lines.append(f"# Suppression secure-access-port pour {interface}")
+            yield f"# Suppression secure-access-port pour {interface}"
             delete_config = [
                 f"delete ethernet-switching-options secure-access-port interface {interface} mac-limit 3",
                 f"delete ethernet-switching-options secure-access-port interface {interface} mac-limit action drop"
             ]
-            config_lines.extend(delete_config)
-            config_lines.append("")
+            # Suppression émise seulement si la déclaration existe
+            yield from (line for line in delete_config
+                        if parser.has_statement('set' + line[len('delete'):]))
+            yield ""
         
         # 4. Résumé
-        config_lines.append("# ===== RÉSUMÉ DE LA CONFIGURATION =====")
-        config_lines.append("#")
-        config_lines.append("# Configuration appliquée:")
-        config_lines.append("# • Serveurs RADIUS: 10.147.32.47 et 10.147.160.47")
-        config_lines.append("# • Profil d'accès: 802.1x-auth")
-        config_lines.append(f"# • Interfaces configurées: {len(self.access_interfaces)}")
-        config_lines.append("# • Authentification dot1x activée sur toutes les interfaces access")
-        config_lines.append("# • Configurations secure-access-port supprimées")
-        config_lines.append("#")
-        config_lines.append(f"# Interfaces concernées: {', '.join(self.access_interfaces)}")
-        
-        return "\n".join(config_lines)
+        yield "# ===== RÉSUMÉ DE LA CONFIGURATION ====="
+        yield "#"
+        yield "# Configuration appliquée:"
+        yield "# • Serveurs RADIUS: " + " et ".join(server['address'] for server in profile['radius_servers'])
+        yield f"# • Profil d'accès: {profile['access_profile']}"
+        yield f"# • Interfaces configurées: {len(self.access_interfaces)}"
+        yield "# • Authentification dot1x activée sur toutes les interfaces access"
+        yield "# • Configurations secure-access-port supprimées"
+        yield "#"
+        yield f"# Interfaces concernées: {', '.join(self.access_interfaces)}"
+    
+    def create_ise_configuration(self):
+        """Crée la configuration ISE complète"""
+        return "\n".join(self.iter_ise_configuration())
     
     def save_ise_config(self):
         """Sauvegarde la configuration ISE dans le répertoire courant"""
@@ -705,7 +660,7 @@ class RobontSwitchGUI:
             filename = filedialog.asksaveasfilename(
                 title="Télécharger la configuration ISE",
                 defaultextension=".txt",
-                initialname=default_filename,
+                initialfile=default_filename,
                 filetypes=[
                     ("Fichiers texte", "*.txt"),
                     ("Fichiers de configuration", "*.cfg"),
@@ -744,7 +699,7 @@ class RobontSwitchGUI:
             return False
         
         # Validation IP (CORRIGÉ)
-        ip_pattern = r'^(\d{1,3}\.){3}\d{1,3}
+        ip_pattern = r'^(\d{1,3}\.){3}\d{1,3}$'
         if not re.match(ip_pattern, self.switch_ip_entry.get().strip()):
             messagebox.showerror("Erreur", "Format d'adresse IP switch invalide")
             return False
@@ -752,10 +707,30 @@ class RobontSwitchGUI:
         return True
     
     def update_status(self, message, color='#7f8c8d'):
-        """Met à jour le statut"""
+        """Met à jour le statut (depuis n'importe quel thread, rafraîchissements fusionnés)"""
+        if threading.current_thread() is threading.main_thread():
+            self._apply_status(message, color)
+        else:
+            self.ui.post_latest('status', self._apply_status, message, color)
+    
+    def _apply_status(self, message, color):
+        """Applique le statut sur le thread Tk"""
         if hasattr(self, 'status_label'):
             self.status_label.config(text=message, fg=color)
-            self.root.update()
+            self.status_label.update_idletasks()
+    
+    def show_message(self, kind, title, message):
+        """Boîte de dialogue (info, warning, error) affichée sur le thread Tk"""
+        dialog = getattr(messagebox, 'show' + kind)
+        if threading.current_thread() is threading.main_thread():
+            dialog(title, message)
+        else:
+            self.ui.post(dialog, title, message)
+    
+    def report_fetch_progress(self, received):
+        """Progression de la récupération (appelé à chaque recv, fusionné par la file)"""
+        self.ui.post_latest('status', self._apply_status,
+                            f"Récupération de la configuration... {received // 1024} Ko reçus", '#3498db')
     
     def start_connection(self):
         """Démarre la connexion dans un thread séparé"""
@@ -768,195 +743,111 @@ class RobontSwitchGUI:
         self.is_connecting = True
         self.connect_btn.config(state='disabled', text="CONNEXION EN COURS...")
         self.progress_bar.start()
-        self.results_text.delete(1.0, tk.END)
+        self.show_text(self.results_text, "")
+        
+        # Valeurs lues ici : le thread de travail ne lit pas les widgets
+        credentials = (
+            self.server_user_entry.get().strip(),
+            self.server_pass_entry.get().strip(),
+            self.switch_ip_entry.get().strip(),
+            self.switch_user_entry.get().strip(),
+            self.switch_pass_entry.get().strip()
+        )
         
         # Lancer dans un thread pour éviter de bloquer l'interface
-        thread = threading.Thread(target=self.execute_connection)
+        thread = threading.Thread(target=self.execute_connection, args=credentials)
         thread.daemon = True
         thread.start()
     
-    def execute_connection(self):
-        """Exécute la connexion complète"""
+    def get_robont_session(self, username, password):
+        """Session Robont de la fenêtre, recréée si les identifiants changent"""
+        if self.robont_session is None or not self.robont_session.matches(username, password):
+            if self.robont_session:
+                self.robont_session.close()
+            self.robont_session = RobontSession(username, password)
+        return self.robont_session
+    
+    def execute_connection(self, server_user, server_pass, switch_ip, switch_user, switch_pass):
+        """Exécute la récupération via la session Robont persistante (thread de travail)"""
         try:
-            # Récupérer les valeurs
-            server_host = "6.91.128.111"
-            server_user = self.server_user_entry.get().strip()
-            server_pass = self.server_pass_entry.get().strip()
-            switch_ip = self.switch_ip_entry.get().strip()
-            switch_user = self.switch_user_entry.get().strip()
-            switch_pass = self.switch_pass_entry.get().strip()
+            session = self.get_robont_session(server_user, server_pass)
             
-            # Étape 1: Connexion serveur
-            self.update_status("Connexion au serveur Robont...", '#3498db')
-            if not self.connect_to_server(server_host, server_user, server_pass):
+            # Étape 1: Session serveur (ouverte une fois, rouverte si perdue)
+            if not self.connect_to_server(session):
                 return  # Arrêter si connexion serveur échoue
             
-            # Étape 2: Connexion switch
+            # Étape 2: Saut vers le switch et récupération config
             self.update_status("Connexion au switch...", '#3498db')
-            if not self.connect_to_switch(switch_ip, switch_user, switch_pass):
-                return  # Arrêter si connexion switch échoue
-            
-            # Étape 3: Récupération config
-            self.update_status("Récupération de la configuration...", '#3498db')
-            config_data = self.get_configuration()
-            
-            if config_data:
-                # Sauvegarder les données
+            status, config_data = session.fetch_configuration(
+                switch_ip, switch_user, switch_pass, on_progress=self.report_fetch_progress)
+            
+            if status == 'ok':
+                self.switch_hostname = self.extract_hostname(config_data)
+                # Résumé (interfaces access) calculé ici, hors du thread Tk
+                self.config_summary = summarize_config(config_data)
+                # Sauvegarder les données pour téléchargement
                 self.config_data = config_data
                 # Afficher dans l'interface
-                self.root.after(0, self.display_results, config_data)
+                self.ui.post(self.display_results, config_data)
                 self.update_status("Configuration récupérée avec succès!", '#27ae60')
             else:
-                self.update_status("Échec récupération configuration", '#e74c3c')
-                messagebox.showerror("Erreur", 
-                    "Impossible de récupérer la configuration du switch:\n"
-                    "• Vérifiez que la commande est supportée\n"
-                    "• Vérifiez les permissions de l'utilisateur")
+                self.report_switch_error(status)
                 
         except Exception as e:
             self.update_status("Erreur: " + str(e), '#e74c3c')
-            messagebox.showerror("Erreur", "Erreur inattendue: " + str(e))
+            self.show_message('error', "Erreur", "Erreur inattendue: " + str(e))
         finally:
             self.cleanup_connection()
     
-    def connect_to_server(self, host, username, password):
-        """Connexion au serveur Robont"""
+    def connect_to_server(self, session):
+        """Connexion au serveur Robont (seulement si la session n'est pas active)"""
+        if session.connected:
+            return True
+        
+        self.update_status("Connexion au serveur Robont...", '#3498db')
         try:
-            self.ssh_client = paramiko.SSHClient()
-            self.ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            
-            self.ssh_client.connect(
-                hostname=host,
-                port=22,
-                username=username,
-                password=password,
-                timeout=30
-            )
-            
-            self.channel = self.ssh_client.invoke_shell()
-            self.channel.settimeout(30)
-            time.sleep(2)
-            
-            # Lire prompt initial
-            self.read_channel_output(timeout=5)
+            session.ensure_connected()
             return True
             
         except paramiko.AuthenticationException:
             self.update_status("Échec authentification serveur", '#e74c3c')
-            messagebox.showerror("Erreur", "Mot de passe serveur incorrect")
+            self.show_message('error', "Erreur", "Mot de passe serveur incorrect")
             return False
         except Exception as e:
             self.update_status("Erreur serveur: " + str(e), '#e74c3c')
-            messagebox.showerror("Erreur", "Erreur connexion serveur: " + str(e))
+            self.show_message('error', "Erreur", "Erreur connexion serveur: " + str(e))
             return False
     
-    def connect_to_switch(self, switch_ip, username, password):
-        """Connexion au switch"""
-        try:
-            ssh_cmd = "ssh " + username + "@" + switch_ip + "\n"
-            self.channel.send(ssh_cmd)
-            time.sleep(3)
-            
-            output = self.read_channel_output(timeout=15)
-            
-            # Vérifier les erreurs de connexion
-            if any(error in output.lower() for error in [
-                "connection refused", "connection timed out", "no route to host",
-                "host unreachable", "network is unreachable", "connection closed",
-                "could not resolve hostname", "name or service not known"
-            ]):
-                self.update_status("Problème de connexion au switch", '#e74c3c')
-                messagebox.showerror("Erreur de Connexion", 
-                    "Problème de connexion vers le switch:\n"
-                    "• Vérifiez l'adresse IP du switch\n"
-                    "• Vérifiez que le switch est accessible depuis le serveur Robont\n"
-                    "• Vérifiez la connectivité réseau")
-                return False
-            
-            # Vérifier si un nom d'utilisateur invalide
-            if any(error in output.lower() for error in [
-                "invalid user", "user unknown", "no such user", "login incorrect"
-            ]):
-                self.update_status("Login switch erroné", '#e74c3c')
-                messagebox.showerror("Erreur d'Authentification", 
-                    "Login erroné pour le switch:\n"
-                    "• Vérifiez le nom d'utilisateur du switch\n"
-                    "• Assurez-vous que l'utilisateur existe sur le switch")
-                return False
-            
-            # Si mot de passe demandé
-            if "password:" in output.lower():
-                if not password.strip():
-                    self.update_status("Mot de passe switch requis", '#e74c3c')
-                    messagebox.showerror("Erreur", "Mot de passe switch requis")
-                    return False
-                
-                self.channel.send(password + "\n")
-                time.sleep(3)
-                auth_output = self.read_channel_output(timeout=10)
-                
-                # Vérifier échec authentification
-                if any(word in auth_output.lower() for word in [
-                    "denied", "failed", "incorrect", "authentication failure",
-                    "access denied", "login failed", "invalid password"
-                ]):
-                    self.update_status("Mot de passe switch erroné", '#e74c3c')
-                    messagebox.showerror("Erreur d'Authentification", 
-                        "Mot de passe erroné pour le switch:\n"
-                        "• Vérifiez le mot de passe du switch\n"
-                        "• Assurez-vous que les credentials sont corrects")
-                    return False
-            
-            # Tentative d'entrer en mode CLI
-            self.channel.send("cli\n")
-            time.sleep(2)
-            cli_output = self.read_channel_output(timeout=5)
-            
-            self.update_status("Connexion switch réussie", '#27ae60')
-            return True
-            
-        except Exception as e:
-            self.update_status("Erreur switch: " + str(e), '#e74c3c')
-            messagebox.showerror("Erreur de Connexion", 
-                "Erreur inattendue lors de la connexion au switch:\n" + str(e))
-            return False
-    
-    def get_configuration(self):
-        """Récupère la configuration avec la nouvelle commande"""
-        try:
-            config_cmd = "show configuration | display set | no-more\n"
-            self.channel.send(config_cmd)
-            time.sleep(5)
-            
-            output = self.read_channel_output(timeout=60)
-            
-            if output.strip():
-                # Extraire hostname
-                self.switch_hostname = self.extract_hostname(output)
-                return output
-            
-            return None
-            
-        except Exception as e:
-            print("Erreur récupération config: " + str(e))
-            return None
-    
-    def read_channel_output(self, timeout=15):
-        """Lit la sortie du channel"""
-        output = ""
-        start_time = time.time()
-        
-        while time.time() - start_time < timeout:
-            if self.channel.recv_ready():
-                data = self.channel.recv(4096).decode('utf-8', errors='ignore')
-                output += data
-                time.sleep(0.1)
-            else:
-                time.sleep(0.2)
-                if time.time() - start_time > 3 and output:
-                    break
-        
-        return output
+    def report_switch_error(self, status):
+        """Message d'erreur correspondant au statut de RobontSession.fetch_configuration"""
+        if status == 'connection':
+            self.update_status("Problème de connexion au switch", '#e74c3c')
+            self.show_message('error', "Erreur de Connexion", 
+                "Problème de connexion vers le switch:\n"
+                "• Vérifiez l'adresse IP du switch\n"
+                "• Vérifiez que le switch est accessible depuis le serveur Robont\n"
+                "• Vérifiez la connectivité réseau")
+        elif status == 'login':
+            self.update_status("Login switch erroné", '#e74c3c')
+            self.show_message('error', "Erreur d'Authentification", 
+                "Login erroné pour le switch:\n"
+                "• Vérifiez le nom d'utilisateur du switch\n"
+                "• Assurez-vous que l'utilisateur existe sur le switch")
+        elif status == 'password_required':
+            self.update_status("Mot de passe switch requis", '#e74c3c')
+            self.show_message('error', "Erreur", "Mot de passe switch requis")
+        elif status == 'password':
+            self.update_status("Mot de passe switch erroné", '#e74c3c')
+            self.show_message('error', "Erreur d'Authentification", 
+                "Mot de passe erroné pour le switch:\n"
+                "• Vérifiez le mot de passe du switch\n"
+                "• Assurez-vous que les credentials sont corrects")
+        else:
+            self.update_status("Échec récupération configuration", '#e74c3c')
+            self.show_message('error', "Erreur", 
+                "Impossible de récupérer la configuration du switch:\n"
+                "• Vérifiez que la commande est supportée\n"
+                "• Vérifiez les permissions de l'utilisateur")
     
     def extract_hostname(self, config_data):
         """Extrait le hostname"""
@@ -975,11 +866,25 @@ class RobontSwitchGUI:
         
         return "switch"
     
+    def show_text(self, widget, text):
+        """Affiche un texte (éventuellement très long) par insertion progressive"""
+        loader = self.text_loaders.get(str(widget))
+        if loader is None:
+            loader = self.text_loaders[str(widget)] = LazyTextInserter(widget)
+        loader.load(text)
+        return loader
+    
+    def widget_text(self, widget):
+        """Contenu complet d'un widget, y compris la partie pas encore insérée"""
+        loader = self.text_loaders.get(str(widget))
+        if loader is not None:
+            return loader.get()
+        return widget.get(1.0, tk.END)
+    
     def display_results(self, config_data):
         """Affiche les résultats dans l'interface"""
         if hasattr(self, 'results_text'):
-            self.results_text.delete(1.0, tk.END)
-            self.results_text.insert(tk.END, config_data)
+            self.show_text(self.results_text, config_data)
             
             # Activer boutons
             self.save_btn.config(state='normal')
@@ -996,7 +901,7 @@ class RobontSwitchGUI:
             if not hasattr(self, 'results_text'):
                 return
                 
-            config_data = self.results_text.get(1.0, tk.END)
+            config_data = self.widget_text(self.results_text)
             if not config_data.strip():
                 messagebox.showwarning("Attention", "Aucune configuration à sauvegarder")
                 return
@@ -1031,7 +936,7 @@ class RobontSwitchGUI:
             if not hasattr(self, 'results_text'):
                 return
                 
-            config_data = self.results_text.get(1.0, tk.END)
+            config_data = self.widget_text(self.results_text)
             if not config_data.strip():
                 messagebox.showwarning("Attention", "Aucune configuration à télécharger")
                 return
@@ -1049,7 +954,7 @@ class RobontSwitchGUI:
             filename = filedialog.asksaveasfilename(
                 title="Télécharger la configuration",
                 defaultextension=".txt",
-                initialname=default_filename,
+                initialfile=default_filename,
                 filetypes=[
                     ("Fichiers texte", "*.txt"),
                     ("Tous les fichiers", "*.*")
@@ -1088,27 +993,20 @@ class RobontSwitchGUI:
             return
             
         self.update_status("Test de connexion...", '#f39c12')
+        username = self.server_user_entry.get().strip()
+        password = self.server_pass_entry.get().strip()
         
         def test():
             try:
-                ssh_client = paramiko.SSHClient()
-                ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                
-                ssh_client.connect(
-                    hostname="6.91.128.111",
-                    port=22,
-                    username=self.server_user_entry.get().strip(),
-                    password=self.server_pass_entry.get().strip(),
-                    timeout=15
-                )
-                
-                ssh_client.close()
-                self.root.after(0, lambda: self.update_status("Test réussi!", '#27ae60'))
-                self.root.after(0, lambda: messagebox.showinfo("Test", "Connexion serveur réussie!"))
+                # La session ouverte pour le test est conservée pour la récupération
+                session = self.get_robont_session(username, password)
+                session.ensure_connected()
+                self.update_status("Test réussi!", '#27ae60')
+                self.show_message('info', "Test", "Connexion serveur réussie!")
                 
             except Exception as e:
-                self.root.after(0, lambda: self.update_status("Test échoué", '#e74c3c'))
-                self.root.after(0, lambda: messagebox.showerror("Test", "Échec connexion: " + str(e)))
+                self.update_status("Test échoué", '#e74c3c')
+                self.show_message('error', "Test", "Échec connexion: " + str(e))
         
         thread = threading.Thread(target=test)
         thread.daemon = True
@@ -1123,31 +1021,29 @@ class RobontSwitchGUI:
             self.switch_pass_entry.delete(0, tk.END)
             self.switch_ip_entry.delete(0, tk.END)
             self.switch_ip_entry.insert(0, "10.148.62.241")
-            self.results_text.delete(1.0, tk.END)
+            self.show_text(self.results_text, "")
             self.hostname_label.config(text="")
             self.save_btn.config(state='disabled')
             self.download_btn.config(state='disabled')
             self.open_folder_btn.config(state='disabled')
             self.config_data = ""
+            self.config_parser = None
+            self.config_summary = None
             self.update_status("Pret")
     
     def cleanup_connection(self):
-        """Nettoie les connexions"""
+        """Fin de récupération : la session Robont reste ouverte pour la suivante"""
         self.is_connecting = False
-        self.root.after(0, lambda: self.connect_btn.config(state='normal', text="SE CONNECTER ET RECUPERER CONFIG") if hasattr(self, 'connect_btn') else None)
-        self.root.after(0, lambda: self.progress_bar.stop() if hasattr(self, 'progress_bar') else None)
-        
-        try:
-            if self.channel:
-                self.channel.send("exit\n")
-                time.sleep(1)
-                self.channel.send("exit\n")
-                time.sleep(1)
-                self.channel.close()
-            if self.ssh_client:
-                self.ssh_client.close()
-        except:
-            pass
+        self.ui.post(lambda: self.connect_btn.config(state='normal', text="SE CONNECTER ET RECUPERER CONFIG") if hasattr(self, 'connect_btn') else None)
+        self.ui.post(lambda: self.progress_bar.stop() if hasattr(self, 'progress_bar') else None)
+    
+    def on_close(self):
+        """Fermeture de la fenêtre : fermeture de la session Robont"""
+        self.ui.stop()
+        if self.robont_session:
+            self.robont_session.close()
+            self.robont_session = None
+        self.root.destroy()
 
 def main():
     """Fonction principale"""
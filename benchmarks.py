@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmarks de la Network Management Suite
+Mesure les performances de l'analyse de configuration sur des configurations
+synthétiques de grande taille (virtual chassis de 10 membres par défaut).
+
+Usage:
+    python benchmarks.py [membres] [repetitions]
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from network_management_suite import (AccessPortClassifier, ChannelReader, ConfigImport, ConfigSearchIndex,
+                                      ConfigurationParser, SetSyntaxValidator, collect_config_sources)
+
+def build_large_config(members=10, ports=48):
+    """Génère une configuration 'display set' de virtual chassis"""
+    lines = ["set system host-name bench-vc"]
+
+    for fpc in range(members):
+        for port in range(ports):
+            prefix = 'ge' if port < ports - 4 else 'xe'
+            name = f"{prefix}-{fpc}/0/{port}"
+            lines.append(f"set interfaces {name} description \"port {fpc}/{port}\"")
+            lines.append(f"set interfaces {name} unit 0 family ethernet-switching storm-control default")
+
+            if port % 12 == 11:
+                lines.append(f"set interfaces {name} unit 0 family ethernet-switching interface-mode trunk")
+                lines.append(f"set interfaces {name} unit 0 family ethernet-switching vlan members all")
+            elif port % 2:
+                lines.append(f"set interfaces {name} unit 0 family ethernet-switching interface-mode access")
+                lines.append(f"set interfaces {name} unit 0 family ethernet-switching vlan members VLAN{port}")
+            else:
+                lines.append(f"set interfaces {name} unit 0 family ethernet-switching port-mode access")
+
+        lines.append(f"set interfaces vlan unit {fpc} family inet address 10.148.{fpc}.1/24")
+        lines.append(f"set vlans VLAN{fpc} vlan-id {100 + fpc}")
+
+    return '\n'.join(lines)
+
+def legacy_find_access_interfaces(config_data):
+    """Ancien algorithme de Test.py (recherche regex par ligne puis reboucle)"""
+    access_interfaces = []
+    interface_configs = {}
+
+    for line in config_data.split('\n'):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        interface_match = re.search(r'set interfaces (ge-\d+/\d+/\d+)', line)
+        if interface_match:
+            interface_configs.setdefault(interface_match.group(1), []).append(line)
+
+    for interface, configs in interface_configs.items():
+        is_access = has_vlan = is_trunk = False
+        for config in configs:
+            if 'interface-mode access' in config:
+                is_access = True
+            elif 'interface-mode trunk' in config:
+                is_trunk = True
+            elif 'vlan members' in config and 'interface-mode' not in config:
+                has_vlan = True
+        if is_access or (has_vlan and not is_trunk):
+            access_interfaces.append(interface)
+
+    access_interfaces.sort(key=lambda x: [int(i) for i in re.findall(r'\d+', x)])
+    return access_interfaces
+
+def measure(label, function, repetitions):
+    """Exécute une fonction plusieurs fois et affiche le meilleur temps"""
+    timings = []
+    result = None
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    print(f"   {label:<45} {min(timings) * 1000:9.2f} ms")
+    return result
+
+def bench_access_classifier(members=10, repetitions=5):
+    """Compare l'ancien scan de Test.py au classifieur en un passage"""
+    config = build_large_config(members)
+    lines = config.split('\n')
+    print(f"Classification des ports access ({len(lines)} lignes, {members} membres)")
+
+    legacy = measure("Test.py find_access_interfaces (ancien)",
+                     lambda: legacy_find_access_interfaces(config), repetitions)
+    ports = measure("AccessPortClassifier.classify",
+                    lambda: AccessPortClassifier.classify(lines), repetitions)
+    measure("ConfigurationParser.get_interfaces (avec expansion)",
+            lambda: ConfigurationParser(config).get_interfaces(), repetitions)
+
+    print(f"   Ports access: ancien={len(legacy)} (ge- seulement), classifieur={len(ports)}")
+
+def bench_validator(members=10, repetitions=5):
+    """Débit de la pré-validation de syntaxe sur la sortie des générateurs"""
+    parser = ConfigurationParser(build_large_config(members))
+    interfaces = parser.get_interfaces()
+    lines = (parser.generate_dot1x_config(interfaces, only_missing=False).split('\n')
+             + parser.generate_cleanup_config(interfaces, only_missing=False).split('\n')
+             + parser.get_radius_config('10.148.0.1', only_missing=False).split('\n'))
+    print(f"Pré-validation de syntaxe ({len(lines)} lignes générées)")
+
+    errors = measure("SetSyntaxValidator.validate",
+                     lambda: SetSyntaxValidator.validate(lines), repetitions)
+    print(f"   Lignes invalides: {len(errors)}")
+
+class MemoryChannel:
+    """Canal paramiko simulé : restitue un flux d'octets en blocs de taille bornée"""
+
+    def __init__(self, payload, max_chunk=32768):
+        self.payload = memoryview(payload)
+        self.position = 0
+        self.max_chunk = max_chunk
+
+    def settimeout(self, timeout):
+        pass
+
+    def recv_ready(self):
+        return self.position < len(self.payload)
+
+    def recv(self, size):
+        end = self.position + min(size, self.max_chunk)
+        data = bytes(self.payload[self.position:end])
+        self.position = end
+        return data
+
+def legacy_read_channel(channel):
+    """Ancienne boucle de read_channel_output (sans les pauses)"""
+    output = ""
+    while channel.recv_ready():
+        data = channel.recv(4096).decode('utf-8', errors='ignore')
+        output += data
+    return output
+
+def buffered_read_channel(channel):
+    """Lecture via ChannelReader jusqu'à épuisement du canal"""
+    reader = ChannelReader(channel)
+    while channel.recv_ready():
+        reader.read(1.0)
+    return reader.getvalue(), reader
+
+def bench_channel_reader(members=10, repetitions=5):
+    """Débit de lecture du canal : ancienne boucle contre ChannelReader"""
+    # Descriptions accentuées : des caractères multi-octets tombent en limite de bloc
+    config = build_large_config(members).replace('port ', 'accès ') + '\n'
+    payload = (config * 20).encode('utf-8')
+    expected = payload.decode('utf-8')
+    size_mb = len(payload) / (1024 * 1024)
+    print(f"Lecture du canal ({size_mb:.1f} Mo, blocs de 32 Ko maximum)")
+
+    legacy = measure("read_channel_output (ancien, recv 4096)",
+                     lambda: legacy_read_channel(MemoryChannel(payload)), repetitions)
+    buffered, reader = measure("ChannelReader (bytearray, recv adaptatif)",
+                               lambda: buffered_read_channel(MemoryChannel(payload)), repetitions)
+
+    print(f"   Appels recv: ancien={-(-len(payload) // 4096)}, ChannelReader={reader.recv_calls}")
+    print(f"   Caractères perdus: ancien={len(expected) - len(legacy)}, "
+          f"ChannelReader={len(expected) - len(buffered)}")
+
+def bench_search_index(members=10, repetitions=5):
+    """Recherche indexée contre un parcours ligne à ligne (équivalent d'une recherche Tk)"""
+    # Environ 100 000 lignes pour 10 membres
+    config = '\n'.join([build_large_config(members)] * 59)
+    lines = config.split('\n')
+    print(f"Recherche dans la configuration ({len(lines)} lignes)")
+    
+    index = measure("ConfigSearchIndex (construction)", lambda: ConfigSearchIndex(config), repetitions)
+    pattern = re.compile(r'(?:^|\s)ge-0/0/1\S*')
+    scanned = measure("parcours regex 'ge-0/0/1*'",
+                      lambda: [n for n, line in enumerate(lines) if pattern.search(line)], repetitions)
+    found = measure("ConfigSearchIndex.search('ge-0/0/1*')",
+                    lambda: index.search('ge-0/0/1*'), repetitions)
+    measure("ConfigSearchIndex.search('vlan', 'interfaces')",
+            lambda: index.search('vlan', 'interfaces'), repetitions)
+    measure("ConfigSearchIndex.lines (filtrat 'ge-0/0/1*')",
+            lambda: index.lines(found), repetitions)
+    
+    print(f"   Lignes trouvées: parcours={len(scanned)}, index={len(found)}")
+
+def bench_bulk_import(files=500, members=2, repetitions=3):
+    """Import d'un dossier de configurations : analyse séquentielle contre pool de processus"""
+    folder = tempfile.mkdtemp(prefix="bench_import_")
+    try:
+        config = build_large_config(members)
+        for number in range(files):
+            with open(os.path.join(folder, f"SW-{number:03d}.txt"), 'w', encoding='utf-8') as f:
+                f.write(config.replace('bench-vc', f"SW-{number:03d}"))
+        
+        sources = collect_config_sources([folder])
+        size_mb = sum(os.path.getsize(path) for path, member in sources) / (1024 * 1024)
+        print(f"Import d'un dossier ({len(sources)} fichiers, {size_mb:.1f} Mo, {os.cpu_count()} CPU)")
+        
+        # Libellé du chemin réellement exécuté (pas de pool sur un hôte à 1 CPU)
+        workers = ConfigImport(sources).workers
+        if workers >= 2 and len(sources) >= ConfigImport.INLINE_BELOW:
+            path, label = "pool", f"pool de {min(workers, len(sources))} processus"
+        else:
+            path, label = "inline", f"inline, {os.cpu_count()} CPU"
+        
+        sequential = measure("ConfigImport (1 processus)",
+                             lambda: ConfigImport(sources, workers=1).run(), repetitions)
+        parallel = measure(f"ConfigImport ({label})",
+                           lambda: ConfigImport(sources).run(), repetitions)
+        
+        print(f"   Ports access: séquentiel={sum(s['access_ports'] for s in sequential)}, "
+              f"{path}={sum(s['access_ports'] for s in parallel)}")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+def bench_cold_start(members=10, repetitions=5):
+    """Démarrage à froid : import des modules et ligne de commande, dans un nouvel interpréteur"""
+    folder = tempfile.mkdtemp(prefix="bench_start_")
+    here = os.path.dirname(os.path.abspath(__file__))
+    try:
+        config_path = os.path.join(folder, "cfg.txt")
+        with open(config_path, 'w', encoding='utf-8') as f:
+            f.write(build_large_config(members))
+        print(f"Démarrage à froid (configuration de {members} membres)")
+        
+        loaded = subprocess.run(
+            [sys.executable, "-c", "import sys, network_management_suite, Test; "
+                                   "print(sorted({'tkinter', 'paramiko'} & set(sys.modules)))"],
+            cwd=here, capture_output=True, text=True).stdout.strip()
+        
+        commands = [
+            ("interpréteur seul", ["-c", "pass"]),
+            ("import network_management_suite", ["-c", "import network_management_suite"]),
+            ("import Test", ["-c", "import Test"]),
+            ("python -m network_management_suite --help", ["-m", "network_management_suite", "--help"]),
+            ("python -m network_management_suite parse", ["-m", "network_management_suite", "parse", config_path]),
+            ("python network_management_suite.py parse", ["network_management_suite.py", "parse", config_path]),
+        ]
+        for label, arguments in commands:
+            measure(label, lambda: subprocess.run([sys.executable] + arguments, cwd=here, check=True,
+                                                  stdout=subprocess.DEVNULL), repetitions)
+        print(f"   tkinter/paramiko chargés par les imports: {loaded} (attendu: [])")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+def check_incremental_update():
+    """Vérifie que la mise à jour incrémentale donne le même index et les mêmes lignes qu'une analyse complète"""
+    dot1x = [f"set protocols dot1x authenticator interface ge-0/0/1 {line}"
+             for line in ("supplicant multiple", "retries 3", "transmit-period 1", "reauthentication 3600",
+                          "supplicant-timeout 10", "maximum-requests 3", "mac-radius")]
+    base = '\n'.join([
+        "set system host-name bench-groups",
+        "set groups ACCESS-XE interfaces <xe-*> unit 0 family ethernet-switching interface-mode access",
+        "set groups ACCESS-XE interfaces <xe-*> unit 0 family ethernet-switching vlan members VLAN10",
+        "set apply-groups ACCESS-XE",
+        "set interfaces xe-0/1/0 description existing",
+        "set interfaces ge-0/0/1 unit 0 family ethernet-switching interface-mode access",
+    ] + dot1x)
+    scenarios = [
+        ("interface ajoutée (héritage <xe-*>)", base + "\nset interfaces xe-0/1/5 description new"),
+        ("interface supprimée", base.replace("set interfaces xe-0/1/0 description existing\n", "")),
+        ("déclaration ajoutée", base + "\nset interfaces ge-0/0/1 description updated"),
+        ("déclaration dot1x supprimée", base.replace(dot1x[1] + "\n", "")),
+        ("port access ajouté", base + "\nset interfaces ge-0/0/2 unit 0 family ethernet-switching"
+                                      " interface-mode access"),
+    ]
+    print("Mise à jour incrémentale contre analyse complète")
+    
+    failures = 0
+    for label, updated in scenarios:
+        incremental = ConfigurationParser(base)
+        incremental.get_index()
+        changeset = incremental.update_configuration(updated)
+        full = ConfigurationParser(updated)
+        
+        # Même index, même vue étendue, et pour les ports régénérés les mêmes lignes
+        # qu'une génération complète
+        ports = [port for port in full.get_interfaces() if port['name'] in changeset['affected_interfaces']]
+        index, full_index = incremental.get_index(), full.get_index()
+        same = (index['states'] == full_index['states']
+                and {name: set(lines) for name, lines in index['statements'].items() if lines}
+                == {name: set(lines) for name, lines in full_index['statements'].items()}
+                and set(incremental.get_expanded_lines()) == set(full.get_expanded_lines())
+                and [i['name'] for i in incremental.get_interfaces()] == [i['name'] for i in full.get_interfaces()]
+                and changeset['dot1x'] == full.generate_dot1x_config(ports)
+                and changeset['cleanup'] == full.generate_cleanup_config(ports))
+        failures += not same
+        print(f"   {label:<45} {'OK' if same else 'DIFFÉRENT'}")
+    return failures == 0
+
+def check_shared_cleanup():
+    """Vérifie qu'un range ou un groupe partagé avec des ports non access n'est pas supprimé"""
+    config = '\n'.join([
+        "set system host-name bench-cleanup",
+        "set groups MIXED interfaces <ge-*> unit 0 family ethernet-switching interface-mode access",
+        "set apply-groups MIXED",
+        "set interfaces ge-0/0/1 description access",
+        "set interfaces ge-0/0/2 unit 0 family ethernet-switching interface-mode trunk",
+        "set interfaces interface-range ACCESS member xe-0/0/[10-11]",
+        "set interfaces interface-range ACCESS unit 0 family ethernet-switching interface-mode access",
+        "set interfaces interface-range MIXED-RANGE member xe-0/0/[20-21]",
+        "set interfaces interface-range MIXED-RANGE unit 0 family ethernet-switching interface-mode access",
+        "set interfaces xe-0/0/21 unit 0 family ethernet-switching interface-mode trunk",
+    ])
+    parser = ConfigurationParser(config)
+    cleanup = parser.generate_cleanup_config(parser.get_interfaces()).split('\n')
+    
+    expected = {
+        "range dont tous les membres sont access":
+            "delete interfaces interface-range ACCESS unit 0 family ethernet-switching" in cleanup,
+        "range partagé avec un trunk": not any(line.startswith("delete interfaces interface-range MIXED-RANGE")
+                                               for line in cleanup),
+        "groupe partagé avec un trunk": not any(line.startswith("delete groups MIXED") for line in cleanup),
+    }
+    print("Nettoyage des ranges et groupes partagés")
+    for label, ok in expected.items():
+        print(f"   {label:<45} {'OK' if ok else 'DIFFÉRENT'}")
+    return all(expected.values())
+
+def check_member_range():
+    """Vérifie qu'un member-range qui traverse deux membres VC n'oublie aucun port"""
+    config = '\n'.join([
+        "set system host-name bench-range",
+        "set interfaces interface-range VC member-range ge-0/0/46 to ge-1/0/2",
+        "set interfaces interface-range VC unit 0 family ethernet-switching interface-mode access",
+    ])
+    parser = ConfigurationParser(config)
+    names = [port['name'] for port in parser.get_interfaces()]
+    expected = ['ge-0/0/46', 'ge-0/0/47', 'ge-1/0/0', 'ge-1/0/1', 'ge-1/0/2']
+    ok = names == expected and "ge-0/0/47" in parser.generate_dot1x_config(parser.get_interfaces())
+    print("Member-range entre deux FPC")
+    print(f"   {'ge-0/0/46 to ge-1/0/2':<45} {'OK' if ok else 'DIFFÉRENT: ' + ', '.join(names)}")
+    return ok
+
+def main():
+    """Fonction principale"""
+    members = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    checks = [check_incremental_update(), check_shared_cleanup(), check_member_range()]
+    if not all(checks):
+        sys.exit(1)
+    bench_access_classifier(members, repetitions)
+    bench_validator(members, repetitions)
+    bench_channel_reader(members, repetitions)
+    bench_search_index(members, repetitions)
+    bench_bulk_import(repetitions=repetitions)
+    bench_cold_start(members, repetitions)
+
+if __name__ == "__main__":
+    main()
@@ -5,16 +5,24 @@ Bridge Server pour Network Management Tools
 Serveur FastAPI local pour permettre les connexions SSH depuis le navigateur
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, File, HTTPException, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 import subprocess
 import os
 import asyncio
 import json
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+# Générateurs de configuration de la suite (dossier parent)
+SUITE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SUITE_DIR not in sys.path:
+    sys.path.insert(0, SUITE_DIR)
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
@@ -56,6 +64,23 @@ server_status = {
     "active_connections": 0
 }
 
+# Pool de processus pour l'analyse des configurations (cree a la premiere requete)
+PARSE_WORKERS = max(1, min(4, os.cpu_count() or 1))
+parse_pool = None
+
+def get_parse_pool():
+    """Pool de processus partage par les requetes /parse"""
+    global parse_pool
+    if parse_pool is None:
+        parse_pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+    return parse_pool
+
+@app.on_event("shutdown")
+def shutdown_parse_pool():
+    """Arret du pool d'analyse avec le serveur"""
+    if parse_pool is not None:
+        parse_pool.shutdown(wait=False, cancel_futures=True)
+
 @app.get("/health")
 async def health_check():
     """Verification de sante du serveur bridge"""
@@ -228,8 +253,10 @@ async def get_configuration(request: ConfigurationRequest):
                     config_errors.append(line.replace("CONFIG_ERROR:", "").strip())
             
             # Collecter toutes les configurations
+            from network_management_suite import load_config_summary
             all_configurations = []
             hostnames = []
+            summaries = {}
             
             for config_file in saved_files:
                 if os.path.exists(config_file):
@@ -237,7 +264,15 @@ async def get_configuration(request: ConfigurationRequest):
                         file_content = f.read()
                         all_configurations.append(file_content)
                         
-                        # Extraire le hostname du fichier
+                        # Resume ecrit a la recuperation (verifie par empreinte)
+                        summary = load_config_summary(config_file, file_content)
+                        if summary:
+                            summaries[config_file] = summary
+                            if summary['switch_info'].get('hostname'):
+                                hostnames.append(summary['switch_info']['hostname'])
+                            continue
+                        
+                        # Sinon extraire le hostname de l'en-tete du fichier
                         for line in file_content.split('\n'):
                             if line.startswith("# Hostname:"):
                                 hostname = line.split(":")[1].strip()
@@ -264,6 +299,7 @@ async def get_configuration(request: ConfigurationRequest):
                 "logs": output,
                 "message": status_message,
                 "saved_files": saved_files,
+                "summaries": summaries,
                 "errors": config_errors
             }
         else:
@@ -287,6 +323,101 @@ async def get_configuration(request: ConfigurationRequest):
         logger.error(f"Erreur recuperation config: {e}")
         raise HTTPException(status_code=500, detail=f"Erreur: {str(e)}")
 
+def remove_files(paths):
+    """Supprime des fichiers temporaires (ignore ceux deja supprimes)"""
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+async def save_uploads(files):
+    """Recopie les uploads multipart sur disque, retourne [(chemin, nom)]"""
+    saved = []
+    try:
+        for upload in files:
+            name = os.path.basename(upload.filename or 'config.txt')
+            with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{name}") as tmp:
+                saved.append((tmp.name, name))
+                # Lecture par blocs : le fichier n'est jamais entierement en memoire
+                while True:
+                    block = await upload.read(1024 * 1024)
+                    if not block:
+                        break
+                    tmp.write(block)
+    except Exception:
+        remove_files([path for path, name in saved])
+        raise
+    return saved
+
+def iter_bundle_response(saved, only_missing):
+    """Archive zip produite en flux, fichiers temporaires supprimes a la fin"""
+    from network_management_suite import iter_config_bundle, read_config_source
+    # Nom du fichier envoye par le client (manifeste, dossier sans hostname)
+    sources = ((name, read_config_source((path, None))) for path, name in saved)
+    try:
+        yield from iter_config_bundle(sources, only_missing)
+    finally:
+        remove_files([path for path, name in saved])
+
+@app.post("/export-bundle")
+async def export_bundle(files: List[UploadFile] = File(...), only_missing: bool = True):
+    """Archive zip des configurations generees (dossier par switch + manifest.json)"""
+    try:
+        # Les uploads sont recopies sur disque : l'archive est ensuite produite
+        # en flux, une configuration a la fois, sans etre construite en memoire
+        saved = await save_uploads(files)
+    except Exception as e:
+        logger.error(f"Erreur reception fichiers: {e}")
+        raise HTTPException(status_code=500, detail=f"Erreur: {str(e)}")
+    
+    logger.info(f"Export zip de {len(saved)} configuration(s)")
+    return StreamingResponse(
+        iter_bundle_response(saved, only_missing),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="dot1x_bundle.zip"'}
+    )
+
+async def iter_parse_results(saved, only_missing):
+    """Resultats NDJSON (une ligne par fichier) dans l'ordre de fin d'analyse"""
+    from network_management_suite import generate_config_outputs
+    pool = get_parse_pool()
+    # Chaque processus relit son fichier : seul le resultat traverse le pool.
+    # Le fichier est supprime quand son analyse est terminee (ou annulee avant
+    # de commencer), jamais pendant qu'un processus le lit encore
+    futures = []
+    try:
+        for index, (path, name) in enumerate(saved):
+            future = pool.submit(generate_config_outputs, (path, None), name, only_missing, index)
+            future.add_done_callback(lambda future, path=path: remove_files([path]))
+            futures.append(future)
+    except Exception:
+        for future in futures:
+            future.cancel()
+        remove_files([path for path, name in saved[len(futures):]])
+        raise
+    
+    try:
+        for future in asyncio.as_completed([asyncio.wrap_future(future) for future in futures]):
+            result = await future
+            yield json.dumps(result, ensure_ascii=False) + "\n"
+    finally:
+        # Client deconnecte : les analyses non commencees sont abandonnees
+        for future in futures:
+            future.cancel()
+
+@app.post("/parse")
+async def parse_configurations(files: List[UploadFile] = File(...), only_missing: bool = True):
+    """Analyse et generation ISE cote serveur, resultats diffuses par fichier (NDJSON)"""
+    try:
+        saved = await save_uploads(files)
+    except Exception as e:
+        logger.error(f"Erreur reception fichiers: {e}")
+        raise HTTPException(status_code=500, detail=f"Erreur: {str(e)}")
+    
+    logger.info(f"Analyse de {len(saved)} configuration(s) ({PARSE_WORKERS} processus)")
+    return StreamingResponse(iter_parse_results(saved, only_missing), media_type="application/x-ndjson")
+
 @app.get("/")
 async def root():
     """Page d'accueil du serveur bridge"""
@@ -298,7 +429,9 @@ async def root():
             "/health": "Verification de sante",
             "/ping-device": "Ping d'un peripherique",
             "/test-connection": "Test de connexion SSH",
-            "/get-configuration": "Recuperation de configuration via Rebond"
+            "/get-configuration": "Recuperation de configuration via Rebond",
+            "/export-bundle": "Archive zip des configurations generees",
+            "/parse": "Analyse et generation ISE de configurations (NDJSON)"
         }
     }
 
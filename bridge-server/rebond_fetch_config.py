@@ -20,6 +20,11 @@ import datetime
 import re
 from pathlib import Path
 
+# La suite (analyse des configurations) est dans le dossier parent
+SUITE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SUITE_DIR not in sys.path:
+    sys.path.insert(0, SUITE_DIR)
+
 def install_paramiko():
     """Installe paramiko si pas deja installe"""
     try:
@@ -154,11 +159,48 @@ def is_valid_cisco_config(config_text):
     matches = sum(1 for pattern in cisco_patterns if re.search(pattern, config_text, re.IGNORECASE))
     return matches >= 2
 
+# Options SSH robustes avec TTY allocation (anciens switchs : chiffrements legacy)
+SSH_OPTIONS = [
+    "-tt",  # Force TTY allocation
+    "-o StrictHostKeyChecking=no",
+    "-o UserKnownHostsFile=/dev/null",
+    "-o ConnectTimeout=30",
+    "-o ServerAliveInterval=10",
+    "-o ServerAliveCountMax=3",
+    "-o Ciphers=aes128-cbc,3des-cbc,aes192-cbc,aes256-cbc,aes128-ctr,aes192-ctr,aes256-ctr",
+    "-o KexAlgorithms=diffie-hellman-group14-sha1,diffie-hellman-group1-sha1,diffie-hellman-group-exchange-sha1,diffie-hellman-group-exchange-sha256",
+    "-o HostKeyAlgorithms=ssh-rsa,ssh-dss",
+    "-o MACs=hmac-md5,hmac-sha1,hmac-sha2-256"
+]
+
+def open_rebond_client(rebond_ip, rebond_user, rebond_pass, port=22):
+    """Ouvre la connexion SSH au serveur Rebond"""
+    import paramiko
+    
+    rebond_client = paramiko.SSHClient()
+    rebond_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    rebond_client.connect(
+        hostname=rebond_ip,
+        port=port,
+        username=rebond_user,
+        password=rebond_pass,
+        timeout=30,
+        look_for_keys=False,
+        allow_agent=False
+    )
+    return rebond_client
+
+def build_switch_command(switch_ip, switch_user, switch_pass, remote_command=None):
+    """Commande sshpass executee sur le Rebond vers le switch (session CLI si pas de commande)"""
+    ssh_opts = " ".join(SSH_OPTIONS)
+    command = f"sshpass -p '{switch_pass}' ssh {ssh_opts} {switch_user}@{switch_ip}"
+    if remote_command:
+        command += f" '{remote_command}'"
+    return command
+
 def connect_via_rebond(rebond_ip, rebond_user, rebond_pass, switch_ips, switch_user, switch_pass):
     """Connexion via serveur Rebond vers switch(es) avec validation robuste"""
     try:
-        import paramiko
-        
         # Parse multiple IPs if comma-separated
         if isinstance(switch_ips, str):
             ip_list = [ip.strip() for ip in switch_ips.split(',') if ip.strip()]
@@ -168,16 +210,7 @@ def connect_via_rebond(rebond_ip, rebond_user, rebond_pass, switch_ips, switch_u
         print(f"Connexion au serveur Rebond {rebond_ip}...")
         
         # Connexion SSH au serveur Rebond
-        rebond_client = paramiko.SSHClient()
-        rebond_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        rebond_client.connect(
-            hostname=rebond_ip,
-            username=rebond_user,
-            password=rebond_pass,
-            timeout=30,
-            look_for_keys=False,
-            allow_agent=False
-        )
+        rebond_client = open_rebond_client(rebond_ip, rebond_user, rebond_pass)
         
         print(f"SUCCESS: Connecte au serveur Rebond")
         
@@ -186,44 +219,29 @@ def connect_via_rebond(rebond_ip, rebond_user, rebond_pass, switch_ips, switch_u
         for switch_ip in ip_list:
             print(f"Execution de la commande via SSH vers le switch {switch_ip}...")
             
-            # Options SSH robustes avec TTY allocation
-            ssh_options = [
-                "-tt",  # Force TTY allocation
-                "-o StrictHostKeyChecking=no",
-                "-o UserKnownHostsFile=/dev/null",
-                "-o ConnectTimeout=30",
-                "-o ServerAliveInterval=10",
-                "-o ServerAliveCountMax=3",
-                "-o Ciphers=aes128-cbc,3des-cbc,aes192-cbc,aes256-cbc,aes128-ctr,aes192-ctr,aes256-ctr",
-                "-o KexAlgorithms=diffie-hellman-group14-sha1,diffie-hellman-group1-sha1,diffie-hellman-group-exchange-sha1,diffie-hellman-group-exchange-sha256",
-                "-o HostKeyAlgorithms=ssh-rsa,ssh-dss",
-                "-o MACs=hmac-md5,hmac-sha1,hmac-sha2-256"
-            ]
-            ssh_opts = " ".join(ssh_options)
-        
             # Commandes specialisees par type d'equipement avec validation stricte
             command_sets = [
                 {
                     "name": "Juniper CLI (format set)",
                     "commands": [
-                        f"sshpass -p '{switch_pass}' ssh {ssh_opts} {switch_user}@{switch_ip} 'show configuration | display set | no-more'",
-                        f"sshpass -p '{switch_pass}' ssh {ssh_opts} {switch_user}@{switch_ip} 'cli -c \"show configuration | display set | no-more\"'"
+                        build_switch_command(switch_ip, switch_user, switch_pass, 'show configuration | display set | no-more'),
+                        build_switch_command(switch_ip, switch_user, switch_pass, 'cli -c "show configuration | display set | no-more"')
                     ],
                     "validator": is_valid_juniper_config
                 },
                 {
                     "name": "Juniper CLI (format standard)",
                     "commands": [
-                        f"sshpass -p '{switch_pass}' ssh {ssh_opts} {switch_user}@{switch_ip} 'show configuration | no-more'",
-                        f"sshpass -p '{switch_pass}' ssh {ssh_opts} {switch_user}@{switch_ip} 'cli -c \"show configuration | no-more\"'"
+                        build_switch_command(switch_ip, switch_user, switch_pass, 'show configuration | no-more'),
+                        build_switch_command(switch_ip, switch_user, switch_pass, 'cli -c "show configuration | no-more"')
                     ],
                     "validator": is_valid_juniper_config
                 },
                 {
                     "name": "Cisco/Aruba running-config",
                     "commands": [
-                        f"sshpass -p '{switch_pass}' ssh {ssh_opts} {switch_user}@{switch_ip} 'terminal length 0; show running-config'",
-                        f"sshpass -p '{switch_pass}' ssh {ssh_opts} {switch_user}@{switch_ip} 'show running-config'"
+                        build_switch_command(switch_ip, switch_user, switch_pass, 'terminal length 0; show running-config'),
+                        build_switch_command(switch_ip, switch_user, switch_pass, 'show running-config')
                     ],
                     "validator": is_valid_cisco_config
                 }
@@ -368,6 +386,14 @@ def save_individual_configuration(config_text, switch_ip, hostname, output_dir):
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write(header + config_text)
         
+        # Resume JSON (hostname, IP management, interfaces access) a cote du fichier :
+        # les consommateurs evitent ainsi de reanalyser toute la configuration
+        try:
+            from network_management_suite import write_config_summary
+            write_config_summary(filepath, header + config_text)
+        except Exception as e:
+            print(f"WARNING: Resume non ecrit pour {filepath}: {e}")
+        
         return filepath
         
     except Exception as e:
@@ -0,0 +1,570 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script d'application de configurations via serveur Rebond
+Auteur: Equipe Network Tools
+Version: 1.0
+
+Applique les changesets generes (dot1x, nettoyage, RADIUS) sur plusieurs
+switchs en parallele, en reutilisant le chemin de connexion Rebond de
+rebond_fetch_config.py. Chaque lot est charge par 'load set terminal' et
+verifie par 'commit check' ; le changeset complet est ensuite applique par
+un seul 'commit confirmed', puis confirme par un 'commit' final.
+
+Usage:
+    python rebond_push_config.py <rebond_ip[:port]> <rebond_user> <rebond_pass> <switch_user> <switch_pass> <fichier_config> [...]
+    python rebond_push_config.py --stand-in [port]
+
+Exemple:
+    python rebond_push_config.py 6.91.128.111 rebond_user rebond_pass admin sw_pass SW-ACCES-01.txt SW-ACCES-02.txt
+    python rebond_push_config.py 127.0.0.1:2222 test test admin admin SW-ACCES-01.txt --check-only
+"""
+
+import sys
+import os
+import re
+import json
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from rebond_fetch_config import install_paramiko, open_rebond_client, build_switch_command
+
+# La suite (analyse et generation) est dans le dossier parent
+SUITE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SUITE_DIR not in sys.path:
+    sys.path.insert(0, SUITE_DIR)
+
+# Prompt Junos : 'user@host> ' (operationnel) ou 'user@host# ' (configuration)
+PROMPT = re.compile(r'\S+@\S+[>#] ?$')
+
+# Marqueur affiche par 'load set terminal'
+LOAD_BANNER = "[Type ^D at a new line to end input]"
+
+# Messages d'erreur Junos interrompant l'application d'un lot
+ERROR_MARKERS = ("syntax error", "error:", "unknown command", "missing argument", "invalid value")
+
+class PushError(Exception):
+    """Echec de l'application d'un changeset sur un switch"""
+
+class JunosCLISession:
+    """Dialogue avec la CLI Junos sur un canal SSH interactif (paramiko ou stand-in)"""
+
+    def __init__(self, channel, timeout=120):
+        self.channel = channel
+        self.timeout = timeout
+
+    def read_until(self, pattern, timeout=None):
+        """Lit le canal jusqu'au motif (regex compilee ou texte), retourne la sortie"""
+        deadline = time.monotonic() + (timeout or self.timeout)
+        output = ""
+
+        while time.monotonic() < deadline:
+            if self.channel.recv_ready():
+                output += self.channel.recv(65535).decode('utf-8', errors='ignore')
+                tail = output.replace('\r', '').rstrip('\n')
+                if (pattern.search(tail) if hasattr(pattern, 'search') else pattern in output):
+                    return output
+            elif self.channel.closed:
+                break
+            else:
+                time.sleep(0.02)
+
+        raise PushError(f"Delai depasse en attente de {getattr(pattern, 'pattern', pattern)!r}")
+
+    def run(self, command, timeout=None):
+        """Execute une commande et attend le prompt suivant"""
+        self.channel.send(command + "\n")
+        return self.read_until(PROMPT, timeout)
+
+    def run_checked(self, command, expected=None, timeout=None):
+        """Execute une commande, leve PushError si Junos signale une erreur"""
+        output = self.run(command, timeout)
+        lowered = output.lower()
+        if any(marker in lowered for marker in ERROR_MARKERS) or (expected and expected not in lowered):
+            raise PushError(f"'{command}' a echoue: {output.strip()[-300:]}")
+        return output
+
+    def load_set(self, lines, timeout=None):
+        """Charge des lignes 'set'/'delete' dans la configuration candidate"""
+        self.channel.send("load set terminal\n")
+        self.read_until(LOAD_BANNER, timeout)
+        self.channel.send("\n".join(lines) + "\n\x04")
+        output = self.read_until(PROMPT, timeout)
+        lowered = output.lower()
+        if any(marker in lowered for marker in ERROR_MARKERS):
+            raise PushError(f"Chargement refuse: {output.strip()[-300:]}")
+        return output
+
+class PushEngine:
+    """Moteur d'application concurrent : un canal par switch, concurrence bornee par site"""
+
+    def __init__(self, channel_factory, max_workers=8, per_site=2, confirm_minutes=5,
+                 check_only=False, timeout=120, log=print):
+        self.channel_factory = channel_factory
+        self.max_workers = max_workers
+        self.per_site = per_site
+        self.confirm_minutes = confirm_minutes
+        self.check_only = check_only
+        self.timeout = timeout
+        self.log = log
+        self._site_slots = {}
+        self._lock = threading.Lock()
+
+    def _site_slot(self, site):
+        """Semaphore du site (cree a la demande)"""
+        with self._lock:
+            if site not in self._site_slots:
+                self._site_slots[site] = threading.BoundedSemaphore(self.per_site)
+            return self._site_slots[site]
+
+    def push(self, jobs):
+        """Applique les changesets, retourne les resultats dans l'ordre des jobs"""
+        results = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.push_switch, job): index for index, job in enumerate(jobs)}
+            for future in as_completed(futures):
+                result = future.result()
+                results[futures[future]] = result
+                self.log(f"PUSH_RESULT: {json.dumps(result)}")
+
+        return [results[index] for index in range(len(jobs))]
+
+    def push_switch(self, job):
+        """Applique le changeset d'un switch (lots dans l'ordre, commit confirmed unique)
+
+        Chaque lot est charge dans la configuration candidate puis valide par
+        'commit check'. Le changeset complet n'est commite qu'une fois tous les
+        lots acceptes : un seul 'commit confirmed' puis le 'commit' de
+        confirmation. Un echec avant le commit abandonne la candidate (rien
+        n'est applique) ; un echec apres le 'commit confirmed' laisse Junos
+        revenir a l'etat d'avant le push a l'expiration du delai.
+        """
+        result = {
+            'ip': job['ip'],
+            'hostname': job.get('hostname'),
+            'site': job.get('site', 'default'),
+            'status': 'pending',
+            'chunks': len(job['chunks']),
+            'chunks_applied': 0,
+            'checksums': [],
+            'timings': {'wait': 0.0, 'connect': 0.0, 'load': 0.0, 'commit_check': 0.0,
+                        'commit_confirmed': 0.0, 'confirm': 0.0, 'total': 0.0},
+            'error': None
+        }
+        timings = result['timings']
+        started = time.perf_counter()
+
+        with self._site_slot(result['site']):
+            timings['wait'] = time.perf_counter() - started
+            channel = None
+            in_configuration = False
+
+            try:
+                if job.get('errors'):
+                    number, line, reason = job['errors'][0]
+                    result['status'] = 'invalid'
+                    result['error'] = f"{len(job['errors'])} ligne(s) invalide(s), ex: {line} ({reason})"
+                    return result
+                
+                if not job['chunks']:
+                    result['status'] = 'up-to-date'
+                    return result
+
+                step = time.perf_counter()
+                channel = self.channel_factory(job)
+                session = JunosCLISession(channel, self.timeout)
+                session.read_until(PROMPT)
+                session.run("set cli screen-length 0")
+                session.run_checked("configure private")
+                in_configuration = True
+                timings['connect'] = time.perf_counter() - step
+
+                for chunk in job['chunks']:
+                    step = time.perf_counter()
+                    session.load_set(chunk['lines'])
+                    timings['load'] += time.perf_counter() - step
+
+                    # Validation cumulative : la candidate contient les lots precedents
+                    step = time.perf_counter()
+                    session.run_checked("commit check", expected="configuration check succeeds")
+                    timings['commit_check'] += time.perf_counter() - step
+
+                    result['chunks_applied'] += 1
+                    # Empreinte du lot applique (identification, pas une verification sur le switch)
+                    result['checksums'].append(chunk['checksum'])
+
+                if self.check_only:
+                    session.run("rollback 0")
+                    result['status'] = 'checked'
+                else:
+                    # Un seul commit pour tout le changeset : rollback automatique
+                    # vers l'etat d'avant le push tant qu'il n'est pas confirme
+                    step = time.perf_counter()
+                    session.run_checked(
+                        f'commit confirmed {self.confirm_minutes} comment "dot1x {len(job["chunks"])} lot(s)"',
+                        expected="commit complete")
+                    timings['commit_confirmed'] = time.perf_counter() - step
+                    result['status'] = 'confirm-pending'
+
+                    # Confirmation avant l'expiration du commit confirmed
+                    step = time.perf_counter()
+                    session.run_checked("commit", expected="commit complete")
+                    timings['confirm'] = time.perf_counter() - step
+                    result['status'] = 'committed'
+
+            except Exception as e:
+                result['error'] = str(e)
+                if result['status'] == 'confirm-pending':
+                    # Commit confirmed non confirme : Junos revient seul a l'etat d'avant le push
+                    result['error'] += f" (rollback automatique dans {self.confirm_minutes} min)"
+                else:
+                    result['status'] = 'failed'
+                if in_configuration:
+                    # Candidate abandonnee (aucun lot n'est commite avant le commit confirmed)
+                    try:
+                        session.run("rollback 0", timeout=10)
+                    except Exception:
+                        pass
+
+            finally:
+                if channel is not None:
+                    try:
+                        if in_configuration:
+                            channel.send("exit configuration-mode\n")
+                        channel.send("exit\n")
+                        channel.close()
+                    except Exception:
+                        pass
+                timings['total'] = time.perf_counter() - started
+
+        return result
+
+def rebond_channel_factory(rebond_client, switch_user, switch_pass):
+    """Fabrique de canaux : une session CLI interactive par switch via le Rebond"""
+    def open_channel(job):
+        channel = rebond_client.get_transport().open_session()
+        channel.get_pty(width=200)
+        channel.exec_command(build_switch_command(job['ip'], switch_user, switch_pass))
+        return channel
+    return open_channel
+
+def build_push_jobs(config_files, max_lines=None, max_bytes=None, only_missing=True):
+    """Construit les jobs (ip, hostname, site, lots) a partir de configurations recuperees"""
+    from network_management_suite import (CombinedConfigReader, SetSyntaxValidator,
+                                          COMMIT_CHUNK_LINES, COMMIT_CHUNK_BYTES)
+
+    jobs = []
+    for config_file in config_files:
+        with CombinedConfigReader(config_file) as reader:
+            for index, section in enumerate(reader.sections):
+                parser = reader.get_parser(index)
+                info = parser.get_switch_info()
+                ip = section.get('ip') or info['management_ip']
+                chunks = parser.chunk_changeset(
+                    parser.get_interfaces(), info['management_ip'],
+                    max_lines or COMMIT_CHUNK_LINES, max_bytes or COMMIT_CHUNK_BYTES, only_missing)
+                jobs.append({
+                    'ip': ip,
+                    'hostname': section.get('hostname') or info['hostname'] or ip,
+                    'site': parser.get_profile(),
+                    'chunks': chunks
+                })
+    
+    # Pre-validation en lot de toute la flotte avant la moindre connexion
+    report = SetSyntaxValidator.validate_fleet(
+        {index: [line for chunk in job['chunks'] for line in chunk['lines']] for index, job in enumerate(jobs)})
+    for index, errors in report.items():
+        jobs[index]['errors'] = errors
+    return jobs
+
+class JunosStandIn:
+    """Emulation locale du mode configuration Junos (tests sans switch)
+
+    Gere 'configure private', 'load set terminal', 'show | compare',
+    'commit check', 'commit confirmed', 'commit', 'rollback 0' et 'exit'.
+    fail_on permet de simuler le refus d'une commande.
+    """
+
+    def __init__(self, hostname="standin", user="admin", latency=0.0, fail_on=None):
+        self.hostname = hostname
+        self.user = user
+        self.latency = latency
+        self.fail_on = fail_on
+        self.committed = []
+        self.candidate = None
+        self.loading = False
+        self.pending_confirm = False
+        self.closed = False
+        self._buffer = ""
+
+    def prompt(self):
+        """Prompt courant (operationnel ou configuration)"""
+        if self.candidate is None:
+            return f"{self.user}@{self.hostname}> "
+        return f"\n[edit]\n{self.user}@{self.hostname}# "
+
+    def banner(self):
+        """Sortie a l'ouverture de session"""
+        return f"--- JUNOS stand-in\n{self.prompt()}"
+
+    def feed(self, data):
+        """Traite des octets recus, retourne la sortie a renvoyer"""
+        output = []
+        self._buffer += data.replace('\r', '')
+
+        while True:
+            if self.loading and '\x04' in self._buffer.split('\n', 1)[0]:
+                self._buffer = self._buffer.split('\x04', 1)[1]
+                output.append(self._end_load())
+                continue
+            if '\n' not in self._buffer:
+                break
+            line, self._buffer = self._buffer.split('\n', 1)
+            output.append(self._load_line(line) if self.loading else self._command(line.strip()))
+
+        return "".join(output)
+
+    def _load_line(self, line):
+        """Ligne saisie pendant 'load set terminal' (commentaires '#' ignores, comme Junos)"""
+        if line.strip() and not line.strip().startswith('#'):
+            self._loaded.append(line.strip())
+        return ""
+
+    def _end_load(self):
+        """Fin de saisie (^D) : validation des lignes chargees"""
+        self.loading = False
+        errors = [line for line in self._loaded if not line.startswith(('set ', 'delete '))]
+        if errors:
+            return (f"terminal:1:(0) syntax error: {errors[0]}\n"
+                    f"load complete (1 errors){self.prompt()}")
+        for line in self._loaded:
+            if line.startswith('delete '):
+                removed = 'set ' + line[len('delete '):]
+                self.candidate = [s for s in self.candidate if s != removed and not s.startswith(removed + ' ')]
+            elif line not in self.candidate:
+                self.candidate.append(line)
+        return f"load complete{self.prompt()}"
+
+    def _command(self, command):
+        """Commande CLI operationnelle ou de configuration"""
+        if self.latency:
+            time.sleep(self.latency)
+        if self.fail_on and command.startswith(self.fail_on):
+            return f"error: {command}: simulated failure{self.prompt()}"
+
+        if not command:
+            return self.prompt()
+        if command.startswith("set cli "):
+            return f"Screen length set to 0\n{self.prompt()}"
+        if command in ("configure private", "configure", "edit private"):
+            self.candidate = list(self.committed)
+            return f"Entering configuration mode{self.prompt()}"
+        if command == "exit" and self.candidate is None:
+            self.closed = True
+            return ""
+        if self.candidate is None:
+            return f"unknown command: {command}\n{self.prompt()}"
+
+        if command == "load set terminal":
+            self.loading = True
+            self._loaded = []
+            return f"{LOAD_BANNER}\n"
+        if command == "show | compare":
+            added = [f"+ {line}" for line in self.candidate if line not in self.committed]
+            removed = [f"- {line}" for line in self.committed if line not in self.candidate]
+            return "\n".join(removed + added) + self.prompt()
+        if command == "commit check":
+            return f"configuration check succeeds{self.prompt()}"
+        if command.startswith("commit confirmed"):
+            self.committed = list(self.candidate)
+            self.pending_confirm = True
+            return (f"configuration check succeeds\ncommit confirmed will be automatically rolled back "
+                    f"unless confirmed\ncommit complete{self.prompt()}")
+        if command.startswith("commit"):
+            self.committed = list(self.candidate)
+            self.pending_confirm = False
+            return f"commit complete{self.prompt()}"
+        if command == "rollback 0":
+            self.candidate = list(self.committed)
+            return f"load complete{self.prompt()}"
+        if command in ("exit", "exit configuration-mode", "quit"):
+            self.candidate = None
+            return f"Exiting configuration mode\n{self.prompt()}"
+
+        return f"syntax error.\n{self.prompt()}"
+
+class StandInChannel:
+    """Canal en memoire (interface paramiko.Channel) relie a un JunosStandIn"""
+
+    def __init__(self, stand_in):
+        self.stand_in = stand_in
+        self._output = stand_in.banner().encode('utf-8')
+        self._lock = threading.Lock()
+
+    @property
+    def closed(self):
+        return self.stand_in.closed and not self._output
+
+    def send(self, data):
+        with self._lock:
+            self._output += self.stand_in.feed(data).encode('utf-8')
+        return len(data)
+
+    def recv_ready(self):
+        return bool(self._output)
+
+    def recv(self, size):
+        with self._lock:
+            data, self._output = self._output[:size], self._output[size:]
+        return data
+
+    def close(self):
+        self.stand_in.closed = True
+
+def serve_stand_in(port=2222, host="127.0.0.1", latency=0.0):
+    """Serveur SSH local emulant Rebond + switch Junos (toute session ouvre un JunosStandIn)"""
+    import socket
+    import paramiko
+
+    host_key = paramiko.RSAKey.generate(2048)
+
+    class StandInServer(paramiko.ServerInterface):
+        def __init__(self):
+            self.ready = threading.Event()
+
+        def check_auth_password(self, username, password):
+            return paramiko.AUTH_SUCCESSFUL
+
+        def get_allowed_auths(self, username):
+            return "password"
+
+        def check_channel_request(self, kind, chanid):
+            if kind == "session":
+                return paramiko.OPEN_SUCCEEDED
+            return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED_OPEN_REQUEST
+
+        def check_channel_pty_request(self, channel, term, width, height, pixelwidth, pixelheight, modes):
+            return True
+
+        def check_channel_shell_request(self, channel):
+            self.ready.set()
+            return True
+
+        def check_channel_exec_request(self, channel, command):
+            # La commande sshpass du Rebond ouvre directement la CLI emulee
+            self.ready.set()
+            return True
+
+    def serve_channel(channel, stand_in):
+        channel.send(stand_in.banner())
+        while not stand_in.closed:
+            data = channel.recv(65535)
+            if not data:
+                break
+            output = stand_in.feed(data.decode('utf-8', errors='ignore'))
+            if output:
+                channel.send(output)
+        channel.close()
+
+    def serve_client(client):
+        transport = paramiko.Transport(client)
+        transport.add_server_key(host_key)
+        server = StandInServer()
+        transport.start_server(server=server)
+        while transport.is_active():
+            channel = transport.accept(1)
+            if channel is None:
+                continue
+            server.ready.wait(10)
+            threading.Thread(target=serve_channel, args=(channel, JunosStandIn(latency=latency)),
+                             daemon=True).start()
+
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind((host, port))
+    listener.listen(100)
+    print(f"Stand-in Junos en ecoute sur {host}:{port} (Ctrl+C pour arreter)")
+
+    while True:
+        client, address = listener.accept()
+        threading.Thread(target=serve_client, args=(client,), daemon=True).start()
+
+def main():
+    """Fonction principale"""
+    print("Script d'application de configuration Juniper via Rebond")
+    print("=" * 60)
+
+    if len(sys.argv) >= 2 and sys.argv[1] == "--stand-in":
+        if not install_paramiko():
+            sys.exit(1)
+        port = int(sys.argv[2]) if len(sys.argv) > 2 else 2222
+        try:
+            serve_stand_in(port)
+        except KeyboardInterrupt:
+            print("\nArret du stand-in")
+        return
+
+    parser = argparse.ArgumentParser(description="Application des changesets dot1x via Rebond")
+    parser.add_argument("rebond", help="IP du serveur Rebond (ip ou ip:port)")
+    parser.add_argument("rebond_user", help="Utilisateur Rebond")
+    parser.add_argument("rebond_pass", help="Mot de passe Rebond")
+    parser.add_argument("switch_user", help="Utilisateur switch")
+    parser.add_argument("switch_pass", help="Mot de passe switch")
+    parser.add_argument("config_files", nargs="+", help="Configurations recuperees (individuelles ou combinees)")
+    parser.add_argument("--workers", type=int, default=8, help="Switchs traites en parallele (defaut: 8)")
+    parser.add_argument("--per-site", type=int, default=2, help="Switchs simultanes par site (defaut: 2)")
+    parser.add_argument("--confirm", type=int, default=5, help="Delai du commit confirmed en minutes (defaut: 5)")
+    parser.add_argument("--max-lines", type=int, default=None, help="Lignes maximum par lot")
+    parser.add_argument("--check-only", action="store_true", help="commit check seulement, sans commit")
+    args = parser.parse_args()
+
+    try:
+        if not install_paramiko():
+            print("ERROR: Impossible d'installer paramiko. Veuillez l'installer manuellement:")
+            print("pip install paramiko")
+            sys.exit(1)
+
+        jobs = build_push_jobs(args.config_files, max_lines=args.max_lines)
+        print(f"{len(jobs)} switch(s), {sum(len(job['chunks']) for job in jobs)} lot(s) a appliquer")
+        invalid = [job for job in jobs if job.get('errors')]
+        if invalid:
+            print(f"WARNING: {len(invalid)} switch(s) ignore(s), syntaxe invalide: "
+                  + ", ".join(job['hostname'] for job in invalid))
+
+        rebond_ip, _, rebond_port = args.rebond.partition(':')
+        print(f"Connexion au serveur Rebond {rebond_ip}...")
+        rebond_client = open_rebond_client(rebond_ip, args.rebond_user, args.rebond_pass,
+                                           int(rebond_port or 22))
+        print("SUCCESS: Connecte au serveur Rebond")
+
+        try:
+            engine = PushEngine(rebond_channel_factory(rebond_client, args.switch_user, args.switch_pass),
+                                max_workers=args.workers, per_site=args.per_site,
+                                confirm_minutes=args.confirm, check_only=args.check_only)
+            results = engine.push(jobs)
+        finally:
+            rebond_client.close()
+
+        print()
+        for result in results:
+            timings = result['timings']
+            print(f"{result['hostname']:<25} {result['status']:<11} {result['chunks_applied']}/{result['chunks']} lots "
+                  f"{timings['total']:7.1f}s (attente {timings['wait']:.1f}s)"
+                  + (f"  {result['error']}" if result['error'] else ""))
+
+        if any(result['status'] in ('failed', 'invalid', 'confirm-pending') for result in results):
+            sys.exit(1)
+        print("SUCCESS: Application terminee avec succes!")
+
+    except KeyboardInterrupt:
+        print("\nWARNING: Operation annulee par l'utilisateur")
+        sys.exit(1)
+    except Exception as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
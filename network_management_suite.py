@@ -5,10 +5,13 @@ Network Management Suite v2.0
 Interface graphique pour la gestion des equipements reseau avec:
 - Connexion au serveur Robont et recuperation de configuration switch
 - Configuration automatique pour Cisco ISE (Juniper Configuration Tool)
+
+Usage:
+    python network_management_suite.py                      (interface graphique)
+    python network_management_suite.py fetch|parse|generate|batch ...  (ligne de commande)
 """
 
-import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext, filedialog
+import importlib
 import time
 import threading
 import re
@@ -16,36 +19,875 @@ from datetime import datetime
 import os
 import sys
 import json
+import mmap
+import fnmatch
+import copy
+import hashlib
+import ipaddress
+import itertools
+import socket
+import codecs
+import contextlib
+import queue
+import array
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+class LazyModule:
+    """Module importé au premier accès à l'un de ses attributs
+    
+    tkinter et paramiko ne sont chargés que par les chemins qui s'en servent :
+    la ligne de commande d'analyse démarre sans Tk ni SSH.
+    """
+    
+    def __init__(self, name, loader=None):
+        self._name = name
+        self._loader = loader or (lambda: importlib.import_module(name))
+        self._module = None
+    
+    def __getattr__(self, attribute):
+        if self._module is None:
+            self._module = self._loader()
+        value = getattr(self._module, attribute)
+        # Les accès suivants ne repassent plus par __getattr__
+        setattr(self, attribute, value)
+        return value
 
-# Vérifier et installer paramiko si nécessaire
-try:
-    import paramiko
-except ImportError:
-    print("Installation de paramiko en cours...")
+def import_paramiko():
+    """Importe paramiko en l'installant si nécessaire"""
     try:
-        import subprocess
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "paramiko"])
-        import paramiko
-        print("Paramiko installé avec succès!")
-    except Exception as e:
-        messagebox.showerror("Erreur de dependance", 
-            f"Impossible d'installer paramiko: {e}\n\n"
-            "Veuillez installer manuellement:\n"
-            "pip install paramiko")
-        sys.exit(1)
+        return importlib.import_module('paramiko')
+    except ImportError:
+        print("Installation de paramiko en cours...")
+        try:
+            import subprocess
+            subprocess.check_call([sys.executable, "-m", "pip", "install", "paramiko"])
+            module = importlib.import_module('paramiko')
+            print("Paramiko installé avec succès!")
+            return module
+        except Exception as e:
+            raise ImportError(f"Impossible d'installer paramiko: {e}\n\n"
+                              "Veuillez installer manuellement:\n"
+                              "pip install paramiko") from e
+
+tk = LazyModule('tkinter')
+ttk = LazyModule('tkinter.ttk')
+messagebox = LazyModule('tkinter.messagebox')
+scrolledtext = LazyModule('tkinter.scrolledtext')
+filedialog = LazyModule('tkinter.filedialog')
+paramiko = LazyModule('paramiko', import_paramiko)
+
+# Profils de site par défaut (surchargeables via site_profiles.json)
+DEFAULT_SITE_PROFILES = {
+    'default': {
+        'source_address': '10.148.62.241',
+        'management_subnets': ['10.148.0.0/16', '192.168.0.0/16'],
+        'radius_port': 1812,
+        'radius_servers': [
+            {'address': '10.147.32.47', 'secret': '$9$qfTF69tBRcP5Qn9tREdbwsoJUjH.fT'},
+            {'address': '10.147.160.47', 'secret': '$9$72Vw2oJUkm5dbs4JUmPBIREreM8XNVw'}
+        ],
+        'access_profile': '802.1x-auth',
+        'dot1x': {
+            'supplicant': 'multiple',
+            'retries': 3,
+            'transmit_period': 1,
+            'reauthentication': 3600,
+            'supplicant_timeout': 10,
+            'maximum_requests': 3,
+            'mac_radius': True
+        }
+    }
+}
+
+SITE_PROFILES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'site_profiles.json')
+
+def load_site_profiles(file_path=SITE_PROFILES_FILE):
+    """Charge les profils de site (fichier JSON optionnel fusionné avec les valeurs par défaut)"""
+    profiles = copy.deepcopy(DEFAULT_SITE_PROFILES)
+    
+    if file_path and os.path.exists(file_path):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            overrides = json.load(f)
+        
+        for name, params in overrides.items():
+            if name in profiles:
+                profile = copy.deepcopy(profiles[name])
+            else:
+                # Nouveau site : hérite des paramètres par défaut, pas des sous-réseaux
+                profile = copy.deepcopy(DEFAULT_SITE_PROFILES['default'])
+                profile['management_subnets'] = []
+            dot1x = dict(profile['dot1x'], **params.get('dot1x', {}))
+            profile.update(params)
+            profile['dot1x'] = dot1x
+            profiles[name] = profile
+    
+    return profiles
+
+_profiles_fingerprints = {}
+
+def site_profiles_fingerprint(file_path=SITE_PROFILES_FILE):
+    """Empreinte des profils de site tels qu'ils sont sur disque (recalculée si le fichier change)"""
+    try:
+        stat = os.stat(file_path)
+        key = (file_path, stat.st_mtime_ns, stat.st_size)
+    except (OSError, TypeError):
+        key = (file_path, None, None)
+    if key not in _profiles_fingerprints:
+        _profiles_fingerprints[key] = ConfigTemplates.fingerprint(load_site_profiles(file_path))
+    return _profiles_fingerprints[key]
+
+def diff_config_lines(old_config, new_config):
+    """Diff ligne à ligne de deux configurations 'display set' (ordre indifférent)
+    
+    Retourne (lignes ajoutées, lignes supprimées), en temps linéaire.
+    """
+    def statements(config):
+        counts = {}
+        for line in config.split('\n'):
+            trimmed = line.strip()
+            if trimmed and not trimmed.startswith('#'):
+                counts[trimmed] = counts.get(trimmed, 0) + 1
+        return counts
+    
+    old_counts = statements(old_config)
+    new_counts = statements(new_config)
+    added = [line for line, count in new_counts.items()
+             for _ in range(count - old_counts.get(line, 0))]
+    removed = [line for line, count in old_counts.items()
+               for _ in range(count - new_counts.get(line, 0))]
+    return added, removed
+
+class SubnetRadixTree:
+    """Arbre radix binaire de préfixes IP (plus long préfixe correspondant)
+    
+    Une recherche parcourt au plus la longueur du préfixe (32 bits en IPv4),
+    quel que soit le nombre de sous-réseaux configurés.
+    """
+    
+    def __init__(self):
+        # Noeud : [fils bit 0, fils bit 1, valeur]
+        self._roots = {4: [None, None, None], 6: [None, None, None]}
+    
+    def insert(self, network, value):
+        """Associe une valeur à un sous-réseau ('10.148.0.0/16')"""
+        network = ipaddress.ip_network(network, strict=False)
+        bits = int(network.network_address)
+        width = network.max_prefixlen
+        node = self._roots[network.version]
+        
+        for position in range(network.prefixlen):
+            bit = (bits >> (width - 1 - position)) & 1
+            if node[bit] is None:
+                node[bit] = [None, None, None]
+            node = node[bit]
+        node[2] = value
+    
+    def lookup(self, address):
+        """Valeur du plus long préfixe contenant l'adresse, ou None"""
+        try:
+            address = ipaddress.ip_address(address)
+        except ValueError:
+            return None
+        
+        bits = int(address)
+        width = address.max_prefixlen
+        node = self._roots[address.version]
+        found = node[2]
+        
+        for position in range(width):
+            node = node[(bits >> (width - 1 - position)) & 1]
+            if node is None:
+                break
+            if node[2] is not None:
+                found = node[2]
+        return found
+
+class ConfigTemplates:
+    """Templates dot1x / RADIUS paramétrés par profil de site
+    
+    Chaque template est compilé une fois par profil : les paramètres du
+    profil sont substitués à l'avance et il ne reste que le nom
+    d'interface (ou l'adresse source) à insérer. Les blocs rendus sont
+    mis en cache par (profil, interface) ; modifier un profil n'invalide
+    que les blocs de ce profil.
+    """
+    
+    DOT1X_INTERFACE = [
+        ("set protocols dot1x authenticator interface {interface} supplicant {supplicant}", None),
+        ("set protocols dot1x authenticator interface {interface} retries {retries}", None),
+        ("set protocols dot1x authenticator interface {interface} transmit-period {transmit_period}", None),
+        ("set protocols dot1x authenticator interface {interface} reauthentication {reauthentication}", None),
+        ("set protocols dot1x authenticator interface {interface} supplicant-timeout {supplicant_timeout}", None),
+        ("set protocols dot1x authenticator interface {interface} maximum-requests {maximum_requests}", None),
+        ("set protocols dot1x authenticator interface {interface} mac-radius", 'mac_radius')
+    ]
+    
+    RADIUS_SERVER = [
+        "set access radius-server {address} port {radius_port}",
+        'set access radius-server {address} secret "{secret}"',
+        "set access radius-server {address} source-address {source_address}"
+    ]
+    
+    ACCESS_PROFILE_HEADER = [
+        "set access profile {access_profile} accounting-order radius",
+        "set access profile {access_profile} authentication-order radius"
+    ]
+    
+    ACCESS_PROFILE_SERVERS = [
+        "set access profile {access_profile} radius authentication-server {address}",
+        "set access profile {access_profile} radius accounting-server {address}"
+    ]
+    
+    ACCESS_PROFILE_FOOTER = [
+        "set protocols dot1x authenticator authentication-profile-name {access_profile}"
+    ]
+    
+    class _Placeholders(dict):
+        """Laisse intacts les champs non fournis ({interface}, {source_address})"""
+        def __missing__(self, key):
+            return '{' + key + '}'
+    
+    def __init__(self, profiles=None):
+        self.profiles = profiles if profiles is not None else load_site_profiles()
+        self._compiled = {}
+        self._blocks = {}
+        self._subnets = None
+    
+    @staticmethod
+    def fingerprint(params):
+        """Empreinte d'un profil (détecte les modifications réelles)"""
+        return hashlib.sha256(json.dumps(params, sort_keys=True).encode('utf-8')).hexdigest()
+    
+    def set_profile(self, name, params):
+        """Met à jour un profil ; seul son cache est invalidé s'il a changé"""
+        previous = self.profiles.get(name)
+        self.profiles[name] = params
+        if previous is None or self.fingerprint(previous) != self.fingerprint(params):
+            self._compiled.pop(name, None)
+            self._blocks.pop(name, None)
+            self._subnets = None
+    
+    def get_profile(self, name='default'):
+        """Retourne les paramètres d'un profil (profil 'default' si inconnu)"""
+        return self.profiles.get(name) or self.profiles['default']
+    
+    def subnet_index(self):
+        """Arbre radix sous-réseau de management -> profil de site"""
+        if self._subnets is None:
+            tree = SubnetRadixTree()
+            for name, profile in self.profiles.items():
+                for network in profile.get('management_subnets', []):
+                    tree.insert(network, name)
+            self._subnets = tree
+        return self._subnets
+    
+    def classify_address(self, address):
+        """Profil de site dont un sous-réseau de management contient l'adresse"""
+        return self.subnet_index().lookup(address)
+    
+    def _compile(self, name):
+        """Compile les templates d'un profil (une seule fois)"""
+        compiled = self._compiled.get(name)
+        if compiled is not None:
+            return compiled
+        
+        profile = self.get_profile(name)
+        values = self._Placeholders(profile['dot1x'])
+        
+        dot1x = '\n'.join(
+            line.format_map(values)
+            for line, condition in self.DOT1X_INTERFACE
+            if condition is None or profile['dot1x'].get(condition)
+        )
+        
+        # L'adresse source reste un champ : elle dépend de chaque switch
+        shared = {key: value for key, value in profile.items() if key != 'source_address'}
+        values = self._Placeholders(shared)
+        server_values = [self._Placeholders(dict(shared, **server)) for server in profile['radius_servers']]
+        
+        radius = []
+        for current in server_values:
+            radius.extend(line.format_map(current) for line in self.RADIUS_SERVER)
+        radius.extend(line.format_map(values) for line in self.ACCESS_PROFILE_HEADER)
+        for line in self.ACCESS_PROFILE_SERVERS:
+            radius.extend(line.format_map(current) for current in server_values)
+        radius.extend(line.format_map(values) for line in self.ACCESS_PROFILE_FOOTER)
+        
+        compiled = {
+            # Découpage sur le seul champ restant : le rendu est une simple jointure
+            'dot1x': dot1x.split('{interface}'),
+            'radius': '\n'.join(radius).split('{source_address}'),
+            'source_address': profile['source_address']
+        }
+        self._compiled[name] = compiled
+        return compiled
+    
+    def render_dot1x_block(self, interface_name, profile='default'):
+        """Bloc dot1x d'une interface (mis en cache par profil et interface)"""
+        blocks = self._blocks.setdefault(profile, {})
+        block = blocks.get(interface_name)
+        if block is None:
+            block = tuple(interface_name.join(self._compile(profile)['dot1x']).split('\n'))
+            blocks[interface_name] = block
+        return block
+    
+    def render_radius_block(self, source_address=None, profile='default'):
+        """Bloc RADIUS / profil d'accès pour une adresse source"""
+        compiled = self._compile(profile)
+        source_address = source_address or compiled['source_address']
+        blocks = self._blocks.setdefault(profile, {})
+        key = ('radius', source_address)
+        block = blocks.get(key)
+        if block is None:
+            block = tuple(source_address.join(compiled['radius']).split('\n'))
+            blocks[key] = block
+        return block
+
+# Templates partagés : le cache de blocs sert à tous les switches d'un parc
+TEMPLATES = ConfigTemplates()
+
+def interface_sort_key(name):
+    """Clé de tri naturel des interfaces (ge-0/0/2 avant ge-0/0/10)"""
+    prefix = name.split('-', 1)[0]
+    return (prefix, [int(value) for value in re.findall(r'\d+', name)])
+
+class AccessPortClassifier:
+    """Détection des ports access en un seul passage sur les lignes 'set'
+    
+    La table de règles couvre la syntaxe ELS (interface-mode) et non-ELS
+    (port-mode, set vlans ... interface), les interfaces ge-/xe-/mge-/et-
+    et l'exclusion des trunks. Les règles sont compilées une seule fois en
+    une expression unique : chaque ligne n'est examinée qu'une fois.
+    """
+    
+    INTERFACE = r'(?:ge|xe|mge|et)-\d+/\d+/\d+'
+    
+    # Hiérarchies communes : le préfixe n'est parcouru qu'une fois par ligne
+    ETHERNET_SWITCHING = r'set interfaces (?P<{group}>{interface}) unit \d+ family ethernet-switching '
+    VLANS = r'set vlans \S+ interface (?P<{group}>{interface})'
+    
+    # (nom de règle, hiérarchie, suite du motif, verdict)
+    # l'ordre fixe la priorité de la règle rapportée
+    RULES = [
+        ('els-interface-mode-access', ETHERNET_SWITCHING, r'interface-mode access\b', 'access'),
+        ('non-els-port-mode-access', ETHERNET_SWITCHING, r'port-mode access\b', 'access'),
+        ('els-interface-mode-trunk', ETHERNET_SWITCHING, r'interface-mode trunk\b', 'trunk'),
+        ('non-els-port-mode-trunk', ETHERNET_SWITCHING, r'port-mode trunk\b', 'trunk'),
+        ('els-vlan-members', ETHERNET_SWITCHING, r'vlan members \S', 'vlan'),
+        ('non-els-vlan-interface', VLANS, r'(?:\.\d+)?(?:\s|$)', 'vlan'),
+    ]
+    
+    _matcher = None
+    _outcomes = None
+    
+    @classmethod
+    def _compile(cls):
+        """Compile la table de règles en une seule expression (une fois)"""
+        if cls._matcher is None:
+            hierarchies = {}
+            for index, (name, hierarchy, tail, verdict) in enumerate(cls.RULES):
+                hierarchies.setdefault(hierarchy, []).append((index, tail))
+            
+            alternatives = []
+            outcomes = {}
+            for position, (hierarchy, tails) in enumerate(hierarchies.items()):
+                group = f"i{position}"
+                branches = '|'.join(f"(?P<r{index}>{tail})" for index, tail in tails)
+                alternatives.append(hierarchy.format(group=group, interface=cls.INTERFACE) + f"(?:{branches})")
+                for index, _ in tails:
+                    name, _, _, verdict = cls.RULES[index]
+                    outcomes[f"r{index}"] = (name, verdict, group)
+            
+            cls._outcomes = outcomes
+            cls._matcher = re.compile('|'.join(alternatives))
+        return cls._matcher
+    
+    @classmethod
+    def matcher(cls):
+        """Retourne (fonction de correspondance, table règle -> issue) compilées"""
+        return cls._compile().match, cls._outcomes
+    
+    @classmethod
+    def match_line(cls, line):
+        """Retourne (règle, verdict, interface) pour une ligne, ou None"""
+        match = cls._compile().match(line)
+        if not match:
+            return None
+        name, verdict, group = cls._outcomes[match.lastgroup]
+        return name, verdict, match.group(group)
+    
+    @classmethod
+    def classify(cls, lines):
+        """Retourne les ports access triés avec la règle qui les a identifiés"""
+        states = {}
+        match, outcomes = cls.matcher()
+        
+        for line in lines:
+            found = match(line.strip())
+            if found:
+                name, verdict, group = outcomes[found.lastgroup]
+                cls.record(states, name, verdict, found.group(group))
+        
+        return cls.access_ports(states)
+    
+    @staticmethod
+    def record(states, rule, verdict, interface_name):
+        """Met à jour l'état d'une interface avec le verdict d'une règle"""
+        state = states.get(interface_name)
+        if state is None:
+            state = states[interface_name] = {'access_rule': None, 'vlan_rule': None, 'trunk': False}
+        
+        if verdict == 'trunk':
+            state['trunk'] = True
+        elif verdict == 'access':
+            state['access_rule'] = state['access_rule'] or rule
+        else:
+            state['vlan_rule'] = state['vlan_rule'] or rule
+    
+    @staticmethod
+    def access_ports(states):
+        """Ports access : mode access explicite ou VLAN assigné, jamais trunk"""
+        ports = [
+            {'name': name, 'rule': state['access_rule'] or state['vlan_rule']}
+            for name, state in states.items()
+            if not state['trunk'] and (state['access_rule'] or state['vlan_rule'])
+        ]
+        ports.sort(key=lambda port: interface_sort_key(port['name']))
+        return ports
+
+class SetSyntaxValidator:
+    """Pré-validation hors ligne des déclarations 'set'/'delete' générées
+    
+    Une table de grammaire compacte décrit les hiérarchies produites par les
+    générateurs. Les règles sont compilées en une regex par (verbe, premier
+    mot) : une recherche dans un dict puis un seul fullmatch par ligne.
+    """
+    
+    # Jetons de la grammaire
+    TOKENS = {
+        'ip': r'(?:(?:25[0-5]|2[0-4]\d|1?\d?\d)\.){3}(?:25[0-5]|2[0-4]\d|1?\d?\d)',
+        'iface': r'(?:ge|xe|mge|et)-\d{1,2}/\d{1,2}/\d{1,2}',
+        'name': r'(?:[\w.-]+|"[^"]+")',
+        'secret': r'(?:"[^"]*"|\S+)',
+    }
+    
+    # Valeurs numériques et leurs plages Junos
+    RANGES = {
+        'port': (1, 65535),
+        'timeout': (1, 1000),
+        'retry': (1, 100),
+        'retries': (1, 10),
+        'transmit_period': (1, 65535),
+        'reauthentication': (1, 65535),
+        'supplicant_timeout': (1, 60),
+        'maximum_requests': (1, 10),
+        'server_timeout': (1, 60),
+        'quiet_period': (0, 65535),
+        'unit': (0, 16385),
+        'mac_limit': (1, 65535),
+    }
+    
+    # (verbes, hiérarchie, suite de la déclaration)
+    GRAMMAR = (
+        (('set', 'delete'), 'access radius-server',
+         r'{ip}(?: port {port}| secret {secret}| source-address {ip}| timeout {timeout}| retry {retry})?'),
+        (('set', 'delete'), 'access profile',
+         r'{name}(?: accounting-order radius| authentication-order radius'
+         r'| radius (?:authentication|accounting)-server {ip})?'),
+        (('set', 'delete'), 'protocols dot1x authenticator',
+         r'(?:authentication-profile-name {name}'
+         r'|interface {iface}(?: supplicant (?:single|single-secure|multiple)| retries {retries}'
+         r'| transmit-period {transmit_period}| reauthentication {reauthentication}'
+         r'| supplicant-timeout {supplicant_timeout}| maximum-requests {maximum_requests}'
+         r'| server-timeout {server_timeout}| quiet-period {quiet_period}| mac-radius(?: restrict)?)?)'),
+        (('set', 'delete'), 'interfaces',
+         r'(?:{iface}|interface-range {name})'
+         r'(?: unit {unit} family ethernet-switching(?: \S.*)?| ethernet-switching-options(?: \S.*)?)'),
+        (('delete',), 'groups',
+         r'{name} interfaces (?:{iface}|"<[^"]+>"|<\S+>)'
+         r'(?: unit {unit} family ethernet-switching(?: \S.*)?| ethernet-switching-options(?: \S.*)?)'),
+        (('set', 'delete'), 'ethernet-switching-options secure-access-port',
+         r'interface {iface}(?: mac-limit (?:{mac_limit}|action (?:drop|log|none|shutdown)))?'),
+    )
+    
+    _dispatch = None
+    
+    @classmethod
+    def _compile(cls):
+        """Compile la grammaire : regex par (verbe, premier mot) et contrôles de plage"""
+        alternatives = {}
+        fields = {}
+        
+        for index, (verbs, hierarchy, tail) in enumerate(cls.GRAMMAR):
+            group = f"r{index}"
+            head, _, rest = hierarchy.partition(' ')
+            checks = []
+            
+            def token(match):
+                name = match.group(1)
+                if name in cls.RANGES:
+                    checks.append((f"{group}_{name}", name.replace('_', '-')) + cls.RANGES[name])
+                    return rf"(?P<{group}_{name}>\d+)"
+                return cls.TOKENS[name]
+            
+            body = re.sub(r'\{(\w+)\}', token, (rest + ' ' if rest else '') + tail)
+            fields[group] = checks
+            for verb in verbs:
+                alternatives.setdefault((verb, head), []).append(f"(?P<{group}>{body})")
+        
+        cls._dispatch = {
+            key: (re.compile('|'.join(parts)), fields)
+            for key, parts in alternatives.items()
+        }
+    
+    @classmethod
+    def validate_line(cls, line):
+        """Retourne None si la ligne est valide, sinon le motif du rejet"""
+        if cls._dispatch is None:
+            cls._compile()
+        
+        line = line.strip()
+        if not line or line.startswith('#'):
+            return None
+        
+        verb, _, rest = line.partition(' ')
+        head, _, tail = rest.partition(' ')
+        entry = cls._dispatch.get((verb, head))
+        if entry is None:
+            return f"hiérarchie non prise en charge: {verb} {head}"
+        
+        pattern, fields = entry
+        match = pattern.fullmatch(tail)
+        if not match:
+            return f"syntaxe invalide sous '{head}'"
+        
+        for group, label, low, high in fields[match.lastgroup]:
+            value = match.group(group)
+            if value is not None and not low <= int(value) <= high:
+                return f"{label} hors plage ({low}-{high}): {value}"
+        return None
+    
+    @classmethod
+    def validate(cls, lines):
+        """Valide une sortie de générateur, retourne [(numéro, ligne, motif)]"""
+        errors = []
+        for number, line in enumerate(lines, 1):
+            reason = cls.validate_line(line)
+            if reason:
+                errors.append((number, line, reason))
+        return errors
+    
+    @classmethod
+    def validate_fleet(cls, outputs):
+        """Valide en lot les sorties d'une flotte {switch: lignes}, retourne les switchs en erreur"""
+        report = {}
+        for name, lines in outputs.items():
+            errors = cls.validate(lines)
+            if errors:
+                report[name] = errors
+        return report
+
+# Taille maximale d'un lot pour 'load set terminal' + commit
+COMMIT_CHUNK_LINES = 400
+COMMIT_CHUNK_BYTES = 32768
 
 class ConfigurationParser:
     """Analyseur de configuration Juniper pour extraction d'informations"""
     
-    def __init__(self, config_text):
+    # Nom d'interface physique Juniper (ge-0/0/1, xe-1/0/47, ...)
+    INTERFACE_NAME = re.compile(r'^([a-z]+)-(\d+)/(\d+)/(\d+)$')
+    
+    # Motifs wildcard des groupes (<ge-*>) compilés une seule fois
+    _wildcard_patterns = {}
+    
+    # Référence à une interface hors de 'set interfaces' (dot1x, secure-access-port, ...)
+    INTERFACE_REFERENCE = re.compile(r' interface ((?:ge|xe|mge|et)-\d+/\d+/\d+)(?: |$)')
+    
+    def __init__(self, config_text, profile=None, templates=None):
         self.config = config_text
+        self.profile = profile
+        self.templates = templates or TEMPLATES
+        self._expanded_lines = None
+        self._group_cache = {}
+        self._index = None
+        self._statements = None
+        self._switch_info = None
+        self._literal_interfaces = {}
+        self._global_groups = []
+        self._literal_lines = {}
+        self._inherited = {}
+        self._inheritors = {}
+        self._spanning_ranges = False
     
-    def get_switch_info(self):
-        """Extrait les informations du switch (hostname, IP management)"""
-        lines = self.config.split('\n')
-        info = {'hostname': None, 'management_ip': None}
+    def copy(self):
+        """Copie indépendante du parser : l'index est dupliqué, l'original n'est plus modifié
+        
+        Utilisée pour une mise à jour incrémentale (update_configuration) sans
+        toucher au parser dont les résultats sont affichés.
+        """
+        clone = copy.copy(self)
+        if self._index is not None:
+            clone._index = {
+                'statements': {name: list(lines) for name, lines in self._index['statements'].items()},
+                'states': {name: dict(state) for name, state in self._index['states'].items()},
+            }
+        if self._expanded_lines is not None:
+            clone._expanded_lines = list(self._expanded_lines)
+        if self._statements is not None:
+            clone._statements = set(self._statements)
+        clone._literal_lines = dict(self._literal_lines)
+        clone._group_cache = dict(self._group_cache)
+        return clone
+    
+    def get_expanded_lines(self):
+        """Retourne la configuration avec interface-range et apply-groups résolus
         
+        Les membres des interface-range et les interfaces héritant de groupes
+        (y compris wildcard <ge-*>) reçoivent des lignes 'set interfaces <nom> ...'
+        explicites, pour que la détection des ports access les voie.
+        """
+        if self._expanded_lines is None:
+            self._expanded_lines = self._expand_configuration()
+        return self._expanded_lines
+    
+    def _expand_configuration(self):
+        """Etape d'expansion exécutée une seule fois par configuration"""
+        lines = []
+        ranges = {}
+        groups = {}
+        global_groups = []
+        interface_groups = {}
+        interface_excluded = {}
+        interfaces = {}
+        literal = {}  # nombre de déclarations 'set interfaces <nom> ...' par interface
+        member_ranges = []
+        
+        for line in self.config.split('\n'):
+            trimmed = line.strip()
+            if not trimmed or trimmed.startswith('#'):
+                continue
+            lines.append(trimmed)
+            if not trimmed.startswith(('set interfaces ', 'set groups ', 'set apply-groups ')):
+                continue
+            
+            # Cas le plus fréquent : simple déclaration sur une interface
+            parts = trimmed.split(None, 4)
+            if (parts[1] == 'interfaces' and len(parts) >= 4
+                    and parts[2] not in ('interface-range', 'apply-groups')
+                    and not parts[3].startswith('apply-groups')):
+                interfaces.setdefault(parts[2], True)
+                literal[parts[2]] = literal.get(parts[2], 0) + 1
+                continue
+            
+            parts = trimmed.split()
+            if parts[:2] == ['set', 'apply-groups'] or parts[:3] == ['set', 'interfaces', 'apply-groups']:
+                global_groups.extend(self._group_names(parts[2:] if parts[1] == 'apply-groups' else parts[3:]))
+            
+            elif parts[:2] == ['set', 'groups'] and len(parts) >= 6 and parts[3] == 'interfaces':
+                pattern = parts[4].strip('"')
+                groups.setdefault(parts[2], []).append((pattern, ' '.join(parts[5:])))
+            
+            elif parts[:3] == ['set', 'interfaces', 'interface-range'] and len(parts) >= 6:
+                interface_range = ranges.setdefault(parts[3], {'members': [], 'statements': [], 'groups': []})
+                if parts[4] == 'member-range' and len(parts) >= 8 and parts[6] == 'to':
+                    member_ranges.append((interface_range, parts[5], parts[7]))
+                elif parts[4] == 'member':
+                    interface_range['members'].extend(self._expand_member(parts[5].strip('"')))
+                elif parts[4] == 'apply-groups':
+                    interface_range['groups'].extend(self._group_names(parts[5:]))
+                else:
+                    interface_range['statements'].append(' '.join(parts[4:]))
+            
+            elif parts[:2] == ['set', 'interfaces'] and len(parts) >= 4:
+                name = parts[2]
+                interfaces.setdefault(name, True)
+                literal[name] = literal.get(name, 0) + 1
+                if parts[3] == 'apply-groups':
+                    interface_groups.setdefault(name, []).extend(self._group_names(parts[4:]))
+                elif parts[3] == 'apply-groups-except':
+                    interface_excluded.setdefault(name, []).extend(self._group_names(parts[4:]))
+        
+        # Les member-range sont développés une fois toutes les interfaces connues :
+        # le dernier port de chaque PIC se déduit des ports présents dans la configuration
+        if member_ranges:
+            known = list(interfaces)
+            for interface_range, start, end in member_ranges:
+                known += [start, end]
+            for interface_range in ranges.values():
+                known += interface_range['members']
+            last_ports = self._last_ports(known)
+            for interface_range, start, end in member_ranges:
+                interface_range['members'].extend(self._expand_member_range(start, end, last_ports))
+        self._spanning_ranges = any(start.rsplit('/', 1)[0] != end.rsplit('/', 1)[0]
+                                    for _, start, end in member_ranges)
+        
+        # Conservés pour apply_line_diff : l'apparition ou la disparition d'une
+        # interface change ce qu'elle hérite des groupes globaux (et la taille
+        # des PIC parcourus par un member-range qui en couvre plusieurs)
+        self._literal_interfaces = literal
+        self._global_groups = [group for group in global_groups if group in groups]
+        
+        # Origine des déclarations héritées : interface -> [(chemin source, déclaration)],
+        # pour que le nettoyage supprime la déclaration là où elle est écrite
+        self._literal_lines = literal_lines = {}
         for line in lines:
+            literal_lines[line] = literal_lines.get(line, 0) + 1
+        self._inherited = inherited = {}
+        expanded = []
+        
+        # Membres des interface-range
+        for range_name, interface_range in ranges.items():
+            source = f"interfaces interface-range {range_name}"
+            for member in interface_range['members']:
+                interfaces.setdefault(member, True)
+                interface_groups.setdefault(member, []).extend(interface_range['groups'])
+                for statement in interface_range['statements']:
+                    expanded.append(f"set interfaces {member} {statement}")
+                    inherited.setdefault(member, []).append((source, statement))
+        
+        # Interfaces nommées explicitement dans un groupe appliqué globalement
+        for group in global_groups:
+            for pattern, _ in groups.get(group, []):
+                if not pattern.startswith('<'):
+                    interfaces.setdefault(pattern, True)
+        
+        # Héritage des groupes, mémorisé par (groupe, interface)
+        for name in interfaces:
+            excluded = interface_excluded.get(name, [])
+            for group in global_groups + interface_groups.get(name, []):
+                if group not in excluded and group in groups:
+                    statements = self._expand_group(group, groups[group], name)
+                    expanded.extend(f"set interfaces {name} {statement}" for _, statement in statements)
+                    inherited.setdefault(name, []).extend(statements)
+        
+        # Inverse de l'origine : chemin source -> interfaces qui en héritent
+        self._inheritors = inheritors = {}
+        for name, statements in inherited.items():
+            for source, statement in statements:
+                inheritors.setdefault(source, {}).setdefault(name, []).append(statement)
+        
+        # Dédoublonnage en conservant l'ordre
+        return list(dict.fromkeys(lines + expanded))
+    
+    def _expand_group(self, group, statements, interface_name):
+        """Déclarations héritées d'un groupe par une interface, avec leur chemin source (mémorisées)"""
+        key = (group, interface_name)
+        if key not in self._group_cache:
+            self._group_cache[key] = [
+                (f'groups {group} interfaces "{pattern}"' if pattern.startswith('<')
+                 else f"groups {group} interfaces {pattern}", statement)
+                for pattern, statement in statements
+                if self._pattern_matches(pattern, interface_name)
+            ]
+        return self._group_cache[key]
+    
+    @classmethod
+    def _pattern_matches(cls, pattern, interface_name):
+        """Teste un nom d'interface contre un motif de groupe (<ge-*> ou littéral)"""
+        if not pattern.startswith('<'):
+            return pattern == interface_name
+        
+        compiled = cls._wildcard_patterns.get(pattern)
+        if compiled is None:
+            compiled = re.compile(fnmatch.translate(pattern.strip('<>')))
+            cls._wildcard_patterns[pattern] = compiled
+        return compiled.match(interface_name) is not None
+    
+    @staticmethod
+    def _group_names(tokens):
+        """Noms de groupes d'une clause apply-groups (simple ou liste [ a b ])"""
+        return [token.strip('"') for token in tokens if token not in ('[', ']')]
+    
+    @classmethod
+    def _expand_member(cls, member):
+        """Développe un membre d'interface-range (ge-0/0/[1-5] accepté)"""
+        match = re.match(r'^(.*/)\[(\d+)-(\d+)\]$', member)
+        if not match:
+            return [member]
+        prefix, first, last = match.group(1), int(match.group(2)), int(match.group(3))
+        return [f"{prefix}{port}" for port in range(first, last + 1)]
+    
+    # Nombres de ports usuels d'un PIC (EX/QFX) : le plus haut port vu est arrondi au suivant
+    PIC_PORT_COUNTS = (4, 8, 12, 16, 24, 32, 48, 96)
+    
+    @classmethod
+    def _last_ports(cls, names):
+        """Dernier port de chaque PIC : {(type, fpc, pic): port}, d'après les interfaces connues"""
+        highest = {}
+        for name in names:
+            match = cls.INTERFACE_NAME.match(name)
+            if match:
+                key = (match.group(1), int(match.group(2)), int(match.group(3)))
+                highest[key] = max(highest.get(key, 0), int(match.group(4)))
+        
+        last_ports = {}
+        for key, port in highest.items():
+            count = next((count for count in cls.PIC_PORT_COUNTS if count > port), port + 1)
+            last_ports[key] = count - 1
+        return last_ports
+    
+    @staticmethod
+    def _last_port(last_ports, prefix, fpc, pic):
+        """Dernier port d'un PIC, sinon celui du même PIC sur un autre membre VC (48 ports par défaut)"""
+        port = last_ports.get((prefix, fpc, pic))
+        if port is None:
+            port = max((last for (kind, _, number), last in last_ports.items()
+                        if kind == prefix and number == pic), default=47)
+        return port
+    
+    @classmethod
+    def _expand_member_range(cls, start, end, last_ports=None):
+        """Développe 'member-range ge-0/0/0 to ge-0/0/47' (y compris entre membres VC)
+        
+        Le parcours suit fpc, pic puis port ; chaque PIC est parcouru jusqu'à son
+        dernier port (last_ports, voir _last_ports) et non jusqu'au port de fin.
+        """
+        if last_ports is None:
+            last_ports = cls._last_ports([start, end])
+        start_match = cls.INTERFACE_NAME.match(start)
+        end_match = cls.INTERFACE_NAME.match(end)
+        if not start_match or not end_match or start_match.group(1) != end_match.group(1):
+            return [start, end]
+        
+        prefix = start_match.group(1)
+        first = tuple(int(value) for value in start_match.groups()[1:])
+        last = tuple(int(value) for value in end_match.groups()[1:])
+        if first > last:
+            first, last = last, first
+        
+        # Parcours lexicographique fpc/pic/port (ex: ge-0/0/46 to ge-1/0/2 sur un
+        # virtual chassis donne ge-0/0/46, ge-0/0/47 puis ge-1/0/0 à ge-1/0/2)
+        last_pic = max(first[1], last[1])
+        members = []
+        fpc, pic, port = first
+        last_port = cls._last_port(last_ports, prefix, fpc, pic)
+        while (fpc, pic, port) <= last:
+            members.append(f"{prefix}-{fpc}/{pic}/{port}")
+            port += 1
+            if port > last_port:
+                port = 0
+                pic += 1
+                if pic > last_pic:
+                    pic = 0
+                    fpc += 1
+                last_port = cls._last_port(last_ports, prefix, fpc, pic)
+        return members
+    
+    # Adresse IPv4 d'une unité logique d'interface
+    INTERFACE_ADDRESS = re.compile(
+        r'set interfaces (\S+) unit (\d+) family inet address (\d{1,3}(?:\.\d{1,3}){3})(?:/\d+)?')
+    
+    def get_switch_info(self):
+        """Extrait les informations du switch (hostname, IP management, site)"""
+        if self._switch_info is not None:
+            return dict(self._switch_info)
+        
+        info = {'hostname': None, 'management_ip': None, 'site': None}
+        first_address = None
+        subnets = self.templates.subnet_index()
+        
+        for line in self.config.split('\n'):
             trimmed = line.strip()
             
             # Extract hostname
@@ -54,112 +896,1931 @@ class ConfigurationParser:
                 if len(parts) >= 4:
                     info['hostname'] = parts[3].strip('"')
             
-            # Extract management IP - improved detection
-            if 'set interfaces' in trimmed and 'unit 0 family inet address' in trimmed:
-                parts = trimmed.split(' ')
+            # Chaque adresse est classée par l'arbre radix des sous-réseaux de management
+            elif trimmed.startswith('set interfaces ') and ' family inet address ' in trimmed:
+                match = self.INTERFACE_ADDRESS.match(trimmed)
+                if not match:
+                    continue
+                interface_name, unit, ip = match.groups()
+                
+                site = subnets.lookup(ip)
+                if site is not None:
+                    info['management_ip'] = ip
+                    info['site'] = site
+                elif first_address is None and unit == '0':
+                    first_address = ip
+        
+        if info['management_ip'] is None:
+            info['management_ip'] = first_address
+        
+        self._switch_info = info
+        return dict(info)
+    
+    def get_profile(self):
+        """Profil de site : explicite, sinon déduit du sous-réseau de management"""
+        return self.profile or self.get_switch_info()['site'] or 'default'
+    
+    def get_index(self):
+        """Index par interface : déclarations et état de classification"""
+        if self._index is None:
+            self._index = {'statements': {}, 'states': {}}
+            match, outcomes = AccessPortClassifier.matcher()
+            
+            # Un seul passage : regroupement par interface et classification
+            for trimmed in self.get_expanded_lines():
+                self._index_line(trimmed, match, outcomes)
+        return self._index
+    
+    def _index_line(self, trimmed, match, outcomes):
+        """Ajoute une déclaration à l'index, retourne l'interface concernée"""
+        index = self._index
+        interface_name = None
+        
+        if trimmed.startswith('set interfaces '):
+            interface_name = trimmed.split(' ', 3)[2]
+        
+        found = match(trimmed)
+        if found:
+            rule, verdict, group = outcomes[found.lastgroup]
+            interface_name = found.group(group)
+            AccessPortClassifier.record(index['states'], rule, verdict, interface_name)
+        elif not interface_name and ' interface ' in trimmed:
+            reference = self.INTERFACE_REFERENCE.search(trimmed)
+            if reference:
+                interface_name = reference.group(1)
+        
+        if interface_name:
+            index['statements'].setdefault(interface_name, []).append(trimmed)
+        return interface_name
+    
+    def get_interfaces(self):
+        """Extrait les interfaces access (après expansion des ranges et groupes)"""
+        index = self.get_index()
+        return [
+            {
+                'name': port['name'],
+                'config': index['statements'].get(port['name'], []),
+                'is_access': True,
+                'access_rule': port['rule']
+            }
+            for port in AccessPortClassifier.access_ports(index['states'])
+        ]
+    
+    # Déclarations qui modifient l'expansion (ranges, groupes) : réindexation complète
+    EXPANSION_PREFIXES = ('set interfaces interface-range ', 'set groups ', 'set apply-groups ',
+                          'set interfaces apply-groups ')
+    
+    def apply_line_diff(self, added, removed):
+        """Applique un diff ligne à ligne à l'index, retourne les interfaces touchées
+        
+        Hors changement d'expansion, la vue étendue, l'ensemble des
+        déclarations et l'index sont mis à jour sur place : rien n'est
+        ré-analysé au prochain appel de génération.
+        """
+        index = self.get_index()
+        
+        if (any(line.startswith(self.EXPANSION_PREFIXES) or ' apply-groups' in line
+                for line in added + removed)
+                or self._changes_interface_set(added, removed)):
+            previous = index
+            self._expanded_lines = None
+            self._statements = None
+            self._group_cache = {}
+            self._index = None
+            current = self.get_index()
+            return {name for name in set(previous['statements']) | set(current['statements'])
+                    | set(previous['states']) | set(current['states'])
+                    if previous['states'].get(name) != current['states'].get(name)
+                    or set(previous['statements'].get(name, ())) != set(current['statements'].get(name, ()))}
+        
+        match, outcomes = AccessPortClassifier.matcher()
+        literal_lines = self._literal_lines
+        present = self.get_statements()
+        affected = set()
+        
+        # Une ligne retirée reste présente si elle est dupliquée ou encore
+        # héritée d'un interface-range ou d'un groupe
+        gone = set()
+        for line in removed:
+            count = literal_lines.get(line, 0) - 1
+            if count > 0:
+                literal_lines[line] = count
+                continue
+            literal_lines.pop(line, None)
+            if not self._is_inherited(line):
+                gone.add(line)
+        
+        for line in gone:
+            for name, statements in self._statements_for(line, match, outcomes):
+                if line in statements:
+                    statements.remove(line)
+                    affected.add(name)
+        
+        new = []
+        for line in added:
+            literal_lines[line] = literal_lines.get(line, 0) + 1
+            if line in present or line in new:
+                continue
+            new.append(line)
+            name = self._index_line(line, match, outcomes)
+            if name:
+                affected.add(name)
+        
+        # Reclassification limitée aux interfaces touchées
+        for name in affected:
+            index['states'].pop(name, None)
+            for statement in index['statements'].get(name, []):
+                found = match(statement)
+                if found:
+                    rule, verdict, group = outcomes[found.lastgroup]
+                    AccessPortClassifier.record(index['states'], rule, verdict, found.group(group))
+        
+        if gone:
+            self._expanded_lines = [line for line in self._expanded_lines if line not in gone]
+            present -= gone
+        self._expanded_lines.extend(new)
+        present.update(new)
+        return affected
+    
+    def _is_inherited(self, line):
+        """Indique si une déclaration d'interface est aussi produite par l'expansion"""
+        if not line.startswith('set interfaces '):
+            return False
+        parts = line.split(' ', 3)
+        return len(parts) == 4 and any(statement == parts[3] for _, statement in self._inherited.get(parts[2], ()))
+    
+    def _changes_interface_set(self, added, removed):
+        """Indique si le diff crée ou supprime une interface soumise à des groupes globaux
+        
+        Une nouvelle interface hérite des groupes appliqués globalement
+        (<xe-*> ...) et une interface supprimée perd cet héritage : seule
+        une nouvelle expansion donne alors le même index qu'une analyse
+        complète. Les compteurs de déclarations sont tenus à jour sinon.
+        """
+        counts = dict(self._literal_interfaces)
+        for line, delta in itertools.chain(((line, -1) for line in removed), ((line, 1) for line in added)):
+            if line.startswith('set interfaces '):
+                parts = line.split(None, 3)
+                if len(parts) >= 4:
+                    counts[parts[2]] = counts.get(parts[2], 0) + delta
+        
+        changed = any((counts.get(name, 0) > 0) != (self._literal_interfaces.get(name, 0) > 0)
+                      for name in set(counts) | set(self._literal_interfaces))
+        if changed and (self._global_groups or self._spanning_ranges):
+            return True
+        self._literal_interfaces = {name: count for name, count in counts.items() if count > 0}
+        return False
+    
+    def _statements_for(self, line, match, outcomes):
+        """Listes de déclarations de l'index pouvant contenir une ligne"""
+        statements = self._index['statements']
+        names = set()
+        if line.startswith('set interfaces '):
+            names.add(line.split(' ', 3)[2])
+        found = match(line)
+        if found:
+            names.add(found.group(outcomes[found.lastgroup][2]))
+        elif ' interface ' in line:
+            reference = self.INTERFACE_REFERENCE.search(line)
+            if reference:
+                names.add(reference.group(1))
+        return [(name, statements[name]) for name in names if name in statements]
+    
+    def update_configuration(self, new_config):
+        """Régénération incrémentale après une nouvelle récupération de la configuration
+        
+        Seules les interfaces dont les déclarations ont changé sont traitées :
+        les ports access touchés reçoivent les lignes dot1x et cleanup
+        manquantes (mêmes lignes qu'une régénération complète pour ces ports),
+        les ports qui ne sont plus access leurs suppressions dot1x.
+        """
+        old_access = {port['name'] for port in AccessPortClassifier.access_ports(self.get_index()['states'])}
+        added, removed = diff_config_lines(self.config, new_config)
+        
+        self.config = new_config
+        self._switch_info = None
+        affected = self.apply_line_diff(added, removed)
+        
+        new_access = {port['name'] for port in AccessPortClassifier.access_ports(self._index['states'])}
+        added_interfaces = sorted((affected & new_access) - old_access, key=interface_sort_key)
+        removed_interfaces = sorted((affected & old_access) - new_access, key=interface_sort_key)
+        regenerated = [{'name': name, 'is_access': True}
+                       for name in sorted(affected & new_access, key=interface_sort_key)]
+        
+        return {
+            'changed_lines': len(added) + len(removed),
+            'affected_interfaces': sorted(affected, key=interface_sort_key),
+            'added_interfaces': added_interfaces,
+            'removed_interfaces': removed_interfaces,
+            'dot1x': self.generate_dot1x_config(regenerated),
+            'cleanup': self.generate_cleanup_config(regenerated),
+            'dot1x_removed': '\n'.join(
+                f"delete protocols dot1x authenticator interface {name}" for name in removed_interfaces
+                if self.has_stanza(name, f"set protocols dot1x authenticator interface {name}"))
+        }
+    
+    def get_statements(self):
+        """Ensemble des déclarations présentes (après expansion), pour les tests d'existence"""
+        if self._statements is None:
+            self._statements = set(self.get_expanded_lines())
+        return self._statements
+    
+    def has_statement(self, line):
+        """Indique si une déclaration 'set' est déjà présente dans la configuration"""
+        return line in self.get_statements()
+    
+    def has_stanza(self, interface_name, prefix):
+        """Indique si une interface possède au moins une déclaration sous un préfixe"""
+        return any(statement == prefix or statement.startswith(prefix + ' ')
+                   for statement in self.get_index()['statements'].get(interface_name, ()))
+    
+    def iter_dot1x_config(self, interfaces, only_missing=True):
+        """Genere la configuration 802.1x ligne par ligne (sans tout matérialiser)
+        
+        Avec only_missing, les déclarations déjà présentes sont omises :
+        seules les lignes manquantes ou de valeur différente sont émises.
+        """
+        existing = self.get_statements() if only_missing else ()
+        for iface in interfaces:
+            if iface['is_access']:
+                for line in self.templates.render_dot1x_block(iface['name'], self.get_profile()):
+                    if line not in existing:
+                        yield line
+    
+    def generate_dot1x_config(self, interfaces, only_missing=True):
+        """Genere la configuration 802.1x"""
+        return '\n'.join(self.iter_dot1x_config(interfaces, only_missing))
+    
+    # Stanzas supprimées par le nettoyage des ports access
+    CLEANUP_STANZAS = ('unit 0 family ethernet-switching', 'ethernet-switching-options')
+    
+    def stanza_sources(self, interface_name, stanza):
+        """Chemins où une stanza d'interface est réellement écrite
+        
+        'interfaces <nom>' pour une déclaration littérale, sinon l'interface-range
+        ou le groupe ('groups G interfaces <xe-*>') dont l'interface l'hérite :
+        un 'delete' sur l'interface elle-même ne supprimerait pas l'héritage.
+        """
+        self.get_expanded_lines()
+        sources = []
+        prefix = f"set interfaces {interface_name} {stanza}"
+        if any((statement == prefix or statement.startswith(prefix + ' ')) and statement in self._literal_lines
+               for statement in self.get_index()['statements'].get(interface_name, ())):
+            sources.append(f"interfaces {interface_name}")
+        for source, statement in self._inherited.get(interface_name, ()):
+            if (statement == stanza or statement.startswith(stanza + ' ')) and source not in sources:
+                sources.append(source)
+        return sources
+    
+    def stanza_inheritors(self, source, stanza):
+        """Interfaces qui héritent d'une stanza depuis un interface-range ou un groupe"""
+        self.get_expanded_lines()
+        return {name for name, statements in self._inheritors.get(source, {}).items()
+                if any(statement == stanza or statement.startswith(stanza + ' ') for statement in statements)}
+    
+    def iter_cleanup_config(self, interfaces, only_missing=True, emitted=None, access=None):
+        """Genere la configuration de nettoyage ligne par ligne
+        
+        Avec only_missing, un 'delete' n'est émis que si la stanza existe, sur
+        le chemin où elle est écrite (interface, interface-range ou groupe) ;
+        un range ou un groupe partagé n'est supprimé qu'une fois (emitted), et
+        seulement si tous ses membres sont des ports access à nettoyer (access,
+        par défaut les ports de interfaces). Sinon la suppression retirerait la
+        stanza des ports trunk : un commentaire d'avertissement est émis à la place.
+        """
+        emitted = set() if emitted is None else emitted
+        if access is None:
+            access = {iface['name'] for iface in interfaces if iface['is_access']}
+        for iface in interfaces:
+            if iface['is_access']:
+                name = iface['name']
+                for stanza in self.CLEANUP_STANZAS:
+                    sources = self.stanza_sources(name, stanza) if only_missing else [f"interfaces {name}"]
+                    for source in sources:
+                        line = f"delete {source} {stanza}"
+                        if source != f"interfaces {name}":
+                            others = sorted(self.stanza_inheritors(source, stanza) - access, key=interface_sort_key)
+                            if others:
+                                line = (f"# {source} {stanza} non supprimé: hérité aussi par "
+                                        f"{len(others)} port(s) hors nettoyage ({', '.join(others[:5])}"
+                                        f"{', ...' if len(others) > 5 else ''})")
+                        if line not in emitted:
+                            emitted.add(line)
+                            yield line
+    
+    def generate_cleanup_config(self, interfaces, only_missing=True):
+        """Genere la configuration de nettoyage"""
+        return '\n'.join(self.iter_cleanup_config(interfaces, only_missing))
+    
+    def iter_radius_config(self, management_ip=None, only_missing=True):
+        """Genere la configuration RADIUS ligne par ligne (déclarations manquantes seulement)"""
+        existing = self.get_statements() if only_missing else ()
+        for line in self.templates.render_radius_block(management_ip, self.get_profile()):
+            if line not in existing:
+                yield line
+    
+    def get_radius_config(self, management_ip=None, only_missing=True):
+        """Genere la configuration RADIUS"""
+        return '\n'.join(self.iter_radius_config(management_ip, only_missing))
+    
+    def iter_changeset_units(self, interfaces, management_ip=None, only_missing=True):
+        """Unités indivisibles du changeset, dans l'ordre d'application
+        
+        RADIUS et profil d'accès d'abord (référencés par dot1x), puis le
+        nettoyage et enfin dot1x, chaque unité regroupant les lignes d'une interface.
+        Produit des tuples (section, clé, lignes).
+        """
+        radius = list(self.iter_radius_config(management_ip, only_missing))
+        if radius:
+            yield ('radius', None, radius)
+        
+        # Un range ou un groupe partagé par plusieurs ports n'est nettoyé qu'une fois,
+        # et seulement si tous ses membres font partie du changeset
+        emitted = set()
+        access = {iface['name'] for iface in interfaces if iface['is_access']}
+        cleanup = lambda ports, only_missing: self.iter_cleanup_config(ports, only_missing, emitted, access)
+        
+        for section, generate in (('cleanup', cleanup), ('dot1x', self.iter_dot1x_config)):
+            for iface in interfaces:
+                lines = list(generate([iface], only_missing))
+                if lines:
+                    yield (section, iface['name'], lines)
+    
+    def chunk_changeset(self, interfaces, management_ip=None, max_lines=COMMIT_CHUNK_LINES,
+                        max_bytes=COMMIT_CHUNK_BYTES, only_missing=True):
+        """Découpe le changeset complet en lots ordonnés (voir chunk_config_units)"""
+        units = self.iter_changeset_units(interfaces, management_ip, only_missing)
+        return chunk_config_units(units, max_lines, max_bytes)
+
+def iter_config_chunks(lines, chunk_size=65536, encoding='utf-8'):
+    """Regroupe des lignes générées en blocs d'octets (réponse HTTP en streaming)"""
+    block = []
+    size = 0
+    
+    for line in lines:
+        block.append(line)
+        size += len(line) + 1
+        if size >= chunk_size:
+            block.append('')
+            yield '\n'.join(block).encode(encoding)
+            block = []
+            size = 0
+    
+    if block:
+        block.append('')
+        yield '\n'.join(block).encode(encoding)
+
+def stream_config_lines(lines, sink, chunk_size=65536, encoding='utf-8'):
+    """Ecrit des lignes générées directement dans un fichier, un socket ou une fonction
+    
+    Seul un bloc de chunk_size octets est gardé en mémoire à la fois.
+    Retourne le nombre d'octets écrits.
+    """
+    if hasattr(sink, 'sendall'):
+        write = sink.sendall
+        binary = True
+    elif hasattr(sink, 'write'):
+        write = sink.write
+        binary = 'b' in getattr(sink, 'mode', '') or not hasattr(sink, 'encoding')
+    else:
+        write = sink
+        binary = False
+    
+    written = 0
+    for chunk in iter_config_chunks(lines, chunk_size, encoding):
+        write(chunk if binary else chunk.decode(encoding))
+        written += len(chunk)
+    return written
+
+def chunk_checksum(lines, encoding='utf-8'):
+    """Empreinte SHA-256 d'un lot, telle que transmise (lignes terminées par '\\n')"""
+    digest = hashlib.sha256()
+    for line in lines:
+        digest.update(line.encode(encoding))
+        digest.update(b'\n')
+    return digest.hexdigest()
+
+def chunk_config_units(units, max_lines=COMMIT_CHUNK_LINES, max_bytes=COMMIT_CHUNK_BYTES):
+    """Regroupe des unités (section, clé, lignes) en lots bornés en lignes et en octets
+    
+    L'ordre des unités est conservé et une unité n'est jamais coupée ; une
+    unité plus grande que les bornes forme un lot à elle seule. Chaque lot
+    porte son empreinte, qui l'identifie (en-tête du fichier téléchargé,
+    résultats du push) : elle ne prouve pas ce que le switch a chargé.
+    """
+    chunks = []
+    lines = []
+    sections = []
+    size = 0
+    
+    def close_chunk():
+        chunks.append({
+            'index': len(chunks) + 1,
+            'sections': list(sections),
+            'lines': list(lines),
+            'line_count': len(lines),
+            'bytes': size,
+            'checksum': chunk_checksum(lines)
+        })
+    
+    for section, key, unit in units:
+        unit_size = sum(len(line.encode('utf-8')) + 1 for line in unit)
+        if lines and ((max_lines and len(lines) + len(unit) > max_lines)
+                      or (max_bytes and size + unit_size > max_bytes)):
+            close_chunk()
+            lines, sections, size = [], [], 0
+        
+        lines.extend(unit)
+        size += unit_size
+        if section not in sections:
+            sections.append(section)
+    
+    if lines:
+        close_chunk()
+    return chunks
+
+BUNDLE_FILES = [
+    ('dot1x.txt', 'dot1x'),
+    ('cleanup.txt', 'cleanup'),
+    ('radius.txt', 'radius'),
+]
+
+class _BundleBuffer:
+    """Destination non positionnable de l'archive : les octets sont repris au fil de l'eau"""
+    
+    def __init__(self):
+        self.chunks = []
+    
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+    
+    def flush(self):
+        pass
+    
+    def take(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+def _bundle_steps(archive, sources, only_missing, manifest, chunk_size):
+    """Écrit les dossiers par switch dans l'archive, rend la main après chaque bloc
+    
+    sources est un itérable de (nom, contenu) consommé une configuration à la
+    fois. Le manifeste global est complété au fur et à mesure.
+    """
+    folders = set()
+    
+    for source, content in sources:
+        parser = ConfigurationParser(content)
+        switch_info = parser.get_switch_info()
+        interfaces = parser.get_interfaces()
+        management_ip = switch_info.get('management_ip')
+        
+        # Un dossier par switch (hostname, sinon nom du fichier source)
+        base = re.sub(r'[<>:"/\\|?*\s]', '_', switch_info.get('hostname') or os.path.splitext(source)[0])
+        folder = base
+        suffix = 2
+        while folder in folders:
+            folder = f"{base}_{suffix}"
+            suffix += 1
+        folders.add(folder)
+        
+        generators = {
+            'config': lambda: iter(content.split('\n')),
+            'dot1x': lambda: parser.iter_dot1x_config(interfaces, only_missing),
+            'cleanup': lambda: parser.iter_cleanup_config(interfaces, only_missing),
+            'radius': lambda: parser.iter_radius_config(management_ip, only_missing),
+        }
+        entry = {
+            'folder': folder,
+            'source': source,
+            'hostname': switch_info.get('hostname'),
+            'management_ip': management_ip,
+            'site': switch_info.get('site'),
+            'access_interfaces': len(interfaces),
+            'only_missing': only_missing,
+            'files': {},
+        }
+        
+        for filename, section in [('config.txt', 'config')] + BUNDLE_FILES:
+            digest = hashlib.sha256()
+            size = 0
+            invalid = 0
+            with archive.open(f"{folder}/{filename}", 'w', force_zip64=True) as member:
+                for data, errors in _validated_blocks(generators[section](), section != 'config', chunk_size):
+                    invalid += errors
+                    digest.update(data)
+                    size += len(data)
+                    member.write(data)
+                    yield
+            entry['files'][filename] = {'sha256': digest.hexdigest(), 'bytes': size}
+            if invalid:
+                entry['files'][filename]['invalid_lines'] = invalid
+        
+        archive.writestr(f"{folder}/manifest.json", json.dumps(entry, indent=2, ensure_ascii=False))
+        manifest['switches'].append(entry)
+        yield
+    
+    archive.writestr("manifest.json", json.dumps(manifest, indent=2, ensure_ascii=False))
+
+def _validated_blocks(lines, validate, chunk_size):
+    """Blocs d'octets de lignes (avec le nombre de lignes rejetées par SetSyntaxValidator)"""
+    errors = 0
+    
+    def counted(lines):
+        nonlocal errors
+        for line in lines:
+            if SetSyntaxValidator.validate_line(line):
+                errors += 1
+            yield line
+    
+    for block in iter_config_chunks(counted(lines) if validate else lines, chunk_size):
+        yield block, errors
+        errors = 0
+
+def _new_bundle_manifest():
+    return {'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'generator': "Network Management Suite v2.0", 'switches': []}
+
+def write_config_bundle(sources, sink, only_missing=True, chunk_size=65536):
+    """Écrit l'archive zip des configurations (dossier par switch + manifest.json)
+    
+    sink est un fichier binaire ou tout objet avec write() ; il n'a pas besoin
+    d'être positionnable. Retourne le manifeste global.
+    """
+    manifest = _new_bundle_manifest()
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for _ in _bundle_steps(archive, sources, only_missing, manifest, chunk_size):
+            pass
+    return manifest
+
+def iter_config_bundle(sources, only_missing=True, chunk_size=65536):
+    """Même archive que write_config_bundle, produite en blocs d'octets (réponse HTTP)
+    
+    Seul le bloc en cours de compression est gardé en mémoire.
+    """
+    buffer = _BundleBuffer()
+    archive = zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED)
+    for _ in _bundle_steps(archive, sources, only_missing, _new_bundle_manifest(), chunk_size):
+        if buffer.chunks:
+            yield buffer.take()
+    archive.close()
+    yield buffer.take()
+
+class _FolderArchive:
+    """Même interface d'écriture qu'un ZipFile, vers un dossier (génération sans archive)"""
+    
+    def __init__(self, directory):
+        self.directory = directory
+    
+    def open(self, name, mode='w', force_zip64=False):
+        path = os.path.join(self.directory, *name.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return open(path, 'wb')
+    
+    def writestr(self, name, data):
+        with self.open(name) as f:
+            f.write(data.encode('utf-8') if isinstance(data, str) else data)
+
+def write_config_folder(sources, directory, only_missing=True, chunk_size=65536):
+    """Écrit les mêmes dossiers par switch que write_config_bundle, sans archive"""
+    manifest = _new_bundle_manifest()
+    for _ in _bundle_steps(_FolderArchive(directory), sources, only_missing, manifest, chunk_size):
+        pass
+    return manifest
+
+# === IMPORT MULTI-FICHIERS ===
+
+CONFIG_EXTENSIONS = ('.txt', '.conf', '.cfg')
+
+def collect_config_sources(paths):
+    """Développe fichiers, dossiers et archives zip en sources (chemin, membre zip ou None)"""
+    sources = []
+    
+    def add_file(path):
+        if path.lower().endswith('.zip'):
+            with zipfile.ZipFile(path) as archive:
+                sources.extend((path, member) for member in sorted(archive.namelist())
+                               if member.lower().endswith(CONFIG_EXTENSIONS))
+        elif path.lower().endswith(CONFIG_EXTENSIONS):
+            sources.append((path, None))
+    
+    for path in paths:
+        if os.path.isdir(path):
+            for folder, subfolders, files in os.walk(path):
+                subfolders.sort()
+                for name in sorted(files):
+                    add_file(os.path.join(folder, name))
+        elif path.lower().endswith('.zip'):
+            add_file(path)
+        else:
+            # Fichier choisi explicitement : accepté quelle que soit l'extension
+            sources.append((path, None))
+    return sources
+
+def config_source_name(source):
+    """Nom affiché d'une source (fichier, ou archive:membre)"""
+    path, member = source
+    return f"{os.path.basename(path)}:{member}" if member else os.path.basename(path)
+
+def read_config_source(source):
+    """Contenu d'une source de configuration"""
+    path, member = source
+    if member:
+        with zipfile.ZipFile(path) as archive:
+            return archive.read(member).decode('utf-8', errors='ignore')
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        return f.read()
+
+def iter_config_sources(sources):
+    """(nom, contenu) des sources, lues une par une (entrée de write_config_bundle)"""
+    for source in sources:
+        yield config_source_name(source), read_config_source(source)
+
+def summarize_config_source(source):
+    """Résumé d'une configuration (exécuté dans un processus de ConfigImport)
+    
+    Seul ce résumé revient au processus principal : le contenu et le parser
+    restent dans le processus de travail.
+    """
+    summary = {'source': source, 'name': config_source_name(source),
+               'hostname': None, 'management_ip': None, 'access_ports': 0, 'error': None}
+    try:
+        content = read_config_source(source)
+        # Résumé écrit à la récupération : pas de nouvelle analyse s'il est à jour
+        cached = load_config_summary(source[0], content) if source[1] is None else None
+        if cached is None:
+            cached = summarize_config(content)
+        summary['hostname'] = cached['switch_info'].get('hostname')
+        summary['management_ip'] = cached['switch_info'].get('management_ip')
+        summary['access_ports'] = len(cached['access_interfaces'])
+    except Exception as e:
+        summary['error'] = str(e)
+    return summary
+
+def generate_config_outputs(source, name=None, only_missing=True, index=None):
+    """Analyse et génération ISE complètes d'une source (processus de travail du bridge)
+    
+    Retourne un dictionnaire sérialisable en JSON ; une erreur d'analyse est
+    rapportée dans 'error' au lieu d'être levée.
+    """
+    result = {'index': index, 'file': name or config_source_name(source), 'error': None}
+    start = time.perf_counter()
+    try:
+        parser = ConfigurationParser(read_config_source(source))
+        switch_info = parser.get_switch_info()
+        interfaces = parser.get_interfaces()
+        outputs = {
+            'dot1x': parser.generate_dot1x_config(interfaces, only_missing),
+            'cleanup': parser.generate_cleanup_config(interfaces, only_missing),
+            'radius': parser.get_radius_config(switch_info.get('management_ip'), only_missing),
+        }
+        result.update({
+            'hostname': switch_info.get('hostname'),
+            'management_ip': switch_info.get('management_ip'),
+            'site': switch_info.get('site'),
+            'access_interfaces': [iface['name'] for iface in interfaces],
+            'outputs': outputs,
+            'invalid_lines': len(SetSyntaxValidator.validate(itertools.chain.from_iterable(
+                text.split('\n') for text in outputs.values()))),
+        })
+    except Exception as e:
+        result['error'] = str(e)
+    result['duration'] = round(time.perf_counter() - start, 3)
+    return result
+
+class CombinedConfigReader:
+    """Lecteur mmap des fichiers multi-switch (combined_configs_<timestamp>.txt)
+
+    Un seul passage sur le fichier construit un index des sections
+    (hostname, IP, plage d'octets). Seule la section demandée est décodée,
+    le reste du fichier n'est jamais copié en mémoire.
+    """
+
+    # En-tête écrit par save_configuration / save_individual_configuration
+    # (et par save_config de l'interface), ou séparateur "# === host (ip) ==="
+    # produit par connect_via_rebond
+    SECTION_HEADER = re.compile(
+        rb'^(?:# Configuration r[^\n]* le [^\n]*'
+        rb'|# === (?P<hostname>[^\n]*?) \((?P<ip>[^)\n]*)\) ===)[ \t\r]*$',
+        re.MULTILINE)
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._file = open(file_path, 'rb')
+        self._mmap = None
+        self.sections = []
+
+        try:
+            if os.fstat(self._file.fileno()).st_size:
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                self.sections = self._build_index()
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self.sections)
+
+    def __iter__(self):
+        return iter(self.sections)
+
+    def close(self):
+        """Libère le mapping et le fichier"""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _build_index(self):
+        """Construit l'index des sections en un seul passage"""
+        data = self._mmap
+        sections = []
+
+        for match in self.SECTION_HEADER.finditer(data):
+            if sections:
+                sections[-1]['end'] = match.start()
+
+            if match.group('ip') is not None:
+                # Séparateur "# === hostname (ip) ===" : le corps suit directement
+                hostname = match.group('hostname').decode('utf-8', errors='ignore').strip()
+                ip = match.group('ip').decode('utf-8', errors='ignore').strip()
+                body_start = match.end()
+            else:
+                hostname, ip, body_start = self._read_header_block(match.end())
+
+            # Sauter les lignes vides entre l'en-tête et la configuration
+            while body_start < len(data) and data[body_start:body_start + 1] in (b'\n', b'\r'):
+                body_start += 1
+
+            sections.append({
+                'hostname': hostname if hostname and hostname != 'Non detecte' else None,
+                'ip': ip or None,
+                'start': body_start,
+                'end': len(data)
+            })
+
+        # Fichier sans en-tête : une seule section couvrant tout le fichier
+        if not sections:
+            sections.append({'hostname': None, 'ip': None, 'start': 0, 'end': len(data)})
+
+        return sections
+
+    def _read_header_block(self, position):
+        """Lit les lignes '# Cle: valeur' jusqu'au séparateur '#====='"""
+        data = self._mmap
+        hostname = None
+        ip = None
+
+        while position < len(data):
+            line_start = position
+            line_end = data.find(b'\n', position)
+            if line_end == -1:
+                line_end = len(data)
+            line = data[line_start:line_end].strip()
+            position = line_end + 1
+
+            if line.startswith(b'#='):
+                break
+            if line and not line.startswith(b'#'):
+                # En-tête incomplet : le corps commence sur cette ligne
+                position = line_start
+                break
+
+            key, _, value = line[1:].partition(b':')
+            key = key.strip()
+            if key == b'Switch IP':
+                ip = value.strip().decode('utf-8', errors='ignore')
+            elif key in (b'Hostname', b'Switch Hostname'):
+                hostname = value.strip().decode('utf-8', errors='ignore')
+
+        return hostname, ip, min(position, len(data))
+
+    def find_section(self, key):
+        """Retrouve une section par index, hostname ou adresse IP"""
+        if isinstance(key, int):
+            return self.sections[key]
+
+        for section in self.sections:
+            if key in (section['hostname'], section['ip']):
+                return section
+
+        raise KeyError(f"Section introuvable: {key}")
+
+    def read_section(self, key):
+        """Décode uniquement la configuration de la section demandée"""
+        if self._mmap is None:
+            return ""
+        section = self.find_section(key)
+        return self._mmap[section['start']:section['end']].decode('utf-8', errors='ignore').rstrip()
+
+    def get_parser(self, key):
+        """Retourne un ConfigurationParser pour la section demandée"""
+        return ConfigurationParser(self.read_section(key))
+
+class ChannelReader:
+    """Lecture tamponnée d'un canal paramiko
+    
+    Les octets reçus s'accumulent dans un bytearray, seul tampon de la
+    réponse : read décode les nouvelles données de façon incrémentale (une
+    séquence UTF-8 coupée entre deux recv n'est pas perdue) sans les conserver,
+    et getvalue décode le tampon complet à la demande. La taille de recv
+    s'adapte au débit observé.
+    """
+    
+    MIN_RECV = 4096
+    MAX_RECV = 1 << 20
+    
+    def __init__(self, channel, encoding='utf-8', on_progress=None):
+        self.channel = channel
+        self.encoding = encoding
+        self.on_progress = on_progress
+        self.recv_size = self.MIN_RECV
+        self.bytes_received = 0
+        self.recv_calls = 0
+        self.reset()
+    
+    def reset(self):
+        """Démarre une nouvelle réponse (les compteurs globaux sont conservés)"""
+        self.raw = bytearray()
+        self._decoder = codecs.getincrementaldecoder(self.encoding)(errors='replace')
+        self._text = ''
+    
+    def read(self, timeout):
+        """Reçoit un bloc, retourne le texte décodé ('' si rien dans le délai, None si fermé)"""
+        self.channel.settimeout(timeout)
+        try:
+            data = self.channel.recv(self.recv_size)
+        except socket.timeout:
+            return ''
+        if not data:
+            return None
+        
+        size = len(data)
+        self.recv_calls += 1
+        self.bytes_received += size
+        self.raw += data
+        self._text = None
+        
+        # Tampon plein : le débit suit, on double ; sinon on redescend progressivement
+        if size >= self.recv_size:
+            self.recv_size = min(self.recv_size * 2, self.MAX_RECV)
+        elif size < self.recv_size // 4:
+            self.recv_size = max(self.recv_size // 2, self.MIN_RECV)
+        
+        text = self._decoder.decode(data)
+        if self.on_progress:
+            self.on_progress(self.bytes_received)
+        return text
+    
+    def getvalue(self):
+        """Texte complet de la réponse courante (décodé une fois par nouvel arrivage)"""
+        if self._text is None:
+            self._text = self.raw.decode(self.encoding, errors='replace')
+        return self._text
+
+class ChannelExpect:
+    """Moteur 'expect' sur un canal paramiko interactif
+    
+    Chaque étape attend un ensemble de motifs (prompt, demande de mot de
+    passe, erreurs) et rend la main dès que l'un d'eux apparaît, avec un
+    délai maximum par étape au lieu de pauses fixes.
+    """
+    
+    # Les prompts sont ancrés en fin de tampon (\Z) et testés sur la dernière
+    # ligne seulement : une bannière terminée par '#####\n' n'est pas un prompt
+    # Prompt Junos 'user@host> ' (ou '#' en mode configuration)
+    JUNOS_PROMPT = re.compile(r'^[^\s@]+@[\w.-]+[>#] ?\Z')
+    # Shell Unix du switch (root) avant 'cli'
+    ROOT_SHELL = re.compile(r'^[^\n]*% ?\Z')
+    # Prompt du serveur Robont (retour au serveur = échec ssh)
+    SHELL_PROMPT = re.compile(r'[$#%>] ?\Z')
+    PASSWORD = re.compile(r'(?i)password: ?\Z')
+    HOST_KEY = re.compile(r'\(yes/no(?:/\[fingerprint\])?\)\? ?\Z')
+    CONNECTION_ERROR = re.compile(
+        r'(?i)connection refused|connection timed out|no route to host|host unreachable'
+        r'|network is unreachable|connection closed|could not resolve hostname|name or service not known')
+    LOGIN_ERROR = re.compile(r'(?i)invalid user|user unknown|no such user|login incorrect')
+    AUTH_ERROR = re.compile(
+        r'(?i)permission denied|access denied|authentication failure|authentication failed'
+        r'|login failed|invalid password|incorrect password')
+    COMMAND_ERROR = re.compile(r'(?m)^\s*(?:error:|unknown command|syntax error)')
+    
+    # Délai maximum par étape (secondes)
+    STEP_TIMEOUTS = {'server': 15, 'switch': 30, 'auth': 20, 'cli': 10, 'config': 120, 'exit': 3}
+    
+    # Marge relue avant les nouvelles données (motif à cheval sur deux réceptions)
+    OVERLAP = 256
+    
+    def __init__(self, channel, timeout=30, on_progress=None):
+        self.channel = channel
+        self.timeout = timeout
+        self.reader = ChannelReader(channel, on_progress=on_progress)
+    
+    def send_line(self, text):
+        """Envoie une ligne sur le canal"""
+        self.channel.send(text + "\n")
+    
+    def expect(self, patterns, timeout=None):
+        """Lit jusqu'au premier motif reconnu
+        
+        patterns est une liste ordonnée de (nom, regex). Retourne (nom, sortie),
+        nom valant 'closed' si le canal est fermé et None si le délai expire.
+        """
+        deadline = time.monotonic() + (timeout or self.timeout)
+        reader = self.reader
+        reader.reset()
+        tail = ""
+        
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None, reader.getvalue()
+            
+            # recv bloquant borné : réveil immédiat à l'arrivée des données
+            text = reader.read(min(remaining, 1.0))
+            if text is None:
+                return 'closed', reader.getvalue()
+            if not text:
+                continue
+            
+            # Seules les nouvelles données (plus une marge) sont examinées
+            window = (tail + text).replace('\r', '')
+            tail = window[-self.OVERLAP:]
+            # Prompts (ancrés par \Z) sur la dernière ligne, erreurs sur toute la fenêtre
+            last_line = window[window.rfind('\n') + 1:]
+            for name, pattern in patterns:
+                target = last_line if pattern.pattern.endswith(r'\Z') else window
+                if pattern.search(target):
+                    return name, reader.getvalue()
+    
+    def wait_prompt(self, timeout=None):
+        """Attend le prompt du serveur après l'ouverture du shell"""
+        return self.expect([('prompt', self.SHELL_PROMPT)], timeout or self.STEP_TIMEOUTS['server'])
+    
+    def login_switch(self, switch_ip, username, password):
+        """Ouvre la session ssh vers le switch depuis le serveur et entre en CLI Junos
+        
+        Retourne (statut, sortie) avec statut parmi 'ok', 'connection',
+        'login', 'password_required' et 'password'.
+        """
+        self.send_line("ssh " + username + "@" + switch_ip)
+        steps = [('connection', self.CONNECTION_ERROR), ('login', self.LOGIN_ERROR),
+                 ('hostkey', self.HOST_KEY), ('password', self.PASSWORD),
+                 ('junos', self.JUNOS_PROMPT), ('shell', self.ROOT_SHELL), ('server', self.SHELL_PROMPT)]
+        name, output = self.expect(steps, self.STEP_TIMEOUTS['switch'])
+        
+        if name == 'hostkey':
+            self.send_line("yes")
+            name, more = self.expect(steps, self.STEP_TIMEOUTS['switch'])
+            output += more
+        
+        if name == 'login':
+            return 'login', output
+        
+        if name == 'password':
+            if not password.strip():
+                return 'password_required', output
+            
+            self.send_line(password)
+            name, more = self.expect([('password', self.AUTH_ERROR), ('password', self.PASSWORD),
+                                      ('junos', self.JUNOS_PROMPT), ('shell', self.ROOT_SHELL)],
+                                     self.STEP_TIMEOUTS['auth'])
+            output += more
+            if name == 'password':
+                return 'password', output
+        
+        if name == 'shell':
+            # Compte root : shell Unix, passage en CLI Junos
+            self.send_line("cli")
+            name, more = self.expect([('junos', self.JUNOS_PROMPT)], self.STEP_TIMEOUTS['cli'])
+            output += more
+        
+        if name != 'junos':
+            return 'connection', output
+        return 'ok', output
+    
+    def run_command(self, command, timeout=None):
+        """Exécute une commande Junos, retourne (sortie, True si le prompt revient sans erreur)"""
+        self.send_line(command)
+        name, output = self.expect([('error', self.COMMAND_ERROR), ('junos', self.JUNOS_PROMPT)],
+                                   timeout or self.STEP_TIMEOUTS['config'])
+        return output, name == 'junos'
+    
+    def close(self, hops=2):
+        """Quitte proprement les sessions (switch puis serveur) et ferme le canal"""
+        try:
+            for _ in range(hops):
+                if self.channel.closed:
+                    break
+                self.send_line("exit")
+                self.expect([('prompt', self.SHELL_PROMPT)], self.STEP_TIMEOUTS['exit'])
+        finally:
+            self.channel.close()
+
+class RobontSession:
+    """Session interactive authentifiée sur le serveur Robont
+    
+    Le shell du serveur reste ouvert entre deux récupérations : seul le
+    saut ssh vers le switch est rétabli à chaque fois.
+    """
+    
+    HOST = "6.91.128.111"
+    CONFIG_COMMAND = "show configuration | display set | no-more"
+    HOSTNAME = re.compile(r'set system host-name\s+"?([^\s";]+)')
+    KEEPALIVE = 30  # secondes entre deux keepalive SSH
+    
+    def __init__(self, username, password, host=HOST):
+        self.username = username
+        self.password = password
+        self.host = host
+        self.client = None
+        self.channel = None
+        self.expect = None
+        self.server_prompt = ChannelExpect.SHELL_PROMPT
+        # Un seul échange à la fois sur le shell du serveur
+        self.lock = threading.RLock()
+    
+    @property
+    def connected(self):
+        """Vrai si le transport SSH et le shell du serveur sont actifs"""
+        if self.client is None or self.channel is None or self.channel.closed:
+            return False
+        transport = self.client.get_transport()
+        return transport is not None and transport.is_active()
+    
+    def connect(self):
+        """Ouvre la session (paramiko.AuthenticationException si refusée)"""
+        self.close()
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        client.connect(hostname=self.host, port=22, username=self.username,
+                       password=self.password, timeout=30)
+        # Le keepalive évite la coupure de la session inactive entre deux récupérations
+        client.get_transport().set_keepalive(self.KEEPALIVE)
+        
+        self.client = client
+        self.channel = client.invoke_shell()
+        self.expect = ChannelExpect(self.channel)
+        
+        # Le prompt exact du serveur distingue le retour au Robont du shell du switch
+        name, output = self.expect.wait_prompt()
+        lines = output.replace('\r', '').rstrip().split('\n')
+        if name == 'prompt' and lines[-1].strip():
+            self.server_prompt = re.compile(re.escape(lines[-1].strip()) + r' ?\Z')
+    
+    def matches(self, username, password):
+        """Vrai si la session a été ouverte avec ces identifiants"""
+        return self.username == username and self.password == password
+    
+    def ensure_connected(self):
+        """Reconnecte si la session a été perdue, retourne True si une connexion a été ouverte"""
+        with self.lock:
+            if self.connected:
+                return False
+            self.connect()
+            return True
+    
+    def fetch_configuration(self, switch_ip, switch_user, switch_pass, on_progress=None):
+        """Récupère la configuration d'un switch, retourne (statut, sortie)
+        
+        statut vaut 'ok', 'config' (sortie incomplète) ou un statut d'échec de
+        ChannelExpect.login_switch. Une session coupée côté serveur est rouverte
+        une fois avant d'abandonner.
+        """
+        with self.lock:
+            for attempt in range(2):
+                reconnected = self.ensure_connected()
                 try:
-                    ip_index = parts.index('address') + 1
-                    if ip_index < len(parts):
-                        ip = parts[ip_index].split('/')[0]
-                        # Prefer management/admin VLAN IPs
-                        if ip.startswith('10.148.') or '192.168.' in ip or not info['management_ip']:
-                            info['management_ip'] = ip
-                except (ValueError, IndexError):
-                    pass
-            
-            # Also look for VLAN interfaces that might be management
-            if 'set interfaces vlan' in trimmed and 'family inet address' in trimmed:
-                parts = trimmed.split(' ')
+                    self.drain()
+                    status, output = self.expect.login_switch(switch_ip, switch_user, switch_pass)
+                except (OSError, EOFError, paramiko.SSHException):
+                    status, output = 'connection', ''
+                # Échec dû à la session elle-même (shell fermé par le serveur) : on rouvre
+                if status == 'connection' and not self.connected and not reconnected and attempt == 0:
+                    self.close()
+                    continue
+                break
+            
+            if status != 'ok':
+                self.return_to_server(logged_in=False)
+                return status, output
+            
+            reader = self.expect.reader
+            if on_progress:
+                start = reader.bytes_received
+                reader.on_progress = lambda received: on_progress(received - start)
+            try:
+                output, completed = self.expect.run_command(self.CONFIG_COMMAND)
+            finally:
+                reader.on_progress = None
+            
+            self.return_to_server()
+            if not completed or not output.strip():
+                return 'config', output
+            return 'ok', output
+    
+    def drain(self):
+        """Écarte la sortie en attente du shell (bannières, prompt résiduel)"""
+        while self.channel.recv_ready():
+            self.channel.recv(65536)
+    
+    def return_to_server(self, logged_in=True):
+        """Quitte le switch et revient au prompt du serveur (sinon la session est fermée)"""
+        steps = [('server', self.server_prompt), ('junos', ChannelExpect.JUNOS_PROMPT),
+                 ('shell', ChannelExpect.ROOT_SHELL)]
+        try:
+            if logged_in:
+                self.expect.send_line("exit")
+            else:
+                # Abandonne le ssh en cours (demande de mot de passe, délai)
+                self.channel.send("\x03")
+            
+            for _ in range(3):
+                name, _ = self.expect.expect(steps, ChannelExpect.STEP_TIMEOUTS['exit'])
+                if name == 'server':
+                    return True
+                if name not in ('junos', 'shell'):
+                    break
+                self.expect.send_line("exit")
+        except Exception:
+            pass
+        
+        # État inconnu : reconnexion au prochain usage
+        self.close()
+        return False
+    
+    @classmethod
+    def extract_hostname(cls, output):
+        """Hostname déclaré dans la configuration récupérée"""
+        match = cls.HOSTNAME.search(output)
+        return match.group(1) if match else None
+    
+    @classmethod
+    def clean_output(cls, output):
+        """Retire l'écho de la commande et le prompt final de la sortie"""
+        lines = output.replace('\r', '').split('\n')
+        for index, line in enumerate(lines):
+            if cls.CONFIG_COMMAND in line:
+                lines = lines[index + 1:]
+                break
+        while lines and (not lines[-1].strip() or ChannelExpect.JUNOS_PROMPT.search(lines[-1])
+                         or lines[-1].startswith('{')):
+            lines.pop()
+        return '\n'.join(lines)
+    
+    def close(self):
+        """Ferme la session"""
+        try:
+            if self.channel is not None and not self.channel.closed:
+                self.channel.send("exit\n")
+                self.channel.close()
+            if self.client is not None:
+                self.client.close()
+        except Exception:
+            pass
+        self.client = self.channel = self.expect = None
+
+def write_switch_config(path, switch_ip, hostname, config):
+    """Écrit une configuration récupérée avec l'en-tête habituel et son résumé JSON"""
+    header = ("# Configuration récupérée le " + str(datetime.now()) + "\n"
+              "# Serveur Robont: " + RobontSession.HOST + "\n"
+              "# Switch IP: " + switch_ip + "\n")
+    if hostname:
+        header += "# Switch Hostname: " + hostname + "\n"
+    header += "#" + "="*50 + "\n\n"
+    
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(header)
+        f.write(config)
+    write_config_summary(path, header + config)
+
+# === RÉSUMÉ JSON (fichier compagnon écrit à la récupération) ===
+
+SUMMARY_VERSION = 2
+
+def config_digest(content):
+    """Empreinte SHA-256 d'une configuration (fins de ligne normalisées)"""
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return hashlib.sha256(content.encode('utf-8', errors='ignore')).hexdigest()
+
+def summary_path(config_path):
+    """Chemin du résumé associé à un fichier de configuration (SW-01.txt -> SW-01.summary.json)"""
+    return os.path.splitext(config_path)[0] + '.summary.json'
+
+def summarize_config(content, parser=None):
+    """Résumé d'une configuration : informations du switch et interfaces access
+    
+    Le site et l'IP de management dépendent des profils de site : leur
+    empreinte (profiles) est enregistrée avec celle de la configuration.
+    """
+    parser = parser or ConfigurationParser(content)
+    return {
+        'version': SUMMARY_VERSION,
+        'sha256': config_digest(content),
+        'profiles': ConfigTemplates.fingerprint(parser.templates.profiles),
+        'switch_info': parser.get_switch_info(),
+        'access_interfaces': [iface['name'] for iface in parser.get_interfaces()],
+    }
+
+def write_config_summary(config_path, content, parser=None):
+    """Écrit le résumé JSON à côté du fichier de configuration, le retourne"""
+    summary = summarize_config(content, parser)
+    with open(summary_path(config_path), 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    return summary
+
+def load_config_summary(config_path, content=None):
+    """Résumé JSON d'un fichier de configuration, ou None s'il est absent ou périmé
+    
+    Le résumé n'est utilisé que si son empreinte correspond au contenu
+    (content si déjà lu, sinon le fichier est relu pour la vérification) et
+    si les profils de site n'ont pas changé depuis son écriture.
+    """
+    try:
+        with open(summary_path(config_path), 'r', encoding='utf-8') as f:
+            summary = json.load(f)
+        if (summary.get('version') != SUMMARY_VERSION
+                or summary.get('profiles') != site_profiles_fingerprint()):
+            return None
+        if content is None:
+            with open(config_path, 'r', encoding='utf-8', errors='ignore') as f:
+                content = f.read()
+    except (OSError, ValueError):
+        return None
+    return summary if summary.get('sha256') == config_digest(content) else None
+
+def extract_ip_addresses(content):
+    """Extrait les IP valides, sans doublon, dans l'ordre du texte"""
+    ips = []
+    for candidate in re.findall(r'\b\d{1,3}(?:\.\d{1,3}){3}\b', content):
+        try:
+            ipaddress.ip_address(candidate)
+        except ValueError:
+            continue
+        if candidate not in ips:
+            ips.append(candidate)
+    return ips
+
+class BatchFetcher:
+    """Récupération multi-switch par un pool de sessions Robont
+    
+    Chaque worker garde sa propre session et traite les IP de la file ;
+    les configurations sont écrites dès leur récupération et chaque
+    changement d'état est signalé par on_update(ip, champs).
+    """
+    
+    STATUS_MESSAGES = {
+        'connection': "Switch injoignable",
+        'login': "Login switch refusé",
+        'password_required': "Mot de passe switch requis",
+        'password': "Mot de passe switch refusé",
+        'config': "Configuration incomplète",
+    }
+    
+    def __init__(self, server_user, server_pass, switch_user, switch_pass, output_dir,
+                 workers=4, on_update=None, on_done=None, session_factory=RobontSession):
+        self.server_user = server_user
+        self.server_pass = server_pass
+        self.switch_user = switch_user
+        self.switch_pass = switch_pass
+        self.output_dir = output_dir
+        self.workers = workers
+        self.on_update = on_update or (lambda ip, fields: None)
+        self.on_done = on_done or (lambda: None)
+        self.session_factory = session_factory
+        self._queue = queue.SimpleQueue()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._active = 0
+        self._filenames = set()
+    
+    def start(self, switch_ips):
+        """Lance le pool sur la liste d'IP"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        for ip in switch_ips:
+            self._queue.put(ip)
+        
+        self._active = min(self.workers, len(switch_ips))
+        for _ in range(self._active):
+            threading.Thread(target=self._worker, daemon=True).start()
+        if not self._active:
+            self.on_done()
+    
+    def stop(self):
+        """Arrête le pool (les récupérations en cours se terminent)"""
+        self._stop.set()
+    
+    def _worker(self):
+        """Boucle d'un worker : une session Robont, des IP jusqu'à épuisement"""
+        session = self.session_factory(self.server_user, self.server_pass)
+        try:
+            while not self._stop.is_set():
                 try:
-                    ip_index = parts.index('address') + 1
-                    if ip_index < len(parts):
-                        ip = parts[ip_index].split('/')[0]
-                        if ip.startswith('10.148.') or '192.168.' in ip:
-                            info['management_ip'] = ip
-                except (ValueError, IndexError):
-                    pass
+                    ip = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                self._fetch_one(session, ip)
+            
+            # Arrêt demandé : les IP restantes sont marquées
+            while True:
+                try:
+                    ip = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                self.on_update(ip, {'status': "Annulé"})
+        finally:
+            session.close()
+            with self._lock:
+                self._active -= 1
+                finished = self._active == 0
+            if finished:
+                self.on_done()
+    
+    def _fetch_one(self, session, ip):
+        """Récupère et écrit la configuration d'un switch"""
+        started = time.monotonic()
+        self.on_update(ip, {'status': "En cours..."})
         
-        return info
+        try:
+            status, output = session.fetch_configuration(ip, self.switch_user, self.switch_pass)
+        except paramiko.AuthenticationException:
+            # Identifiants Robont refusés : inutile de poursuivre
+            self._stop.set()
+            self.on_update(ip, {'status': "Échec authentification Robont", 'error': True})
+            return
+        except Exception as e:
+            session.close()
+            self.on_update(ip, {'status': f"Erreur: {e}", 'error': True,
+                                'duration': time.monotonic() - started})
+            return
+        
+        duration = time.monotonic() - started
+        if status != 'ok':
+            self.on_update(ip, {'status': self.STATUS_MESSAGES.get(status, status), 'error': True,
+                                'duration': duration})
+            return
+        
+        config = RobontSession.clean_output(output)
+        hostname = RobontSession.extract_hostname(config)
+        path = self._write_config(ip, hostname, config)
+        self.on_update(ip, {'status': "OK", 'hostname': hostname or '', 'file': path,
+                            'duration': duration, 'size': len(config)})
     
-    def get_interfaces(self):
-        """Extrait les interfaces access"""
-        lines = self.config.split('\n')
-        interfaces = {}
+    def _write_config(self, ip, hostname, config):
+        """Écrit la configuration avec l'en-tête habituel, retourne le chemin"""
+        with self._lock:
+            base = re.sub(r'[<>:"/\\|?*]', '_', hostname) if hostname else f"switch_{ip.replace('.', '_')}"
+            filename = f"{base}.txt"
+            if filename in self._filenames:
+                filename = f"{base}_{ip.replace('.', '_')}.txt"
+            self._filenames.add(filename)
+        
+        path = os.path.join(self.output_dir, filename)
+        write_switch_config(path, ip, hostname, config)
+        return path
+
+class AnalysisCancelled(Exception):
+    """Analyse interrompue par ConfigAnalysis.cancel()"""
+
+class ConfigAnalysis:
+    """Lecture, analyse et génération ISE d'une configuration sur un thread de travail
+    
+    Un point d'annulation sépare chaque étape (et chaque bloc de lignes
+    générées). on_progress(étape, total, libellé), on_done(résultat) et
+    on_error(exception) sont appelés depuis le thread de travail et jamais
+    après une annulation.
+    """
+    
+    STEPS = [
+        "Lecture du fichier",
+        "Analyse de la configuration",
+        "Détection des interfaces access",
+        "Génération 802.1X",
+        "Génération cleanup",
+        "Génération RADIUS",
+    ]
+    CHECK_EVERY = 2000  # lignes générées entre deux points d'annulation
+    
+    def __init__(self, path=None, content=None, filename=None, previous=None, previous_info=None,
+                 on_progress=None, on_done=None, on_error=None):
+        self.path = path
+        self.content = content
+        self.filename = filename or (os.path.basename(path) if path else "configuration")
+        self.previous = previous
+        self.previous_info = previous_info or {}
+        self.on_progress = on_progress or (lambda step, total, label: None)
+        self.on_done = on_done or (lambda result: None)
+        self.on_error = on_error or (lambda error: None)
+        self._cancel = threading.Event()
+    
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+    
+    def start(self):
+        """Lance l'analyse en arrière-plan"""
+        threading.Thread(target=self._run, daemon=True).start()
+    
+    def cancel(self):
+        """Demande l'arrêt au prochain point d'annulation"""
+        self._cancel.set()
+    
+    def _run(self):
+        try:
+            result = self._analyse()
+        except AnalysisCancelled:
+            return
+        except Exception as e:
+            if not self.cancelled:
+                self.on_error(e)
+            return
+        if not self.cancelled:
+            self.on_done(result)
+    
+    def _step(self, index):
+        """Point d'annulation et progression"""
+        if self.cancelled:
+            raise AnalysisCancelled()
+        self.on_progress(index, len(self.STEPS), self.STEPS[index])
+    
+    def _join(self, lines):
+        """Assemble des lignes générées en vérifiant l'annulation au fil de l'eau"""
+        collected = []
+        for count, line in enumerate(lines, 1):
+            collected.append(line)
+            if count % self.CHECK_EVERY == 0 and self.cancelled:
+                raise AnalysisCancelled()
+        return '\n'.join(collected)
+    
+    def _analyse(self):
+        self._step(0)
+        content = self.content
+        if content is None:
+            with open(self.path, 'r', encoding='utf-8', errors='ignore') as f:
+                content = f.read()
+        
+        self._step(1)
+        # Même switch rechargé : seules les interfaces modifiées sont retraitées,
+        # sur une copie (le parser affiché n'est remplacé que par apply_analysis)
+        changeset = None
+        hostname = RobontSession.extract_hostname(content)
+        if self.previous is not None and hostname and hostname == self.previous_info.get('hostname'):
+            parser = self.previous.copy()
+            changeset = parser.update_configuration(content)
+        else:
+            parser = ConfigurationParser(content)
+        switch_info = parser.get_switch_info()
+        
+        self._step(2)
+        interfaces = parser.get_interfaces()
+        
+        self._step(3)
+        dot1x_config = self._join(parser.iter_dot1x_config(interfaces))
+        self._step(4)
+        cleanup_config = self._join(parser.iter_cleanup_config(interfaces))
+        self._step(5)
+        radius_config = self._join(parser.iter_radius_config(switch_info.get('management_ip')))
+        
+        return {
+            'filename': self.filename,
+            'content': content,
+            'parser': parser,
+            'switch_info': switch_info,
+            'changeset': changeset,
+            'interfaces': interfaces,
+            'dot1x_config': dot1x_config,
+            'cleanup_config': cleanup_config,
+            'radius_config': radius_config,
+        }
+
+class ConfigImport:
+    """Analyse de plusieurs configurations dans un pool de processus
+    
+    Les sources (voir collect_config_sources) sont réparties par paquets
+    entre les processus ; les résumés reviennent dans l'ordre des sources.
+    on_progress(terminés, total), on_done(résumés) et on_error(exception)
+    sont appelés depuis le thread de travail et jamais après une annulation.
+    """
+    
+    INLINE_BELOW = 4  # en dessous, le démarrage du pool coûte plus que l'analyse
+    
+    def __init__(self, sources, workers=None, on_progress=None, on_done=None, on_error=None):
+        self.sources = list(sources)
+        self.workers = workers or os.cpu_count() or 2
+        self.on_progress = on_progress or (lambda done, total: None)
+        self.on_done = on_done or (lambda summaries: None)
+        self.on_error = on_error or (lambda error: None)
+        self.elapsed = 0.0
+        self._cancel = threading.Event()
+    
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+    
+    def start(self):
+        """Lance l'import en arrière-plan"""
+        threading.Thread(target=self._run, daemon=True).start()
+    
+    def cancel(self):
+        """Abandonne les sources non encore traitées"""
+        self._cancel.set()
+    
+    def run(self):
+        """Analyse toutes les sources et retourne les résumés (thread appelant)"""
+        start = time.perf_counter()
+        total = len(self.sources)
+        summaries = []
+        
+        if total < self.INLINE_BELOW or self.workers < 2:
+            results = map(summarize_config_source, self.sources)
+            pool = None
+        else:
+            pool = ProcessPoolExecutor(max_workers=min(self.workers, total))
+            chunksize = max(1, total // (self.workers * 4))
+            results = pool.map(summarize_config_source, self.sources, chunksize=chunksize)
         
-        for line in lines:
-            trimmed = line.strip()
+        try:
+            for summary in results:
+                if self.cancelled:
+                    raise AnalysisCancelled()
+                summaries.append(summary)
+                self.on_progress(len(summaries), total)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=not self.cancelled, cancel_futures=True)
+        
+        self.elapsed = time.perf_counter() - start
+        return summaries
+    
+    def _run(self):
+        try:
+            summaries = self.run()
+        except AnalysisCancelled:
+            return
+        except Exception as e:
+            if not self.cancelled:
+                self.on_error(e)
+            return
+        if not self.cancelled:
+            self.on_done(summaries)
+
+class ConfigSearchIndex:
+    """Index de recherche d'une configuration chargée
+    
+    Construit une seule fois au chargement : décalage de début de chaque
+    ligne, index inversé jeton -> lignes et classement des lignes par
+    hiérarchie ('interfaces', 'protocols dot1x', 'vlans', ...). Une recherche
+    ne parcourt que le vocabulaire des jetons, jamais le texte.
+    """
+    
+    WILDCARDS = ('*', '?', '[')
+    
+    def __init__(self, text):
+        self.text = text
+        self.offsets = array.array('L')
+        self.tokens = {}
+        self.categories = {}
+        
+        tokens = self.tokens
+        categories = self.categories
+        position = 0
+        for number, line in enumerate(text.split('\n')):
+            self.offsets.append(position)
+            position += len(line) + 1
             
-            # Detect interface configuration lines
-            if trimmed.startswith('set interfaces') and 'ge-' in trimmed:
-                parts = trimmed.split(' ')
-                if len(parts) >= 3:
-                    interface_name = parts[2]
-                    
-                    if interface_name not in interfaces:
-                        interfaces[interface_name] = {
-                            'name': interface_name,
-                            'config': [],
-                            'is_access': False
-                        }
-                    
-                    interfaces[interface_name]['config'].append(trimmed)
-                    
-                    # Check if it's an access port
-                    if ('family ethernet-switching port-mode access' in trimmed or 
-                        ('ethernet-switching-options' in trimmed and 'port-mode access' in trimmed)):
-                        interfaces[interface_name]['is_access'] = True
+            parts = line.split()
+            if not parts:
+                continue
+            for token in parts:
+                key = token.strip('";').lower()
+                postings = tokens.get(key)
+                if postings is None:
+                    postings = tokens[key] = array.array('L')
+                # Un jeton répété sur la même ligne n'est indexé qu'une fois
+                if not postings or postings[-1] != number:
+                    postings.append(number)
+            
+            if len(parts) > 2 and parts[0] in ('set', 'delete'):
+                category = parts[1] if parts[1] != 'protocols' else 'protocols ' + parts[2]
+                lines = categories.get(category)
+                if lines is None:
+                    lines = categories[category] = array.array('L')
+                lines.append(number)
+        self.offsets.append(position)
+    
+    @property
+    def line_count(self):
+        return len(self.offsets) - 1
+    
+    def line(self, number):
+        """Texte d'une ligne (numérotée à partir de 0)"""
+        return self.text[self.offsets[number]:self.offsets[number + 1] - 1]
+    
+    def lines(self, numbers):
+        """Texte des lignes demandées, dans l'ordre donné"""
+        return '\n'.join(self.line(number) for number in numbers)
+    
+    def _term_lines(self, term):
+        """Lignes contenant un terme : jeton exact, motif (ge-0/0/1*) ou sous-chaîne"""
+        term = term.strip('";').lower()
+        if any(wildcard in term for wildcard in self.WILDCARDS):
+            keys = fnmatch.filter(self.tokens, term)
+        elif term in self.tokens:
+            return set(self.tokens[term])
+        else:
+            keys = [key for key in self.tokens if term in key]
         
-        # Return only access interfaces starting with 'ge-'
-        return [iface for iface in interfaces.values() 
-                if iface['name'].startswith('ge-') and iface['is_access']]
+        lines = set()
+        for key in keys:
+            lines.update(self.tokens[key])
+        return lines
     
-    def generate_dot1x_config(self, interfaces):
-        """Genere la configuration 802.1x"""
-        configs = []
+    def search(self, query, category=None):
+        """Numéros des lignes contenant tous les termes de la requête (triés)
+        
+        category restreint aux lignes d'une hiérarchie de self.categories.
+        Retourne None si ni requête ni catégorie ne sont données.
+        """
+        result = set(self.categories.get(category, ())) if category else None
+        for term in query.split():
+            lines = self._term_lines(term)
+            result = lines if result is None else result & lines
+            if not result:
+                break
+        return None if result is None else sorted(result)
+
+class UIEventQueue:
+    """File d'événements thread-safe vers la boucle Tk
+    
+    Les threads de travail déposent des appels ; la boucle principale les
+    exécute sur minuterie. Les mises à jour déposées sous une même clé
+    (statut, progression) sont fusionnées : seule la dernière est appliquée,
+    en un seul rafraîchissement par cycle.
+    """
+    
+    POLL_MS = 50
+    # Temps maximum passé à vider la file par cycle (ms), pour rester fluide
+    BUDGET_MS = 30
+    
+    def __init__(self, root, poll_ms=POLL_MS):
+        self.root = root
+        self.poll_ms = poll_ms
+        self._events = queue.SimpleQueue()
+        self._latest = {}
+        self._lock = threading.Lock()
+        self._job = None
+    
+    def start(self):
+        """Démarre le vidage périodique (à appeler depuis le thread Tk)"""
+        if self._job is None:
+            self._job = self.root.after(self.poll_ms, self._drain)
+    
+    def stop(self):
+        """Arrête le vidage périodique"""
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+    
+    def post(self, callback, *args):
+        """Dépose un appel à exécuter dans l'ordre sur le thread Tk"""
+        self._events.put((callback, args))
+    
+    def post_latest(self, key, callback, *args):
+        """Dépose un appel fusionnable : un appel plus récent de même clé le remplace"""
+        with self._lock:
+            self._latest[key] = (callback, args)
+    
+    def _drain(self):
+        """Applique les dernières mises à jour fusionnées puis les événements en attente"""
+        deadline = time.monotonic() + self.BUDGET_MS / 1000
+        try:
+            # Statut d'abord : visible avant une éventuelle boîte de dialogue modale
+            with self._lock:
+                latest, self._latest = self._latest, {}
+            for callback, args in latest.values():
+                callback(*args)
+            
+            while time.monotonic() < deadline:
+                try:
+                    callback, args = self._events.get_nowait()
+                except queue.Empty:
+                    break
+                callback(*args)
+        finally:
+            self._job = self.root.after(self.poll_ms, self._drain)
+
+class LazyTextInserter:
+    """Affichage progressif d'un grand texte dans un widget Text
+    
+    Le premier bloc est inséré immédiatement, les suivants par after() :
+    la boucle Tk reste disponible (défilement, clics) pendant le chargement.
+    """
+    
+    CHUNK_LINES = 2000
+    
+    def __init__(self, widget, chunk_lines=CHUNK_LINES):
+        self.widget = widget
+        self.chunk_lines = chunk_lines
+        self._text = ""
+        self._position = 0
+        self._job = None
+        self._on_done = None
+    
+    @property
+    def loading(self):
+        return self._job is not None
+    
+    def load(self, text, on_done=None):
+        """Remplace le contenu du widget (annule un chargement en cours)"""
+        self.cancel()
+        self._text = text
+        self._position = 0
+        self._on_done = on_done
+        
+        with self._editable():
+            self.widget.delete('1.0', tk.END)
+        self._insert_next()
+    
+    def cancel(self):
+        """Interrompt le chargement en cours"""
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+    
+    def get(self):
+        """Texte complet, même si l'insertion n'est pas terminée"""
+        if self.loading:
+            return self._text
+        return self.widget.get('1.0', 'end-1c')
+    
+    def _insert_next(self):
+        """Insère le bloc suivant de chunk_lines lignes"""
+        self._job = None
+        text = self._text
+        end = self._position
+        for _ in range(self.chunk_lines):
+            end = text.find('\n', end) + 1
+            if not end:
+                end = len(text)
+                break
+        
+        with self._editable():
+            self.widget.insert(tk.END, text[self._position:end])
+        self._position = end
+        
+        if self._position < len(text):
+            self._job = self.widget.after(1, self._insert_next)
+        else:
+            self._text = ""
+            if self._on_done:
+                self._on_done()
+    
+    @contextlib.contextmanager
+    def _editable(self):
+        """Rend le widget modifiable le temps d'une insertion"""
+        disabled = str(self.widget.cget('state')) == 'disabled'
+        if disabled:
+            self.widget.config(state='normal')
+        try:
+            yield
+        finally:
+            if disabled:
+                self.widget.config(state='disabled')
+
+class SearchBar:
+    """Recherche et filtre d'un widget Text adossés à un ConfigSearchIndex
+    
+    La recherche est relancée à la frappe (avec un court délai). Le mode filtre
+    n'affiche que les lignes trouvées ; sinon les flèches sautent d'une
+    occurrence à l'autre dans le texte complet.
+    """
+    
+    ALL = "Toutes les lignes"
+    DELAY_MS = 150
+    
+    def __init__(self, parent, widget, show_text):
+        self.widget = widget
+        self.show_text = show_text
+        self.index = None
+        self.matches = []
+        self.current = -1
+        self.filtered = False
+        self._job = None
+        
+        self.frame = tk.Frame(parent, bg='#f0f0f0')
+        tk.Label(self.frame, text="Rechercher:", font=('Arial', 9), bg='#f0f0f0').pack(side='left')
+        
+        self.entry = tk.Entry(self.frame, font=('Courier', 9), width=30)
+        self.entry.pack(side='left', padx=5)
+        self.entry.bind('<KeyRelease>', self._schedule)
+        self.entry.bind('<Return>', lambda e: self.jump(1))
+        self.entry.bind('<Shift-Return>', lambda e: self.jump(-1))
+        
+        self.category = ttk.Combobox(self.frame, values=[self.ALL], state='readonly', width=24)
+        self.category.set(self.ALL)
+        self.category.pack(side='left', padx=5)
+        self.category.bind('<<ComboboxSelected>>', lambda e: self.search())
+        
+        tk.Button(self.frame, text="◀", font=('Arial', 9), width=2,
+                 command=lambda: self.jump(-1)).pack(side='left')
+        tk.Button(self.frame, text="▶", font=('Arial', 9), width=2,
+                 command=lambda: self.jump(1)).pack(side='left', padx=(2, 5))
+        self.filter_btn = tk.Button(self.frame, text="FILTRER", font=('Arial', 9), bg='#3498db', fg='white',
+                                  command=self.toggle_filter, width=14)
+        self.filter_btn.pack(side='left')
+        
+        self.count_label = tk.Label(self.frame, text="", font=('Arial', 9), bg='#f0f0f0', fg='#7f8c8d')
+        self.count_label.pack(side='left', padx=10)
+        
+        widget.tag_configure('search_match', background='#f9e79f')
+    
+    def pack(self, **options):
+        self.frame.pack(**options)
+    
+    def set_index(self, index):
+        """Associe l'index du texte qui vient d'être affiché (None pour effacer)"""
+        self.index = index
+        self.matches = []
+        self.current = -1
+        self.filtered = False
+        self.filter_btn.config(text="FILTRER")
+        categories = sorted(index.categories, key=lambda c: -len(index.categories[c])) if index else []
+        self.category.config(values=[self.ALL] + categories)
+        self.category.set(self.ALL)
+        self.count_label.config(text=f"{index.line_count} lignes indexées" if index else "")
+    
+    def full_text(self):
+        """Texte complet si le widget n'affiche qu'un filtrat, sinon None"""
+        return self.index.text if self.index is not None and self.filtered else None
+    
+    def _schedule(self, event=None):
+        """Relance la recherche après une pause de frappe"""
+        if event is not None and event.keysym in ('Return', 'Shift_L', 'Shift_R'):
+            return
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+        self._job = self.widget.after(self.DELAY_MS, self.search)
+    
+    def search(self):
+        """Calcule les lignes correspondant à la requête et à la catégorie"""
+        self._job = None
+        if self.index is None:
+            return
         
-        for iface in interfaces:
-            if iface['is_access']:
-                configs.extend([
-                    f"set protocols dot1x authenticator interface {iface['name']} supplicant multiple",
-                    f"set protocols dot1x authenticator interface {iface['name']} retries 3",
-                    f"set protocols dot1x authenticator interface {iface['name']} transmit-period 1",
-                    f"set protocols dot1x authenticator interface {iface['name']} reauthentication 3600",
-                    f"set protocols dot1x authenticator interface {iface['name']} supplicant-timeout 10",
-                    f"set protocols dot1x authenticator interface {iface['name']} maximum-requests 3",
-                    f"set protocols dot1x authenticator interface {iface['name']} mac-radius"
-                ])
-        
-        return '\n'.join(configs)
-    
-    def generate_cleanup_config(self, interfaces):
-        """Genere la configuration de nettoyage"""
-        configs = []
+        category = self.category.get()
+        matches = self.index.search(self.entry.get(), None if category == self.ALL else category)
+        self.matches = matches or []
+        self.current = -1
+        self.widget.tag_remove('search_match', '1.0', tk.END)
         
-        for iface in interfaces:
-            if iface['is_access']:
-                configs.extend([
-                    f"delete interfaces {iface['name']} unit 0 family ethernet-switching",
-                    f"delete interfaces {iface['name']} ethernet-switching-options"
-                ])
+        if matches is None:
+            self.count_label.config(text=f"{self.index.line_count} lignes indexées")
+            if self.filtered:
+                self.show_text(self.widget, self.index.text)
+            return
         
-        return '\n'.join(configs)
+        if self.filtered:
+            self.show_text(self.widget, self.index.lines(self.matches))
+        self.count_label.config(text=f"{len(self.matches)} ligne(s)")
+        self.jump(1)
     
-    def get_radius_config(self, management_ip=None):
-        """Genere la configuration RADIUS"""
-        source_address = management_ip or '10.148.62.241'
-        return f"""set access radius-server 10.147.32.47 port 1812
-set access radius-server 10.147.32.47 secret "$9$qfTF69tBRcP5Qn9tREdbwsoJUjH.fT"
-set access radius-server 10.147.32.47 source-address {source_address}
-set access radius-server 10.147.160.47 port 1812
-set access radius-server 10.147.160.47 secret "$9$72Vw2oJUkm5dbs4JUmPBIREreM8XNVw"
-set access radius-server 10.147.160.47 source-address {source_address}
-set access profile 802.1x-auth accounting-order radius
-set access profile 802.1x-auth authentication-order radius
-set access profile 802.1x-auth radius authentication-server 10.147.32.47
-set access profile 802.1x-auth radius authentication-server 10.147.160.47
-set access profile 802.1x-auth radius accounting-server 10.147.32.47
-set access profile 802.1x-auth radius accounting-server 10.147.160.47
-set protocols dot1x authenticator authentication-profile-name 802.1x-auth"""
+    def toggle_filter(self):
+        """Bascule entre texte complet et lignes trouvées seulement"""
+        if self.index is None:
+            return
+        self.filtered = not self.filtered
+        self.filter_btn.config(text="TOUT AFFICHER" if self.filtered else "FILTRER")
+        if self.filtered and not self.entry.get().split() and self.category.get() == self.ALL:
+            # Rien à filtrer : le texte complet reste affiché
+            self.show_text(self.widget, self.index.text)
+            return
+        self.show_text(self.widget, self.index.lines(self.matches) if self.filtered else self.index.text)
+        self.current = -1
+        self.jump(1)
+    
+    def jump(self, step):
+        """Va à l'occurrence suivante (step=1) ou précédente (step=-1)"""
+        if not self.matches:
+            return
+        self.current = (self.current + step) % len(self.matches)
+        # En mode filtre, la n-ième occurrence est la n-ième ligne affichée
+        line = self.current + 1 if self.filtered else self.matches[self.current] + 1
+        
+        self.widget.tag_remove('search_match', '1.0', tk.END)
+        self.widget.tag_add('search_match', f"{line}.0", f"{line}.0 lineend")
+        self.widget.see(f"{line}.0")
+        self.count_label.config(text=f"{self.current + 1}/{len(self.matches)} ligne(s)")
 
 class NetworkManagementSuite:
     def __init__(self, root):
@@ -168,9 +2829,16 @@ class NetworkManagementSuite:
         self.root.geometry("1400x1000")
         self.root.configure(bg='#f0f0f0')
         
+        # File d'événements : les threads de travail ne touchent jamais Tk directement
+        self.ui = UIEventQueue(self.root)
+        self.ui.start()
+        
+        # La session Robont vit aussi longtemps que la fenêtre
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
         # Variables Robont
-        self.ssh_client = None
-        self.channel = None
+        self.robont_session = None
+        self.text_loaders = {}
         self.switch_hostname = None
         self.is_connecting = False
         self.config_data = ""
@@ -183,8 +2851,16 @@ class NetworkManagementSuite:
         self.dot1x_config = ""
         self.cleanup_config = ""
         self.radius_config = ""
+        self.analysis = None
+        self.config_import = None
+        self.import_summaries = []
+        
+        # Variables Batch
+        self.batch_fetcher = None
+        self.batch_rows = {}
         
         self.current_view = "dashboard"
+        self.views = {}
         
         # Styles
         style = ttk.Style()
@@ -213,7 +2889,8 @@ class NetworkManagementSuite:
         menu_items = [
             ("Dashboard", "dashboard", "🏠"),
             ("Robont Switch Manager", "robont", "🔗"),
-            ("ISE Switch Config", "ise", "⚙️")
+            ("ISE Switch Config", "ise", "⚙️"),
+            ("Batch Multi-Switch", "batch", "📋")
         ]
         
         for i, (text, key, icon) in enumerate(menu_items):
@@ -265,22 +2942,30 @@ class NetworkManagementSuite:
         
         self.current_view = view_name
         
-        # Effacer la zone principale
-        for widget in self.main_area.winfo_children():
-            widget.destroy()
-        
-        # Afficher la vue correspondante
-        if view_name == "dashboard":
-            self.show_dashboard()
-        elif view_name == "robont":
-            self.show_robont_manager()
-        elif view_name == "ise":
-            self.show_ise_config()
+        # Masquer la vue affichée (les widgets et leur contenu sont conservés)
+        for name, view in self.views.items():
+            if name != view_name:
+                view.pack_forget()
+        
+        # Construire la vue au premier affichage seulement
+        view = self.views.get(view_name)
+        if view is None:
+            builders = {
+                "dashboard": self.show_dashboard,
+                "robont": self.show_robont_manager,
+                "ise": self.show_ise_config,
+                "batch": self.show_batch_manager,
+            }
+            view = tk.Frame(self.main_area, bg='#f0f0f0')
+            builders[view_name](view)
+            self.views[view_name] = view
+        
+        view.pack(fill='both', expand=True)
     
-    def show_dashboard(self):
+    def show_dashboard(self, parent):
         """Affiche le tableau de bord"""
         # Titre
-        title_frame = tk.Frame(self.main_area, bg='#3498db', height=80)
+        title_frame = tk.Frame(parent, bg='#3498db', height=80)
         title_frame.pack(fill='x', padx=0, pady=0)
         title_frame.pack_propagate(False)
         
@@ -289,7 +2974,7 @@ class NetworkManagementSuite:
         title_label.pack(pady=25)
         
         # Contenu principal
-        content_frame = tk.Frame(self.main_area, bg='#f0f0f0')
+        content_frame = tk.Frame(parent, bg='#f0f0f0')
         content_frame.pack(fill='both', expand=True, padx=30, pady=30)
         
         # Cards de statut
@@ -359,6 +3044,11 @@ class NetworkManagementSuite:
    ├── Nettoyage des configurations existantes
    └── Export des configurations générées
 
+📋 BATCH MULTI-SWITCH
+   ├── Liste d'IP collée ou importée (txt, csv)
+   ├── Pool de sessions Robont en parallèle
+   └── Tableau d'état par switch, fichiers écrits au fil de l'eau
+
 🚀 FONCTIONNALITÉS
    • Interface graphique intuitive avec navigation par onglets
    • Gestion des erreurs avancée et logs détaillés
@@ -374,10 +3064,10 @@ class NetworkManagementSuite:
         info_text.insert(tk.END, info_content)
         info_text.config(state='disabled')
     
-    def show_robont_manager(self):
+    def show_robont_manager(self, parent):
         """Affiche le gestionnaire Robont (interface originale)"""
         # Titre
-        title_frame = tk.Frame(self.main_area, bg='#2c3e50', height=60)
+        title_frame = tk.Frame(parent, bg='#2c3e50', height=60)
         title_frame.pack(fill='x', padx=0, pady=0)
         title_frame.pack_propagate(False)
         
@@ -386,7 +3076,7 @@ class NetworkManagementSuite:
         title_label.pack(pady=15)
         
         # Frame principal avec scroll
-        main_frame = tk.Frame(self.main_area, bg='#f0f0f0')
+        main_frame = tk.Frame(parent, bg='#f0f0f0')
         main_frame.pack(fill='both', expand=True, padx=20, pady=20)
         
         # === SECTION SERVEUR ROBONT ===
@@ -486,6 +3176,10 @@ class NetworkManagementSuite:
                                                      wrap='none', height=20)
         self.results_text.pack(fill='both', expand=True, padx=10, pady=10)
         
+        # Recherche indexée au-dessus des résultats
+        self.results_search = SearchBar(results_frame, self.results_text, self.show_text)
+        self.results_search.pack(fill='x', padx=10, pady=(10, 0), before=self.results_text)
+        
         # Boutons de sauvegarde
         save_frame = tk.Frame(results_frame, bg='#f0f0f0')
         save_frame.pack(fill='x', padx=10, pady=(0, 10))
@@ -511,10 +3205,10 @@ class NetworkManagementSuite:
                                      font=('Arial', 9, 'italic'), bg='#f0f0f0', fg='#27ae60')
         self.hostname_label.pack(side='right', padx=5)
     
-    def show_ise_config(self):
+    def show_ise_config(self, parent):
         """Affiche l'interface ISE Switch Config complète"""
         # Titre
-        title_frame = tk.Frame(self.main_area, bg='#e67e22', height=60)
+        title_frame = tk.Frame(parent, bg='#e67e22', height=60)
         title_frame.pack(fill='x', padx=0, pady=0)
         title_frame.pack_propagate(False)
         
@@ -523,7 +3217,7 @@ class NetworkManagementSuite:
         title_label.pack(pady=15)
         
         # Frame principal avec scroll
-        main_frame = tk.Frame(self.main_area, bg='#f0f0f0')
+        main_frame = tk.Frame(parent, bg='#f0f0f0')
         main_frame.pack(fill='both', expand=True, padx=20, pady=20)
         
         # === SECTION UPLOAD ===
@@ -554,11 +3248,79 @@ class NetworkManagementSuite:
                                        command=self.select_config_file, width=20)
         self.select_file_btn.pack(side='left', padx=5)
         
+        self.select_folder_btn = tk.Button(upload_buttons_frame, text="IMPORTER UN DOSSIER", 
+                                         font=('Arial', 10), bg='#3498db', fg='white',
+                                         command=self.select_config_folder, width=20)
+        self.select_folder_btn.pack(side='left', padx=5)
+        
         self.clear_config_btn = tk.Button(upload_buttons_frame, text="EFFACER", 
                                         font=('Arial', 10), bg='#e74c3c', fg='white',
                                         command=self.clear_ise_config, width=15, state='disabled')
         self.clear_config_btn.pack(side='left', padx=5)
         
+        self.cancel_analysis_btn = tk.Button(upload_buttons_frame, text="ANNULER L'ANALYSE", 
+                                           font=('Arial', 10), bg='#95a5a6', fg='white',
+                                           command=self.cancel_analysis, width=18, state='disabled')
+        self.cancel_analysis_btn.pack(side='left', padx=5)
+        
+        self.export_bundle_btn = tk.Button(upload_buttons_frame, text="EXPORT ZIP (MULTI)", 
+                                         font=('Arial', 10), bg='#16a085', fg='white',
+                                         command=self.export_config_bundle, width=18)
+        self.export_bundle_btn.pack(side='left', padx=5)
+        
+        # Progression de l'analyse (visible pendant le traitement)
+        self.analysis_frame = tk.Frame(upload_frame, bg='#f0f0f0')
+        self.analysis_progress = ttk.Progressbar(self.analysis_frame, mode='determinate',
+                                                 maximum=len(ConfigAnalysis.STEPS))
+        self.analysis_progress.pack(fill='x')
+        self.analysis_label = tk.Label(self.analysis_frame, text="", font=('Arial', 9),
+                                     bg='#f0f0f0', fg='#3498db')
+        self.analysis_label.pack(pady=(2, 0))
+        
+        # === SECTION IMPORT MULTI-SWITCH (visible après un import de plusieurs fichiers) ===
+        self.import_frame = tk.LabelFrame(main_frame, text="SWITCHS IMPORTÉS", 
+                                        font=('Arial', 12, 'bold'), bg='#f0f0f0', fg='#e67e22')
+        
+        import_buttons = tk.Frame(self.import_frame, bg='#f0f0f0')
+        import_buttons.pack(fill='x', padx=10, pady=(10, 0))
+        
+        self.import_generate_btn = tk.Button(import_buttons, text="GÉNÉRER TOUT (DOSSIER)", 
+                                           font=('Arial', 10), bg='#27ae60', fg='white',
+                                           command=lambda: self.export_imported_configs(to_folder=True),
+                                           width=22, state='disabled')
+        self.import_generate_btn.pack(side='left', padx=5)
+        
+        self.import_export_btn = tk.Button(import_buttons, text="EXPORT ZIP (TOUS)", 
+                                         font=('Arial', 10), bg='#16a085', fg='white',
+                                         command=lambda: self.export_imported_configs(to_folder=False),
+                                         width=18, state='disabled')
+        self.import_export_btn.pack(side='left', padx=5)
+        
+        self.import_summary_label = tk.Label(import_buttons, text="", font=('Arial', 10, 'bold'),
+                                           bg='#f0f0f0', fg='#2c3e50')
+        self.import_summary_label.pack(side='right', padx=5)
+        
+        self.import_progress = ttk.Progressbar(self.import_frame, mode='determinate')
+        self.import_progress.pack(fill='x', padx=10, pady=(5, 0))
+        
+        import_table = tk.Frame(self.import_frame, bg='#f0f0f0')
+        import_table.pack(fill='x', padx=10, pady=10)
+        
+        columns = [('source', "Fichier", 260), ('hostname', "Hostname", 180),
+                   ('ip', "IP Management", 140), ('ports', "Ports access", 100)]
+        self.import_tree = ttk.Treeview(import_table, columns=[c[0] for c in columns],
+                                        show='headings', height=8)
+        for column, heading, width in columns:
+            self.import_tree.heading(column, text=heading)
+            self.import_tree.column(column, width=width, anchor='w')
+        self.import_tree.tag_configure('error', foreground='#e74c3c')
+        self.import_tree.bind("<Double-1>", self.open_imported_config)
+        
+        scrollbar = ttk.Scrollbar(import_table, orient='vertical', command=self.import_tree.yview)
+        self.import_tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side='right', fill='y')
+        self.import_tree.pack(fill='x', expand=True)
+        
         # === SECTION INFORMATIONS SWITCH ===
         self.info_frame = tk.LabelFrame(main_frame, text="INFORMATIONS DU SWITCH", 
                                       font=('Arial', 12, 'bold'), bg='#f0f0f0', fg='#e67e22')
@@ -609,6 +3371,11 @@ class NetworkManagementSuite:
                                         command=self.download_all_configs, state='disabled', height=2)
         self.download_all_btn.pack(pady=5)
         
+        self.download_chunks_btn = tk.Button(download_all_frame, text="📦 TÉLÉCHARGER PAR LOTS (ORDRE D'APPLICATION)", 
+                                           font=('Arial', 10, 'bold'), bg='#16a085', fg='white',
+                                           command=self.download_chunked_changeset, state='disabled')
+        self.download_chunks_btn.pack(pady=(0, 5))
+        
         # Notebook pour les onglets
         self.config_notebook = ttk.Notebook(config_frame)
         self.config_notebook.pack(fill='both', expand=True, padx=10, pady=(5, 10))
@@ -689,63 +3456,227 @@ class NetworkManagementSuite:
     # === MÉTHODES ISE CONFIG ===
     
     def select_config_file(self, event=None):
-        """Sélectionne un fichier de configuration"""
-        file_path = filedialog.askopenfilename(
-            title="Sélectionner un fichier de configuration",
+        """Sélectionne un ou plusieurs fichiers de configuration (ou archives zip)"""
+        paths = filedialog.askopenfilenames(
+            title="Sélectionner un ou plusieurs fichiers de configuration",
             filetypes=[
-                ("Fichiers de configuration", "*.txt *.conf *.cfg"),
+                ("Fichiers de configuration", "*.txt *.conf *.cfg *.zip"),
                 ("Fichiers texte", "*.txt"),
+                ("Archives zip", "*.zip"),
                 ("Tous les fichiers", "*.*")
             ]
         )
         
-        if file_path:
-            try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                
-                self.process_config_file(content, os.path.basename(file_path))
-                
-            except Exception as e:
-                messagebox.showerror("Erreur", f"Erreur lors de la lecture du fichier:\n{e}")
+        if len(paths) == 1 and not paths[0].lower().endswith('.zip'):
+            # Lecture et analyse sur un thread de travail
+            self.start_analysis(path=paths[0])
+        elif paths:
+            self.start_import(paths)
     
-    def process_config_file(self, content, filename):
-        """Traite le fichier de configuration uploadé"""
+    def select_config_folder(self):
+        """Importe toutes les configurations d'un dossier (sous-dossiers et zip compris)"""
+        folder = filedialog.askdirectory(title="Sélectionner un dossier de configurations")
+        if folder:
+            self.start_import([folder])
+    
+    def start_import(self, paths):
+        """Analyse plusieurs configurations dans un pool de processus"""
         try:
-            self.uploaded_config = content
-            
-            # Mettre à jour l'interface upload
-            self.drop_label.config(text=f"✅ Fichier chargé: {filename}\n"
-                                      f"Taille: {len(content)} caractères",
-                                 fg='#27ae60')
-            self.drop_frame.config(bg='#d5f4e6')
-            self.clear_config_btn.config(state='normal')
-            
-            # Parser la configuration
-            self.parsed_config = ConfigurationParser(content)
-            
-            # Extraire les informations
-            self.switch_info = self.parsed_config.get_switch_info()
-            self.interfaces = self.parsed_config.get_interfaces()
-            
-            # Mettre à jour les informations du switch
-            self.update_switch_info()
-            
-            # Générer les configurations
-            self.generate_configurations()
-            
-            # Afficher les sections d'informations
-            self.info_frame.pack(fill='x', pady=(0, 15), before=self.interfaces_frame)
-            self.interfaces_frame.pack(fill='x', pady=(0, 15), before=self.config_notebook.master)
-            
-            messagebox.showinfo("Succès", 
-                f"Configuration analysée avec succès!\n\n"
-                f"• Hostname: {self.switch_info.get('hostname', 'Non détecté')}\n"
-                f"• IP Management: {self.switch_info.get('management_ip', 'Non détectée')}\n"
-                f"• Interfaces Access: {len(self.interfaces)} détectées")
-                
+            sources = collect_config_sources(paths)
+        except Exception as e:
+            messagebox.showerror("Erreur", f"Impossible de lire la sélection:\n{e}")
+            return
+        if not sources:
+            messagebox.showwarning("Attention", "Aucun fichier de configuration (.txt, .conf, .cfg) trouvé")
+            return
+        
+        if self.config_import:
+            self.config_import.cancel()
+        config_import = ConfigImport(
+            sources,
+            on_progress=lambda done, total: self.ui.post_latest(
+                'import', self.show_import_progress, config_import, done, total),
+            on_done=lambda summaries: self.ui.post(self.apply_import, config_import, summaries),
+            on_error=lambda error: self.ui.post(self.fail_import, config_import, error))
+        self.config_import = config_import
+        self.import_summaries = []
+        
+        self.import_tree.delete(*self.import_tree.get_children())
+        self.import_progress.config(value=0, maximum=len(sources))
+        self.import_progress.pack(fill='x', padx=10, pady=(5, 0), before=self.import_tree.master)
+        self.import_summary_label.config(text=f"⏳ Analyse de {len(sources)} configurations...")
+        self.import_generate_btn.config(state='disabled')
+        self.import_export_btn.config(state='disabled')
+        self.import_frame.pack(fill='x', pady=(0, 15), before=self.info_frame)
+        
+        config_import.start()
+    
+    def show_import_progress(self, config_import, done, total):
+        """Progression de l'import (thread principal)"""
+        if config_import is not self.config_import:
+            return
+        self.import_progress.config(value=done)
+        self.import_summary_label.config(text=f"⏳ {done}/{total} configurations analysées")
+    
+    def fail_import(self, config_import, error):
+        """Erreur pendant l'import multi-fichiers"""
+        if config_import is not self.config_import:
+            return
+        self.config_import = None
+        self.import_progress.pack_forget()
+        self.import_summary_label.config(text="❌ Échec de l'import")
+        messagebox.showerror("Erreur", f"Erreur lors de l'import:\n{error}")
+    
+    def apply_import(self, config_import, summaries):
+        """Remplit le tableau récapitulatif des switchs importés"""
+        if config_import is not self.config_import:
+            return
+        self.config_import = None
+        self.import_summaries = summaries
+        self.import_progress.pack_forget()
+        
+        for index, summary in enumerate(summaries):
+            if summary['error']:
+                values = (summary['name'], "Erreur", summary['error'], "")
+            else:
+                values = (summary['name'], summary['hostname'] or "Non détecté",
+                          summary['management_ip'] or "Non détectée", summary['access_ports'])
+            self.import_tree.insert('', 'end', iid=str(index), values=values,
+                                    tags=('error',) if summary['error'] else ())
+        
+        errors = sum(1 for summary in summaries if summary['error'])
+        ports = sum(summary['access_ports'] for summary in summaries)
+        self.import_summary_label.config(
+            text=f"{len(summaries)} switchs, {ports} ports access, {errors} erreur(s) "
+                 f"- {config_import.elapsed:.1f}s")
+        state = 'normal' if len(summaries) > errors else 'disabled'
+        self.import_generate_btn.config(state=state)
+        self.import_export_btn.config(state=state)
+    
+    def open_imported_config(self, event=None):
+        """Ouvre le switch sélectionné dans le tableau (analyse détaillée)"""
+        selection = self.import_tree.selection()
+        if not selection:
+            return
+        summary = self.import_summaries[int(selection[0])]
+        try:
+            content = read_config_source(summary['source'])
         except Exception as e:
-            messagebox.showerror("Erreur", f"Erreur lors du traitement:\n{e}")
+            messagebox.showerror("Erreur", f"Impossible de lire le fichier:\n{e}")
+            return
+        self.start_analysis(content=content, filename=summary['name'])
+    
+    def export_imported_configs(self, to_folder=False):
+        """Génère les configurations de tous les switchs importés (dossier ou archive zip)"""
+        sources = [summary['source'] for summary in self.import_summaries if not summary['error']]
+        if sources:
+            self.export_config_bundle(sources, to_folder)
+    
+    def process_config_file(self, content, filename):
+        """Traite une configuration déjà chargée en mémoire"""
+        self.start_analysis(content=content, filename=filename)
+    
+    def start_analysis(self, path=None, content=None, filename=None):
+        """Lance l'analyse en arrière-plan (annule celle en cours)"""
+        if self.analysis:
+            self.analysis.cancel()
+        
+        analysis = ConfigAnalysis(
+            path=path, content=content, filename=filename,
+            previous=self.parsed_config, previous_info=self.switch_info,
+            on_progress=lambda step, total, label: self.ui.post_latest(
+                'analysis', self.show_analysis_progress, analysis, step, label),
+            on_done=lambda result: self.ui.post(self.apply_analysis, analysis, result),
+            on_error=lambda error: self.ui.post(self.fail_analysis, analysis, error))
+        self.analysis = analysis
+        
+        # Les résultats précédents ne sont plus valides pendant l'analyse
+        self.set_ise_buttons('disabled')
+        self.drop_label.config(text=f"⏳ Analyse en cours: {analysis.filename}", fg='#3498db')
+        self.drop_frame.config(bg='#ecf0f1')
+        self.cancel_analysis_btn.config(state='normal')
+        self.analysis_progress.config(value=0)
+        self.analysis_label.config(text="")
+        self.analysis_frame.pack(fill='x', padx=10, pady=(0, 10))
+        
+        analysis.start()
+    
+    def cancel_analysis(self):
+        """Annule l'analyse en cours"""
+        if not self.analysis:
+            return
+        self.analysis.cancel()
+        self.end_analysis()
+        self.drop_label.config(text="⚠️ Analyse annulée\n"
+                                    "Cliquez ici pour sélectionner un fichier de configuration",
+                             fg='#e67e22')
+    
+    def end_analysis(self):
+        """Masque la progression de l'analyse"""
+        self.analysis = None
+        if self.analysis_frame.winfo_exists():
+            self.cancel_analysis_btn.config(state='disabled')
+            self.analysis_frame.pack_forget()
+    
+    def show_analysis_progress(self, analysis, step, label):
+        """Progression de l'analyse (thread principal)"""
+        if analysis is not self.analysis or not self.analysis_frame.winfo_exists():
+            return
+        self.analysis_progress.config(value=step)
+        self.analysis_label.config(text=f"{label}... ({step + 1}/{len(ConfigAnalysis.STEPS)})")
+    
+    def fail_analysis(self, analysis, error):
+        """Erreur de lecture ou d'analyse"""
+        if analysis is not self.analysis:
+            return
+        self.end_analysis()
+        if self.drop_label.winfo_exists():
+            self.drop_label.config(text="❌ Échec de l'analyse\n"
+                                        "Cliquez ici pour sélectionner un fichier de configuration",
+                                 fg='#e74c3c')
+        messagebox.showerror("Erreur", f"Erreur lors du traitement:\n{error}")
+    
+    def apply_analysis(self, analysis, result):
+        """Affiche les résultats d'une analyse terminée"""
+        if analysis is not self.analysis:
+            return  # Résultat d'une analyse remplacée entre-temps
+        self.end_analysis()
+        
+        self.uploaded_config = result['content']
+        self.parsed_config = result['parser']
+        self.switch_info = result['switch_info']
+        self.interfaces = result['interfaces']
+        self.dot1x_config = result['dot1x_config']
+        self.cleanup_config = result['cleanup_config']
+        self.radius_config = result['radius_config']
+        
+        # Mettre à jour l'interface upload
+        self.drop_label.config(text=f"✅ Fichier chargé: {result['filename']}\n"
+                                  f"Taille: {len(result['content'])} caractères",
+                             fg='#27ae60')
+        self.drop_frame.config(bg='#d5f4e6')
+        self.clear_config_btn.config(state='normal')
+        
+        # Mettre à jour les informations du switch
+        self.update_switch_info()
+        
+        # Afficher les configurations générées
+        self.display_configurations()
+        
+        # Afficher les sections d'informations
+        self.info_frame.pack(fill='x', pady=(0, 15), before=self.interfaces_frame)
+        self.interfaces_frame.pack(fill='x', pady=(0, 15), before=self.config_notebook.master)
+        
+        changeset = result['changeset']
+        message = (f"Configuration analysée avec succès!\n\n"
+                   f"• Hostname: {self.switch_info.get('hostname', 'Non détecté')}\n"
+                   f"• IP Management: {self.switch_info.get('management_ip', 'Non détectée')}\n"
+                   f"• Interfaces Access: {len(self.interfaces)} détectées")
+        if changeset is not None:
+            message += (f"\n\nMise à jour incrémentale ({changeset['changed_lines']} lignes modifiées):\n"
+                        f"• Nouvelles interfaces access: {len(changeset['added_interfaces'])}\n"
+                        f"• Interfaces retirées: {len(changeset['removed_interfaces'])}")
+        messagebox.showinfo("Succès", message)
     
     def update_switch_info(self):
         """Met à jour l'affichage des informations du switch"""
@@ -754,6 +3685,8 @@ class NetworkManagementSuite:
         
         self.hostname_info_label.config(text=hostname, 
                                       fg='#27ae60' if hostname != 'Non détecté' else '#7f8c8d')
+        if self.switch_info.get('site'):
+            management_ip = f"{management_ip} (profil {self.switch_info['site']})"
         self.management_ip_label.config(text=management_ip,
                                       fg='#27ae60' if management_ip != 'Non détectée' else '#7f8c8d')
         self.interfaces_count_label.config(text=f"{len(self.interfaces)} détectées",
@@ -774,42 +3707,40 @@ class NetworkManagementSuite:
         
         self.interfaces_text.config(state='disabled')
     
-    def generate_configurations(self):
-        """Génère toutes les configurations"""
+    def display_configurations(self):
+        """Affiche les configurations générées par l'analyse"""
         try:
-            # Générer 802.1X
-            self.dot1x_config = self.parsed_config.generate_dot1x_config(self.interfaces)
-            self.dot1x_text.delete(1.0, tk.END)
+            # 802.1X
             if self.dot1x_config:
-                self.dot1x_text.insert(tk.END, self.dot1x_config)
+                self.show_text(self.dot1x_text, self.dot1x_config)
                 self.copy_dot1x_btn.config(state='normal')
                 self.download_dot1x_btn.config(state='normal')
+            elif self.interfaces:
+                self.show_text(self.dot1x_text, "Toutes les interfaces access ont déjà la configuration 802.1X")
             else:
-                self.dot1x_text.insert(tk.END, "Aucune interface access détectée pour la configuration 802.1X")
+                self.show_text(self.dot1x_text, "Aucune interface access détectée pour la configuration 802.1X")
             
-            # Générer Cleanup
-            self.cleanup_config = self.parsed_config.generate_cleanup_config(self.interfaces)
-            self.cleanup_text.delete(1.0, tk.END)
+            # Cleanup
             if self.cleanup_config:
-                self.cleanup_text.insert(tk.END, self.cleanup_config)
+                self.show_text(self.cleanup_text, self.cleanup_config)
                 self.copy_cleanup_btn.config(state='normal')
                 self.download_cleanup_btn.config(state='normal')
+            elif self.interfaces:
+                self.show_text(self.cleanup_text, "Aucune stanza ethernet-switching à supprimer sur les interfaces access")
             else:
-                self.cleanup_text.insert(tk.END, "Aucune interface access détectée pour la configuration cleanup")
+                self.show_text(self.cleanup_text, "Aucune interface access détectée pour la configuration cleanup")
             
-            # Générer RADIUS
-            management_ip = self.switch_info.get('management_ip')
-            self.radius_config = self.parsed_config.get_radius_config(management_ip)
-            self.radius_text.delete(1.0, tk.END)
-            self.radius_text.insert(tk.END, self.radius_config)
+            # RADIUS
+            self.show_text(self.radius_text, self.radius_config)
             self.copy_radius_btn.config(state='normal')
             self.download_radius_btn.config(state='normal')
             
             # Activer le bouton de téléchargement global
             self.download_all_btn.config(state='normal')
+            self.download_chunks_btn.config(state='normal')
             
         except Exception as e:
-            messagebox.showerror("Erreur", f"Erreur lors de la génération:\n{e}")
+            messagebox.showerror("Erreur", f"Erreur lors de l'affichage:\n{e}")
     
     def copy_to_clipboard(self, text, config_type):
         """Copie le texte vers le presse-papiers"""
@@ -820,6 +3751,19 @@ class NetworkManagementSuite:
         except Exception as e:
             messagebox.showerror("Erreur", f"Erreur lors de la copie:\n{e}")
     
+    def confirm_valid_config(self, lines):
+        """Pré-valide la sortie générée, demande confirmation si des lignes sont rejetées"""
+        errors = SetSyntaxValidator.validate(lines)
+        if not errors:
+            return True
+        
+        details = "\n".join(f"Ligne {number}: {line}\n   → {reason}" for number, line, reason in errors[:10])
+        if len(errors) > 10:
+            details += f"\n... et {len(errors) - 10} autre(s)"
+        return messagebox.askyesno("Validation de la syntaxe",
+                                   f"{len(errors)} ligne(s) invalide(s):\n\n{details}\n\n"
+                                   "Télécharger quand même ?")
+    
     def download_single_config(self, config_text, default_filename):
         """Télécharge une configuration individuelle"""
         try:
@@ -827,6 +3771,9 @@ class NetworkManagementSuite:
                 messagebox.showwarning("Attention", "Aucune configuration à télécharger")
                 return
             
+            if not self.confirm_valid_config(config_text.split('\n')):
+                return
+            
             # Ajouter le hostname au nom de fichier si disponible
             hostname = self.switch_info.get('hostname', 'switch')
             if hostname and hostname != 'Non détecté':
@@ -837,7 +3784,7 @@ class NetworkManagementSuite:
             filename = filedialog.asksaveasfilename(
                 title="Télécharger la configuration",
                 defaultextension=".txt",
-                initialname=default_filename,
+                initialfile=default_filename,
                 filetypes=[
                     ("Fichiers texte", "*.txt"),
                     ("Tous les fichiers", "*.*")
@@ -861,13 +3808,20 @@ class NetworkManagementSuite:
     def download_all_configs(self):
         """Télécharge toutes les configurations dans un seul fichier"""
         try:
+            management_ip = self.switch_info.get('management_ip')
+            if not self.confirm_valid_config(itertools.chain(
+                    self.parsed_config.iter_dot1x_config(self.interfaces),
+                    self.parsed_config.iter_cleanup_config(self.interfaces),
+                    self.parsed_config.iter_radius_config(management_ip))):
+                return
+            
             hostname = self.switch_info.get('hostname', 'switch')
             default_filename = f"{hostname}_all_configs.txt" if hostname != 'Non détecté' else "all_configs.txt"
             
             filename = filedialog.asksaveasfilename(
                 title="Télécharger toutes les configurations",
                 defaultextension=".txt",
-                initialname=default_filename,
+                initialfile=default_filename,
                 filetypes=[
                     ("Fichiers texte", "*.txt"),
                     ("Tous les fichiers", "*.*")
@@ -882,30 +3836,137 @@ class NetworkManagementSuite:
                     f.write(f"# Interfaces: {len(self.interfaces)} détectées\n")
                     f.write("#" + "="*80 + "\n\n")
                     
+                    # Les générateurs écrivent directement dans le fichier
                     # 802.1X Configuration
                     f.write("# 802.1X CONFIGURATION\n")
                     f.write("#" + "-"*50 + "\n")
-                    f.write(self.dot1x_config)
-                    f.write("\n\n")
+                    stream_config_lines(self.parsed_config.iter_dot1x_config(self.interfaces), f)
+                    f.write("\n")
                     
                     # Cleanup Configuration
                     f.write("# CLEANUP CONFIGURATION\n")
                     f.write("#" + "-"*50 + "\n")
-                    f.write(self.cleanup_config)
-                    f.write("\n\n")
+                    stream_config_lines(self.parsed_config.iter_cleanup_config(self.interfaces), f)
+                    f.write("\n")
                     
                     # RADIUS Configuration
                     f.write("# RADIUS CONFIGURATION\n")
                     f.write("#" + "-"*50 + "\n")
-                    f.write(self.radius_config)
+                    stream_config_lines(self.parsed_config.iter_radius_config(self.switch_info.get('management_ip')), f)
                 
                 messagebox.showinfo("Succès", f"Toutes les configurations téléchargées:\n{filename}")
                 
         except Exception as e:
             messagebox.showerror("Erreur", f"Erreur lors du téléchargement:\n{e}")
     
+    def download_chunked_changeset(self):
+        """Télécharge le changeset découpé en lots ordonnés (RADIUS, nettoyage, dot1x)"""
+        try:
+            chunks = self.parsed_config.chunk_changeset(self.interfaces, self.switch_info.get('management_ip'))
+            if not self.confirm_valid_config([line for chunk in chunks for line in chunk['lines']]):
+                return
+            
+            hostname = self.switch_info.get('hostname', 'switch')
+            default_filename = f"{hostname}_changeset.txt" if hostname != 'Non détecté' else "changeset.txt"
+            
+            filename = filedialog.asksaveasfilename(
+                title="Télécharger le changeset par lots",
+                defaultextension=".txt",
+                initialfile=default_filename,
+                filetypes=[
+                    ("Fichiers texte", "*.txt"),
+                    ("Tous les fichiers", "*.*")
+                ]
+            )
+            
+            if filename:
+                with open(filename, 'w', encoding='utf-8') as f:
+                    f.write(f"# Changeset généré le {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n")
+                    f.write(f"# Switch: {self.switch_info.get('hostname', 'Non détecté')}\n")
+                    f.write(f"# Lots: {len(chunks)} (à charger dans l'ordre avec 'commit check' après chaque lot,\n")
+                    f.write("# puis un seul 'commit confirmed' et son 'commit' pour l'ensemble des lots)\n")
+                    f.write("# sha256: empreinte d'identification du lot, non vérifiée sur le switch\n")
+                    f.write("#" + "="*80 + "\n\n")
+                    
+                    for chunk in chunks:
+                        f.write(f"# LOT {chunk['index']}/{len(chunks)} - {', '.join(chunk['sections'])} - "
+                                f"{chunk['line_count']} lignes - sha256 {chunk['checksum']}\n")
+                        stream_config_lines(chunk['lines'], f)
+                        f.write("\n")
+                
+                messagebox.showinfo("Succès", f"Changeset téléchargé ({len(chunks)} lots):\n{filename}")
+                
+        except Exception as e:
+            messagebox.showerror("Erreur", f"Erreur lors du téléchargement:\n{e}")
+    
+    def export_config_bundle(self, sources=None, to_folder=False):
+        """Exporte une archive zip (dossier par switch + manifest.json) pour plusieurs configurations"""
+        if sources is None:
+            paths = filedialog.askopenfilenames(
+                title="Sélectionner les configurations à exporter",
+                filetypes=[
+                    ("Fichiers de configuration", "*.txt *.conf *.cfg *.zip"),
+                    ("Tous les fichiers", "*.*")
+                ]
+            )
+            if not paths:
+                return
+            try:
+                sources = collect_config_sources(paths)
+            except Exception as e:
+                messagebox.showerror("Erreur", f"Impossible de lire la sélection:\n{e}")
+                return
+        
+        if to_folder:
+            filename = filedialog.askdirectory(title="Dossier de destination des configurations")
+        else:
+            filename = filedialog.asksaveasfilename(
+                title="Enregistrer l'archive",
+                defaultextension=".zip",
+                initialfile=f"dot1x_bundle_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
+                filetypes=[("Archives zip", "*.zip"), ("Tous les fichiers", "*.*")]
+            )
+        if not filename:
+            return
+        
+        self.set_export_buttons('disabled')
+        threading.Thread(target=self._export_config_bundle, args=(sources, filename, to_folder),
+                         daemon=True).start()
+    
+    def _export_config_bundle(self, sources, filename, to_folder):
+        """Écrit l'archive (ou le dossier) en flux (thread de travail), une configuration à la fois"""
+        try:
+            if to_folder:
+                manifest = write_config_folder(iter_config_sources(sources), filename)
+            else:
+                with open(filename, 'wb') as f:
+                    manifest = write_config_bundle(iter_config_sources(sources), f)
+            invalid = sum(info.get('invalid_lines', 0) for switch in manifest['switches']
+                          for info in switch['files'].values())
+            target = "Configurations générées" if to_folder else "Archive créée"
+            message = f"{target} ({len(manifest['switches'])} switchs):\n{filename}"
+            if invalid:
+                message += f"\n\n⚠️ {invalid} ligne(s) générée(s) invalide(s), voir manifest.json"
+            self.ui.post(messagebox.showinfo, "Succès", message)
+        except Exception as e:
+            self.ui.post(messagebox.showerror, "Erreur", f"Erreur lors de l'export:\n{e}")
+        finally:
+            self.ui.post(self.set_export_buttons, 'normal')
+    
+    def set_export_buttons(self, state):
+        """Active ou désactive les boutons d'export multi-switch"""
+        self.export_bundle_btn.config(state=state, text="EXPORT ZIP (MULTI)" if state == 'normal'
+                                      else "EXPORT EN COURS...")
+        if state == 'disabled' or any(not summary['error'] for summary in self.import_summaries):
+            self.import_generate_btn.config(state=state)
+            self.import_export_btn.config(state=state)
+    
     def clear_ise_config(self):
         """Efface la configuration ISE chargée"""
+        if self.analysis:
+            self.analysis.cancel()
+            self.end_analysis()
+        
         self.uploaded_config = ""
         self.parsed_config = None
         self.switch_info = {}
@@ -926,18 +3987,18 @@ class NetworkManagementSuite:
         self.interfaces_frame.pack_forget()
         
         # Effacer les zones de texte
-        self.dot1x_text.delete(1.0, tk.END)
-        self.cleanup_text.delete(1.0, tk.END)
-        self.radius_text.delete(1.0, tk.END)
+        for widget in (self.dot1x_text, self.cleanup_text, self.radius_text):
+            self.show_text(widget, "")
         
         # Désactiver les boutons
-        self.copy_dot1x_btn.config(state='disabled')
-        self.download_dot1x_btn.config(state='disabled')
-        self.copy_cleanup_btn.config(state='disabled')
-        self.download_cleanup_btn.config(state='disabled')
-        self.copy_radius_btn.config(state='disabled')
-        self.download_radius_btn.config(state='disabled')
-        self.download_all_btn.config(state='disabled')
+        self.set_ise_buttons('disabled')
+    
+    def set_ise_buttons(self, state):
+        """Active ou désactive les boutons de copie et de téléchargement ISE"""
+        for button in (self.copy_dot1x_btn, self.download_dot1x_btn, self.copy_cleanup_btn,
+                       self.download_cleanup_btn, self.copy_radius_btn, self.download_radius_btn,
+                       self.download_all_btn, self.download_chunks_btn):
+            button.config(state=state)
     
     # === MÉTHODES ROBONT (inchangées) ===
     
@@ -971,10 +4032,30 @@ class NetworkManagementSuite:
         return True
     
     def update_status(self, message, color='#7f8c8d'):
-        """Met à jour le statut"""
+        """Met à jour le statut (depuis n'importe quel thread, rafraîchissements fusionnés)"""
+        if threading.current_thread() is threading.main_thread():
+            self._apply_status(message, color)
+        else:
+            self.ui.post_latest('status', self._apply_status, message, color)
+    
+    def _apply_status(self, message, color):
+        """Applique le statut sur le thread Tk"""
         if hasattr(self, 'status_label'):
             self.status_label.config(text=message, fg=color)
-            self.root.update()
+            self.status_label.update_idletasks()
+    
+    def show_message(self, kind, title, message):
+        """Boîte de dialogue (info, warning, error) affichée sur le thread Tk"""
+        dialog = getattr(messagebox, 'show' + kind)
+        if threading.current_thread() is threading.main_thread():
+            dialog(title, message)
+        else:
+            self.ui.post(dialog, title, message)
+    
+    def report_fetch_progress(self, received):
+        """Progression de la récupération (appelé à chaque recv, fusionné par la file)"""
+        self.ui.post_latest('status', self._apply_status,
+                            f"Récupération de la configuration... {received // 1024} Ko reçus", '#3498db')
     
     def start_connection(self):
         """Démarre la connexion dans un thread séparé"""
@@ -987,185 +4068,111 @@ class NetworkManagementSuite:
         self.is_connecting = True
         self.connect_btn.config(state='disabled', text="CONNEXION EN COURS...")
         self.progress_bar.start()
-        self.results_text.delete(1.0, tk.END)
+        self.show_text(self.results_text, "")
+        
+        # Valeurs lues ici : le thread de travail ne lit pas les widgets
+        credentials = (
+            self.server_user_entry.get().strip(),
+            self.server_pass_entry.get().strip(),
+            self.switch_ip_entry.get().strip(),
+            self.switch_user_entry.get().strip(),
+            self.switch_pass_entry.get().strip()
+        )
         
         # Lancer dans un thread pour éviter de bloquer l'interface
-        thread = threading.Thread(target=self.execute_connection)
+        thread = threading.Thread(target=self.execute_connection, args=credentials)
         thread.daemon = True
         thread.start()
     
-    def execute_connection(self):
-        """Exécute la connexion complète"""
+    def get_robont_session(self, username, password):
+        """Session Robont de la fenêtre, recréée si les identifiants changent"""
+        if self.robont_session is None or not self.robont_session.matches(username, password):
+            if self.robont_session:
+                self.robont_session.close()
+            self.robont_session = RobontSession(username, password)
+        return self.robont_session
+    
+    def execute_connection(self, server_user, server_pass, switch_ip, switch_user, switch_pass):
+        """Exécute la récupération via la session Robont persistante (thread de travail)"""
         try:
-            # Récupérer les valeurs
-            server_host = "6.91.128.111"
-            server_user = self.server_user_entry.get().strip()
-            server_pass = self.server_pass_entry.get().strip()
-            switch_ip = self.switch_ip_entry.get().strip()
-            switch_user = self.switch_user_entry.get().strip()
-            switch_pass = self.switch_pass_entry.get().strip()
-            
-            # Étape 1: Connexion serveur
-            self.update_status("Connexion au serveur Robont...", '#3498db')
-            if not self.connect_to_server(server_host, server_user, server_pass):
+            session = self.get_robont_session(server_user, server_pass)
+            
+            # Étape 1: Session serveur (ouverte une fois, rouverte si perdue)
+            if not self.connect_to_server(session):
                 return  # Arrêter si connexion serveur échoue
             
-            # Étape 2: Connexion switch
+            # Étape 2: Saut vers le switch et récupération config
             self.update_status("Connexion au switch...", '#3498db')
-            if not self.connect_to_switch(switch_ip, switch_user, switch_pass):
-                return  # Arrêter si connexion switch échoue
+            status, config_data = session.fetch_configuration(
+                switch_ip, switch_user, switch_pass, on_progress=self.report_fetch_progress)
             
-            # Étape 3: Récupération config
-            self.update_status("Récupération de la configuration...", '#3498db')
-            config_data = self.get_configuration()
-            
-            if config_data:
+            if status == 'ok':
+                self.switch_hostname = self.extract_hostname(config_data)
                 # Sauvegarder les données pour téléchargement
                 self.config_data = config_data
+                # Index de recherche construit ici, hors du thread Tk
+                index = ConfigSearchIndex(config_data)
                 # Afficher dans l'interface
-                self.root.after(0, self.display_results, config_data)
+                self.ui.post(self.display_results, config_data, index)
                 self.update_status("Configuration récupérée avec succès!", '#27ae60')
             else:
-                self.update_status("Échec récupération configuration", '#e74c3c')
-                messagebox.showerror("Erreur", 
-                    "Impossible de récupérer la configuration du switch:\n"
-                    "• Vérifiez que la commande est supportée\n"
-                    "• Vérifiez les permissions de l'utilisateur")
+                self.report_switch_error(status)
                 
         except Exception as e:
             self.update_status("Erreur: " + str(e), '#e74c3c')
-            messagebox.showerror("Erreur", "Erreur inattendue: " + str(e))
+            self.show_message('error', "Erreur", "Erreur inattendue: " + str(e))
         finally:
             self.cleanup_connection()
     
-    def connect_to_server(self, host, username, password):
-        """Connexion au serveur Robont"""
+    def connect_to_server(self, session):
+        """Connexion au serveur Robont (seulement si la session n'est pas active)"""
+        if session.connected:
+            return True
+        
+        self.update_status("Connexion au serveur Robont...", '#3498db')
         try:
-            self.ssh_client = paramiko.SSHClient()
-            self.ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            
-            self.ssh_client.connect(
-                hostname=host,
-                port=22,
-                username=username,
-                password=password,
-                timeout=30
-            )
-            
-            self.channel = self.ssh_client.invoke_shell()
-            self.channel.settimeout(30)
-            time.sleep(2)
-            
-            # Lire prompt initial
-            self.read_channel_output(timeout=5)
+            session.ensure_connected()
             return True
             
         except paramiko.AuthenticationException:
             self.update_status("Échec authentification serveur", '#e74c3c')
-            messagebox.showerror("Erreur", "Mot de passe serveur incorrect")
+            self.show_message('error', "Erreur", "Mot de passe serveur incorrect")
             return False
         except Exception as e:
             self.update_status("Erreur serveur: " + str(e), '#e74c3c')
-            messagebox.showerror("Erreur", "Erreur connexion serveur: " + str(e))
-            return False
-    
-    def connect_to_switch(self, switch_ip, username, password):
-        """Connexion au switch"""
-        try:
-            ssh_cmd = "ssh " + username + "@" + switch_ip + "\n"
-            self.channel.send(ssh_cmd)
-            time.sleep(3)
-            
-            output = self.read_channel_output(timeout=15)
-            
-            # Vérifier les erreurs de connexion
-            if any(error in output.lower() for error in [
-                "connection refused", "connection timed out", "no route to host",
-                "host unreachable", "network is unreachable", "connection closed",
-                "could not resolve hostname", "name or service not known"
-            ]):
-                self.update_status("Problème de connexion au switch", '#e74c3c')
-                messagebox.showerror("Erreur de Connexion", 
-                    "Problème de connexion vers le switch:\n"
-                    "• Vérifiez l'adresse IP du switch\n"
-                    "• Vérifiez que le switch est accessible depuis le serveur Robont\n"
-                    "• Vérifiez la connectivité réseau")
-                return False
-            
-            # Si mot de passe demandé
-            if "password:" in output.lower():
-                if not password.strip():
-                    self.update_status("Mot de passe switch requis", '#e74c3c')
-                    messagebox.showerror("Erreur", "Mot de passe switch requis")
-                    return False
-                
-                self.channel.send(password + "\n")
-                time.sleep(3)
-                auth_output = self.read_channel_output(timeout=10)
-                
-                # Vérifier échec authentification
-                if any(word in auth_output.lower() for word in [
-                    "denied", "failed", "incorrect", "authentication failure",
-                    "access denied", "login failed", "invalid password"
-                ]):
-                    self.update_status("Mot de passe switch erroné", '#e74c3c')
-                    messagebox.showerror("Erreur d'Authentification", 
-                        "Mot de passe erroné pour le switch:\n"
-                        "• Vérifiez le mot de passe du switch\n"
-                        "• Assurez-vous que les credentials sont corrects")
-                    return False
-            
-            # Tentative d'entrer en mode CLI
-            self.channel.send("cli\n")
-            time.sleep(2)
-            cli_output = self.read_channel_output(timeout=5)
-            
-            self.update_status("Connexion switch réussie", '#27ae60')
-            return True
-            
-        except Exception as e:
-            self.update_status("Erreur switch: " + str(e), '#e74c3c')
-            messagebox.showerror("Erreur de Connexion", 
-                "Erreur inattendue lors de la connexion au switch:\n" + str(e))
+            self.show_message('error', "Erreur", "Erreur connexion serveur: " + str(e))
             return False
     
-    def get_configuration(self):
-        """Récupère la configuration avec la nouvelle commande"""
-        try:
-            # Nouvelle commande modifiée
-            config_cmd = "show configuration | display set | no-more\n"
-            self.channel.send(config_cmd)
-            time.sleep(5)
-            
-            output = self.read_channel_output(timeout=60)
-            
-            if output.strip():
-                # Extraire hostname
-                self.switch_hostname = self.extract_hostname(output)
-                return output
-            
-            return None
-            
-        except Exception as e:
-            print("Erreur récupération config: " + str(e))
-            return None
-    
-    def read_channel_output(self, timeout=15):
-        """Lit la sortie du channel"""
-        output = ""
-        start_time = time.time()
-        
-        while time.time() - start_time < timeout:
-            if self.channel.recv_ready():
-                data = self.channel.recv(4096).decode('utf-8', errors='ignore')
-                output += data
-                time.sleep(0.1)
-            else:
-                time.sleep(0.2)
-                if time.time() - start_time > 3 and output:
-                    break
-        
-        return output
+    def report_switch_error(self, status):
+        """Message d'erreur correspondant au statut de RobontSession.fetch_configuration"""
+        if status == 'connection':
+            self.update_status("Problème de connexion au switch", '#e74c3c')
+            self.show_message('error', "Erreur de Connexion", 
+                "Problème de connexion vers le switch:\n"
+                "• Vérifiez l'adresse IP du switch\n"
+                "• Vérifiez que le switch est accessible depuis le serveur Robont\n"
+                "• Vérifiez la connectivité réseau")
+        elif status == 'login':
+            self.update_status("Login switch erroné", '#e74c3c')
+            self.show_message('error', "Erreur d'Authentification", 
+                "Login erroné pour le switch:\n"
+                "• Vérifiez le nom d'utilisateur du switch\n"
+                "• Assurez-vous que l'utilisateur existe sur le switch")
+        elif status == 'password_required':
+            self.update_status("Mot de passe switch requis", '#e74c3c')
+            self.show_message('error', "Erreur", "Mot de passe switch requis")
+        elif status == 'password':
+            self.update_status("Mot de passe switch erroné", '#e74c3c')
+            self.show_message('error', "Erreur d'Authentification", 
+                "Mot de passe erroné pour le switch:\n"
+                "• Vérifiez le mot de passe du switch\n"
+                "• Assurez-vous que les credentials sont corrects")
+        else:
+            self.update_status("Échec récupération configuration", '#e74c3c')
+            self.show_message('error', "Erreur", 
+                "Impossible de récupérer la configuration du switch:\n"
+                "• Vérifiez que la commande est supportée\n"
+                "• Vérifiez les permissions de l'utilisateur")
     
     def extract_hostname(self, config_data):
         """Extrait le hostname"""
@@ -1184,11 +4191,26 @@ class NetworkManagementSuite:
         
         return "switch"
     
-    def display_results(self, config_data):
+    def show_text(self, widget, text):
+        """Affiche un texte (éventuellement très long) par insertion progressive"""
+        loader = self.text_loaders.get(str(widget))
+        if loader is None:
+            loader = self.text_loaders[str(widget)] = LazyTextInserter(widget)
+        loader.load(text)
+        return loader
+    
+    def widget_text(self, widget):
+        """Contenu complet d'un widget, y compris la partie pas encore insérée"""
+        loader = self.text_loaders.get(str(widget))
+        if loader is not None:
+            return loader.get()
+        return widget.get(1.0, tk.END)
+    
+    def display_results(self, config_data, index=None):
         """Affiche les résultats dans l'interface"""
         if hasattr(self, 'results_text'):
-            self.results_text.delete(1.0, tk.END)
-            self.results_text.insert(tk.END, config_data)
+            self.show_text(self.results_text, config_data)
+            self.results_search.set_index(index or ConfigSearchIndex(config_data))
             
             # Activer boutons
             self.save_btn.config(state='normal')
@@ -1205,7 +4227,7 @@ class NetworkManagementSuite:
             if not hasattr(self, 'results_text'):
                 return
                 
-            config_data = self.results_text.get(1.0, tk.END)
+            config_data = self.results_search.full_text() or self.widget_text(self.results_text)
             if not config_data.strip():
                 messagebox.showwarning("Attention", "Aucune configuration à sauvegarder")
                 return
@@ -1240,7 +4262,7 @@ class NetworkManagementSuite:
             if not hasattr(self, 'results_text'):
                 return
                 
-            config_data = self.results_text.get(1.0, tk.END)
+            config_data = self.results_search.full_text() or self.widget_text(self.results_text)
             if not config_data.strip():
                 messagebox.showwarning("Attention", "Aucune configuration à télécharger")
                 return
@@ -1258,7 +4280,7 @@ class NetworkManagementSuite:
             filename = filedialog.asksaveasfilename(
                 title="Télécharger la configuration",
                 defaultextension=".txt",
-                initialname=default_filename,
+                initialfile=default_filename,
                 filetypes=[
                     ("Fichiers texte", "*.txt"),
                     ("Tous les fichiers", "*.*")
@@ -1297,27 +4319,20 @@ class NetworkManagementSuite:
             return
             
         self.update_status("Test de connexion...", '#f39c12')
+        username = self.server_user_entry.get().strip()
+        password = self.server_pass_entry.get().strip()
         
         def test():
             try:
-                ssh_client = paramiko.SSHClient()
-                ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                
-                ssh_client.connect(
-                    hostname="6.91.128.111",
-                    port=22,
-                    username=self.server_user_entry.get().strip(),
-                    password=self.server_pass_entry.get().strip(),
-                    timeout=15
-                )
-                
-                ssh_client.close()
-                self.root.after(0, lambda: self.update_status("Test réussi!", '#27ae60'))
-                self.root.after(0, lambda: messagebox.showinfo("Test", "Connexion serveur réussie!"))
+                # La session ouverte pour le test est conservée pour la récupération
+                session = self.get_robont_session(username, password)
+                session.ensure_connected()
+                self.update_status("Test réussi!", '#27ae60')
+                self.show_message('info', "Test", "Connexion serveur réussie!")
                 
             except Exception as e:
-                self.root.after(0, lambda: self.update_status("Test échoué", '#e74c3c'))
-                self.root.after(0, lambda: messagebox.showerror("Test", "Échec connexion: " + str(e)))
+                self.update_status("Test échoué", '#e74c3c')
+                self.show_message('error', "Test", "Échec connexion: " + str(e))
         
         thread = threading.Thread(target=test)
         thread.daemon = True
@@ -1332,7 +4347,8 @@ class NetworkManagementSuite:
             self.switch_pass_entry.delete(0, tk.END)
             self.switch_ip_entry.delete(0, tk.END)
             self.switch_ip_entry.insert(0, "10.148.62.241")
-            self.results_text.delete(1.0, tk.END)
+            self.show_text(self.results_text, "")
+            self.results_search.set_index(None)
             self.hostname_label.config(text="")
             self.save_btn.config(state='disabled')
             self.download_btn.config(state='disabled')
@@ -1341,25 +4357,467 @@ class NetworkManagementSuite:
             self.update_status("Pret")
     
     def cleanup_connection(self):
-        """Nettoie les connexions"""
+        """Fin de récupération : la session Robont reste ouverte pour la suivante"""
         self.is_connecting = False
-        self.root.after(0, lambda: self.connect_btn.config(state='normal', text="SE CONNECTER ET RECUPERER CONFIG") if hasattr(self, 'connect_btn') else None)
-        self.root.after(0, lambda: self.progress_bar.stop() if hasattr(self, 'progress_bar') else None)
+        self.ui.post(lambda: self.connect_btn.config(state='normal', text="SE CONNECTER ET RECUPERER CONFIG") if hasattr(self, 'connect_btn') else None)
+        self.ui.post(lambda: self.progress_bar.stop() if hasattr(self, 'progress_bar') else None)
+    
+    def on_close(self):
+        """Fermeture de la fenêtre : fermeture de la session Robont"""
+        if self.batch_fetcher:
+            self.batch_fetcher.stop()
+        if self.config_import:
+            self.config_import.cancel()
+        self.ui.stop()
+        if self.robont_session:
+            self.robont_session.close()
+            self.robont_session = None
+        self.root.destroy()
+    
+    def show_batch_manager(self, parent):
+        """Affiche la récupération multi-switch"""
+        # Titre
+        title_frame = tk.Frame(parent, bg='#16a085', height=60)
+        title_frame.pack(fill='x', padx=0, pady=0)
+        title_frame.pack_propagate(False)
+        
+        title_label = tk.Label(title_frame, text="📋 Batch Multi-Switch", 
+                              font=('Arial', 16, 'bold'), fg='white', bg='#16a085')
+        title_label.pack(pady=15)
+        
+        main_frame = tk.Frame(parent, bg='#f0f0f0')
+        main_frame.pack(fill='both', expand=True, padx=20, pady=20)
+        
+        top_frame = tk.Frame(main_frame, bg='#f0f0f0')
+        top_frame.pack(fill='x', pady=(0, 15))
+        
+        # === LISTE DES SWITCHS ===
+        list_frame = tk.LabelFrame(top_frame, text="SWITCHS (une IP par ligne)", 
+                                 font=('Arial', 12, 'bold'), bg='#f0f0f0', fg='#2c3e50')
+        list_frame.pack(side='left', fill='both', expand=True, padx=(0, 10))
+        
+        self.batch_ips_text = scrolledtext.ScrolledText(list_frame, font=('Courier', 10), 
+                                                       height=10, width=30)
+        self.batch_ips_text.pack(fill='both', expand=True, padx=10, pady=(10, 5))
+        
+        tk.Button(list_frame, text="IMPORTER LISTE", font=('Arial', 10), bg='#3498db', fg='white',
+                 command=self.import_batch_list).pack(anchor='w', padx=10, pady=(0, 10))
+        
+        # === IDENTIFIANTS ET OPTIONS ===
+        options_frame = tk.LabelFrame(top_frame, text="IDENTIFIANTS ET OPTIONS", 
+                                    font=('Arial', 12, 'bold'), bg='#f0f0f0', fg='#2c3e50')
+        options_frame.pack(side='left', fill='both')
+        
+        fields = [("Utilisateur Robont:", 'batch_server_user_entry', ''),
+                  ("Mot de passe Robont:", 'batch_server_pass_entry', '*'),
+                  ("Utilisateur switch:", 'batch_switch_user_entry', ''),
+                  ("Mot de passe switch:", 'batch_switch_pass_entry', '*')]
+        for row, (label, attribute, show) in enumerate(fields):
+            tk.Label(options_frame, text=label, font=('Arial', 10), 
+                    bg='#f0f0f0').grid(row=row, column=0, sticky='w', padx=10, pady=5)
+            entry = tk.Entry(options_frame, font=('Arial', 10), width=20, show=show)
+            entry.grid(row=row, column=1, padx=10, pady=5)
+            setattr(self, attribute, entry)
+        
+        tk.Label(options_frame, text="Sessions parallèles:", font=('Arial', 10), 
+                bg='#f0f0f0').grid(row=4, column=0, sticky='w', padx=10, pady=5)
+        self.batch_workers_spin = tk.Spinbox(options_frame, from_=1, to=16, width=5, font=('Arial', 10))
+        self.batch_workers_spin.delete(0, 'end')
+        self.batch_workers_spin.insert(0, "4")
+        self.batch_workers_spin.grid(row=4, column=1, sticky='w', padx=10, pady=5)
+        
+        tk.Label(options_frame, text="Dossier de sortie:", font=('Arial', 10), 
+                bg='#f0f0f0').grid(row=5, column=0, sticky='w', padx=10, pady=5)
+        self.batch_output_var = tk.StringVar(value=os.path.join(os.getcwd(), "batch_configs"))
+        tk.Button(options_frame, text="CHOISIR...", font=('Arial', 9),
+                 command=self.select_batch_folder).grid(row=5, column=1, sticky='w', padx=10, pady=5)
+        tk.Label(options_frame, textvariable=self.batch_output_var, font=('Arial', 8), bg='#f0f0f0',
+                fg='#7f8c8d', wraplength=300, justify='left').grid(row=6, column=0, columnspan=2,
+                                                                   sticky='w', padx=10, pady=(0, 5))
+        
+        # === BOUTONS D'ACTION ===
+        buttons_frame = tk.Frame(main_frame, bg='#f0f0f0')
+        buttons_frame.pack(fill='x', pady=(0, 10))
+        
+        self.batch_start_btn = tk.Button(buttons_frame, text="LANCER LA RECUPERATION", 
+                                       font=('Arial', 12, 'bold'), bg='#27ae60', fg='white',
+                                       command=self.start_batch, height=2, width=28)
+        self.batch_start_btn.pack(side='left', padx=5)
+        
+        self.batch_stop_btn = tk.Button(buttons_frame, text="ARRETER", 
+                                      font=('Arial', 10), bg='#e74c3c', fg='white',
+                                      command=self.stop_batch, height=2, width=10, state='disabled')
+        self.batch_stop_btn.pack(side='left', padx=5)
+        
+        tk.Button(buttons_frame, text="OUVRIR DOSSIER", font=('Arial', 10), bg='#9b59b6', fg='white',
+                 command=lambda: self.open_folder(self.batch_output_var.get()),
+                 height=2, width=15).pack(side='left', padx=5)
+        
+        self.batch_summary_label = tk.Label(buttons_frame, text="", font=('Arial', 10, 'bold'),
+                                          bg='#f0f0f0', fg='#2c3e50')
+        self.batch_summary_label.pack(side='right', padx=5)
+        
+        # === TABLEAU D'ÉTAT ===
+        table_frame = tk.LabelFrame(main_frame, text="ETAT PAR SWITCH", 
+                                  font=('Arial', 12, 'bold'), bg='#f0f0f0', fg='#2c3e50')
+        table_frame.pack(fill='both', expand=True)
+        
+        columns = [('ip', "IP", 120), ('hostname', "Hostname", 180), ('status', "Statut", 220),
+                   ('duration', "Durée", 80), ('file', "Fichier", 400)]
+        self.batch_tree = ttk.Treeview(table_frame, columns=[c[0] for c in columns], show='headings')
+        for column, heading, width in columns:
+            self.batch_tree.heading(column, text=heading)
+            self.batch_tree.column(column, width=width, anchor='w')
+        self.batch_tree.tag_configure('ok', foreground='#27ae60')
+        self.batch_tree.tag_configure('error', foreground='#e74c3c')
+        
+        scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=self.batch_tree.yview)
+        self.batch_tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side='right', fill='y', pady=10)
+        self.batch_tree.pack(fill='both', expand=True, padx=10, pady=10)
+    
+    def import_batch_list(self):
+        """Importe une liste d'IP depuis un fichier texte ou CSV"""
+        file_path = filedialog.askopenfilename(
+            title="Sélectionner une liste de switchs",
+            filetypes=[("Fichiers texte", "*.txt *.csv"), ("Tous les fichiers", "*.*")]
+        )
+        if not file_path:
+            return
         
         try:
-            if self.channel:
-                self.channel.send("exit\n")
-                time.sleep(1)
-                self.channel.send("exit\n")
-                time.sleep(1)
-                self.channel.close()
-            if self.ssh_client:
-                self.ssh_client.close()
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                content = f.read()
+        except Exception as e:
+            messagebox.showerror("Erreur", f"Impossible de lire le fichier:\n{e}")
+            return
+        
+        ips = extract_ip_addresses(content)
+        if not ips:
+            messagebox.showwarning("Attention", "Aucune adresse IP trouvée dans le fichier")
+            return
+        self.batch_ips_text.delete('1.0', 'end')
+        self.batch_ips_text.insert('1.0', '\n'.join(ips))
+    
+    def select_batch_folder(self):
+        """Choisit le dossier de sortie du lot"""
+        folder = filedialog.askdirectory(title="Dossier de sortie", initialdir=self.batch_output_var.get())
+        if folder:
+            self.batch_output_var.set(folder)
+    
+    def start_batch(self):
+        """Lance la récupération multi-switch"""
+        if self.batch_fetcher:
+            return
+        
+        ips = extract_ip_addresses(self.batch_ips_text.get('1.0', 'end'))
+        if not ips:
+            messagebox.showerror("Erreur", "Veuillez saisir au moins une adresse IP de switch")
+            return
+        
+        server_user = self.batch_server_user_entry.get().strip()
+        server_pass = self.batch_server_pass_entry.get()
+        switch_user = self.batch_switch_user_entry.get().strip()
+        if not server_user or not server_pass or not switch_user:
+            messagebox.showerror("Erreur", "Veuillez renseigner les identifiants Robont et switch")
+            return
+        
+        try:
+            workers = max(1, int(self.batch_workers_spin.get()))
+        except ValueError:
+            workers = 4
+        
+        output_dir = os.path.join(self.batch_output_var.get(), datetime.now().strftime("%Y%m%d_%H%M%S"))
+        
+        self.batch_rows = {ip: {'status': "En attente"} for ip in ips}
+        self.batch_tree.delete(*self.batch_tree.get_children())
+        for ip in ips:
+            self.batch_tree.insert('', 'end', iid=ip, values=self.batch_row_values(ip, self.batch_rows[ip]))
+        
+        self.batch_fetcher = BatchFetcher(
+            server_user, server_pass, switch_user, self.batch_switch_pass_entry.get(), output_dir,
+            workers=workers,
+            on_update=lambda ip, fields: self.ui.post_latest(('batch', ip), self.update_batch_row, ip, fields),
+            on_done=lambda: self.ui.post(self.finish_batch, output_dir))
+        
+        self.batch_start_btn.config(state='disabled')
+        self.batch_stop_btn.config(state='normal')
+        self.update_batch_summary()
+        self.batch_fetcher.start(ips)
+    
+    def stop_batch(self):
+        """Demande l'arrêt du lot (les switchs en cours se terminent)"""
+        if self.batch_fetcher:
+            self.batch_fetcher.stop()
+            self.batch_stop_btn.config(state='disabled')
+    
+    def batch_row_values(self, ip, row):
+        """Valeurs affichées d'une ligne du tableau"""
+        duration = f"{row['duration']:.1f} s" if 'duration' in row else ''
+        return (ip, row.get('hostname', ''), row['status'], duration,
+                os.path.basename(row.get('file', '')))
+    
+    def batch_row_tags(self, row):
+        """Couleur d'une ligne selon son statut"""
+        if row.get('error'):
+            return ('error',)
+        return ('ok',) if row.get('file') else ()
+    
+    def batch_widget_alive(self):
+        """Vrai si la vue Batch est affichée"""
+        return hasattr(self, 'batch_tree') and self.batch_tree.winfo_exists()
+    
+    def update_batch_row(self, ip, fields):
+        """Met à jour l'état d'un switch (thread principal)"""
+        row = self.batch_rows.setdefault(ip, {})
+        row.update(fields)
+        if self.batch_widget_alive():
+            self.batch_tree.item(ip, values=self.batch_row_values(ip, row), tags=self.batch_row_tags(row))
+            self.update_batch_summary()
+    
+    def update_batch_summary(self):
+        """Compteurs du lot"""
+        if not self.batch_widget_alive():
+            return
+        done = sum(1 for row in self.batch_rows.values() if row.get('file'))
+        failed = sum(1 for row in self.batch_rows.values() if row.get('error'))
+        total = len(self.batch_rows)
+        self.batch_summary_label.config(
+            text=f"{done} OK / {failed} échec(s) / {total} switch(s)" if total else "")
+    
+    def finish_batch(self, output_dir):
+        """Fin du lot : réactive les boutons et affiche le bilan"""
+        self.batch_fetcher = None
+        if self.batch_widget_alive():
+            self.batch_start_btn.config(state='normal')
+            self.batch_stop_btn.config(state='disabled')
+            self.batch_output_var.set(os.path.dirname(output_dir))
+            self.update_batch_summary()
+        
+        done = sum(1 for row in self.batch_rows.values() if row.get('file'))
+        messagebox.showinfo("Batch terminé",
+                            f"{done}/{len(self.batch_rows)} configuration(s) récupérée(s)\n\nDossier: {output_dir}")
+    
+    def open_folder(self, folder):
+        """Ouvre un dossier dans l'explorateur du système"""
+        if not os.path.isdir(folder):
+            messagebox.showwarning("Attention", "Le dossier n'existe pas encore")
+            return
+        try:
+            os.startfile(folder)  # Windows
         except:
+            try:
+                os.system(f'open "{folder}"')  # macOS
+            except:
+                os.system(f'xdg-open "{folder}"')  # Linux
+
+# === LIGNE DE COMMANDE ===
+
+GENERATED_SECTIONS = ['dot1x', 'cleanup', 'radius']
+
+def read_password(value, variable, prompt):
+    """Mot de passe : option, variable d'environnement, sinon saisie masquée"""
+    if value:
+        return value
+    if os.environ.get(variable):
+        return os.environ[variable]
+    import getpass
+    return getpass.getpass(prompt)
+
+def read_config_file(path):
+    """Contenu d'un fichier de configuration ('-' pour l'entrée standard)"""
+    if path == '-':
+        return sys.stdin.read()
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        return f.read()
+
+def cli_fetch(args):
+    """Récupère la configuration d'un switch via le serveur Robont"""
+    session = RobontSession(args.user, read_password(args.password, 'ROBONT_PASSWORD', "Mot de passe Robont: "))
+    switch_pass = read_password(args.switch_password, 'SWITCH_PASSWORD', "Mot de passe switch: ")
+    try:
+        status, output = session.fetch_configuration(args.switch_ip, args.switch_user, switch_pass)
+    finally:
+        session.close()
+    
+    if status != 'ok':
+        print(f"Erreur: {BatchFetcher.STATUS_MESSAGES.get(status, status)}", file=sys.stderr)
+        return 1
+    
+    config = RobontSession.clean_output(output)
+    hostname = RobontSession.extract_hostname(config)
+    if args.output == '-':
+        sys.stdout.write(config + "\n")
+        return 0
+    
+    path = args.output or re.sub(r'[<>:"/\\|?*]', '_', hostname or "switch") + ".txt"
+    write_switch_config(path, args.switch_ip, hostname, config)
+    print(path)
+    return 0
+
+def cli_parse(args):
+    """Affiche les informations du switch et les ports access d'une configuration"""
+    content = read_config_file(args.file)
+    summary = (args.file != '-' and load_config_summary(args.file, content)) or summarize_config(content)
+    switch_info = summary['switch_info']
+    interfaces = summary['access_interfaces']
+    
+    if args.json:
+        json.dump({'file': args.file, 'switch_info': switch_info, 'access_interfaces': interfaces},
+                  sys.stdout, indent=2, ensure_ascii=False)
+        print()
+        return 0
+    
+    print(f"Hostname:          {switch_info.get('hostname', 'Non détecté')}")
+    print(f"IP Management:     {switch_info.get('management_ip', 'Non détectée')}")
+    print(f"Profil de site:    {switch_info.get('site', '-')}")
+    print(f"Interfaces Access: {len(interfaces)} détectées")
+    for i in range(0, len(interfaces), 6):
+        print("   " + "  ".join(interfaces[i:i+6]))
+    return 0
+
+def cli_generate(args):
+    """Génère les configurations ISE (802.1X, cleanup, RADIUS) d'une configuration"""
+    parser = ConfigurationParser(read_config_file(args.file))
+    switch_info = parser.get_switch_info()
+    interfaces = parser.get_interfaces()
+    only_missing = not args.all
+    generators = {
+        'dot1x': ("802.1X CONFIGURATION", lambda: parser.iter_dot1x_config(interfaces, only_missing)),
+        'cleanup': ("CLEANUP CONFIGURATION", lambda: parser.iter_cleanup_config(interfaces, only_missing)),
+        'radius': ("RADIUS CONFIGURATION",
+                   lambda: parser.iter_radius_config(switch_info.get('management_ip'), only_missing)),
+    }
+    sections = GENERATED_SECTIONS if args.section == 'all' else [args.section]
+    
+    errors = SetSyntaxValidator.validate(itertools.chain.from_iterable(
+        generators[section][1]() for section in sections))
+    for number, line, reason in errors:
+        print(f"Ligne {number}: {line}\n   → {reason}", file=sys.stderr)
+    if errors and not args.force:
+        print(f"{len(errors)} ligne(s) invalide(s), rien n'est écrit (--force pour ignorer)", file=sys.stderr)
+        return 2
+    
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        for section in sections:
+            title, generate = generators[section]
+            if len(sections) > 1:
+                output.write(f"# {title}\n")
+                output.write("#" + "-"*50 + "\n")
+            stream_config_lines(generate(), output)
+            output.write("\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 0
+
+def cli_batch(args):
+    """Récupère les configurations d'une liste de switchs avec un pool de sessions"""
+    ips = []
+    for item in args.switches:
+        content = read_config_file(item) if item == '-' or os.path.isfile(item) else item
+        ips.extend(ip for ip in extract_ip_addresses(content) if ip not in ips)
+    if not ips:
+        print("Erreur: aucune adresse IP de switch", file=sys.stderr)
+        return 1
+    
+    server_pass = read_password(args.password, 'ROBONT_PASSWORD', "Mot de passe Robont: ")
+    switch_pass = read_password(args.switch_password, 'SWITCH_PASSWORD', "Mot de passe switch: ")
+    results = {}
+    done = threading.Event()
+    
+    def on_update(ip, fields):
+        # Seuls les états finaux sont affichés
+        if 'duration' not in fields and not fields.get('error') and fields['status'] != "Annulé":
+            return
+        results[ip] = fields
+        duration = f"{fields['duration']:.1f}s" if 'duration' in fields else '-'
+        print(f"{ip:<15} {duration:>7}  {fields['status']}  {fields.get('file', '')}", flush=True)
+    
+    fetcher = BatchFetcher(args.user, server_pass, args.switch_user, switch_pass, args.output_dir,
+                           workers=args.workers, on_update=on_update, on_done=done.set)
+    started = time.monotonic()
+    fetcher.start(ips)
+    try:
+        while not done.wait(0.5):
             pass
+    except KeyboardInterrupt:
+        fetcher.stop()
+        done.wait()
+    
+    failed = [ip for ip in ips if 'file' not in results.get(ip, {})]
+    print(f"{len(ips) - len(failed)}/{len(ips)} configuration(s) en {time.monotonic() - started:.1f}s "
+          f"dans {args.output_dir}", file=sys.stderr)
+    return 1 if failed else 0
+
+def build_cli_parser():
+    """Analyseur des arguments de la ligne de commande"""
+    import argparse
+    
+    cli = argparse.ArgumentParser(prog="network_management_suite.py",
+                                  description="Network Management Suite v2.0")
+    commands = cli.add_subparsers(dest='command', required=True)
+    
+    commands.add_parser('gui', help="Interface graphique (par défaut)")
+    
+    def add_credentials(command):
+        command.add_argument('-u', '--user', required=True, help="Utilisateur Robont")
+        command.add_argument('-p', '--password', help="Mot de passe Robont (ou $ROBONT_PASSWORD)")
+        command.add_argument('--switch-user', required=True, help="Utilisateur switch")
+        command.add_argument('--switch-password', help="Mot de passe switch (ou $SWITCH_PASSWORD)")
+    
+    fetch = commands.add_parser('fetch', help="Récupère la configuration d'un switch")
+    fetch.add_argument('switch_ip')
+    add_credentials(fetch)
+    fetch.add_argument('-o', '--output', help="Fichier de sortie ('-' pour stdout, <hostname>.txt par défaut)")
+    fetch.set_defaults(handler=cli_fetch)
+    
+    parse = commands.add_parser('parse', help="Analyse une configuration 'display set'")
+    parse.add_argument('file', help="Fichier de configuration ('-' pour stdin)")
+    parse.add_argument('--json', action='store_true', help="Sortie JSON")
+    parse.set_defaults(handler=cli_parse)
+    
+    generate = commands.add_parser('generate', help="Génère les configurations ISE")
+    generate.add_argument('file', help="Fichier de configuration ('-' pour stdin)")
+    generate.add_argument('-s', '--section', choices=GENERATED_SECTIONS + ['all'], default='all')
+    generate.add_argument('-o', '--output', default='-', help="Fichier de sortie (stdout par défaut)")
+    generate.add_argument('--all', action='store_true',
+                          help="Inclut les lignes déjà présentes dans la configuration")
+    generate.add_argument('--force', action='store_true', help="Écrit malgré les lignes invalides")
+    generate.set_defaults(handler=cli_generate)
+    
+    batch = commands.add_parser('batch', help="Récupère les configurations d'une liste de switchs")
+    batch.add_argument('switches', nargs='+', help="IP ou fichiers contenant des IP ('-' pour stdin)")
+    add_credentials(batch)
+    batch.add_argument('-w', '--workers', type=int, default=4, help="Sessions Robont parallèles")
+    batch.add_argument('-o', '--output-dir',
+                       default=os.path.join("batch_configs", datetime.now().strftime("%Y%m%d_%H%M%S")))
+    batch.set_defaults(handler=cli_batch)
+    
+    return cli
+
+def main(argv=None):
+    """Point d'entrée : interface graphique par défaut, sous-commandes sinon"""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv == ['gui']:
+        return run_gui()
+    
+    args = build_cli_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except KeyboardInterrupt:
+        return 130
+    except BrokenPipeError:
+        # Sortie tronquée par le lecteur (| head) : fin silencieuse
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except Exception as e:
+        print(f"Erreur: {e}", file=sys.stderr)
+        return 1
 
-def main():
-    """Fonction principale"""
+def run_gui():
+    """Lance l'interface graphique"""
     try:
         # Initialisation de l'interface
         root = tk.Tk()
@@ -1395,6 +4853,10 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    if sys.argv[1:] and sys.argv[1:] != ['gui']:
+        # Ligne de commande : ni Tk ni bannière
+        sys.exit(main())
+    
     print("=== Network Management Suite v2.0 ===")
     print("Démarrage de l'application...")
     try:
@@ -26,6 +26,23 @@ export interface ConfigurationData {
   message: string;
 }
 
+export interface ParsedConfigurationResult {
+  index: number;
+  file: string;
+  error: string | null;
+  duration: number;
+  hostname?: string | null;
+  management_ip?: string | null;
+  site?: string | null;
+  access_interfaces?: string[];
+  outputs?: {
+    dot1x: string;
+    cleanup: string;
+    radius: string;
+  };
+  invalid_lines?: number;
+}
+
 export class BridgeClient {
   private baseURL: string;
   private isAvailable: boolean = false;
@@ -203,6 +220,65 @@ export class BridgeClient {
     }
   }
 
+  /**
+   * Analyse côté serveur (POST /parse) : un résultat par fichier, dans l'ordre de fin d'analyse
+   */
+  async parseConfigurations(
+    files: File[],
+    onResult: (result: ParsedConfigurationResult) => void,
+    onlyMissing: boolean = true
+  ): Promise<BridgeResponse<number>> {
+    if (!this.isAvailable) {
+      throw new Error('Bridge server non disponible');
+    }
+
+    const form = new FormData();
+    files.forEach(file => form.append('files', file, file.name));
+
+    try {
+      const response = await fetch(`${this.baseURL}/parse?only_missing=${onlyMissing}`, {
+        method: 'POST',
+        mode: 'cors',
+        body: form,
+      });
+
+      if (!response.ok || !response.body) {
+        const data = await response.json().catch(() => ({}));
+        return {
+          success: false,
+          error: data.detail || 'Erreur analyse des configurations'
+        };
+      }
+
+      // Réponse NDJSON : chaque ligne complète est un résultat
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      let count = 0;
+
+      while (true) {
+        const { done, value } = await reader.read();
+        buffer += decoder.decode(value, { stream: !done });
+        const lines = buffer.split('\n');
+        buffer = lines.pop() ?? '';
+        for (const line of lines) {
+          if (line.trim()) {
+            onResult(JSON.parse(line));
+            count++;
+          }
+        }
+        if (done) break;
+      }
+
+      return { success: true, data: count };
+    } catch (error) {
+      return {
+        success: false,
+        error: `Erreur réseau: ${error instanceof Error ? error.message : 'Erreur inconnue'}`
+      };
+    }
+  }
+
   /**
    * Getter pour le statut de disponibilité
    */
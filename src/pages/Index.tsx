@@ -1,6 +1,7 @@
 import { useState, useEffect } from 'react';
 import { Link, useLocation } from 'react-router-dom';
 import { saveJuniperUpload, loadJuniperUpload, saveJuniperMultiUpload, loadJuniperMultiUpload } from '@/lib/storage';
+import { bridgeClient, ParsedConfigurationResult } from '@/lib/bridge';
 import { Button } from '@/components/ui/button';
 
 import { SwitchInfo } from '@/components/SwitchInfo';
@@ -17,7 +18,7 @@ import JSZip from 'jszip';
 interface ParsedResult {
   filename: string;
   configContent: string;
-  parser: ConfigurationParser;
+  parser?: ConfigurationParser;
   switchInfo: any;
   interfaces: any[];
   dot1xConfig: string;
@@ -37,7 +38,65 @@ const Index = () => {
     const dot1xConfig = parser.generateDot1xConfigWildcard(interfaces);
     const cleanupConfig = parser.generateCleanupConfigWildcard(interfaces);
     const radiusConfig = parser.getRadiusConfig(switchInfo?.managementIp);
-    
+
+    return {
+      filename,
+      configContent: content,
+      parser,
+      switchInfo,
+      interfaces,
+      dot1xConfig,
+      cleanupConfig,
+      radiusConfig,
+      debugInfo: buildDebugInfo(content)
+    };
+  };
+
+  // Result computed by the bridge (POST /parse): only the switch info is still
+  // parsed locally, access detection and generation run server-side
+  const createBridgeResult = (content: string, filename: string, parsed: ParsedConfigurationResult): ParsedResult => {
+    const switchInfo = new ConfigurationParser(content).getSwitchInfo();
+    return {
+      filename,
+      configContent: content,
+      switchInfo: {
+        ...switchInfo,
+        hostname: parsed.hostname || switchInfo.hostname,
+        managementIp: parsed.management_ip || switchInfo.managementIp
+      },
+      interfaces: (parsed.access_interfaces || []).map(name => ({ name, config: [], isAccess: true })),
+      dot1xConfig: parsed.outputs?.dot1x || '',
+      cleanupConfig: parsed.outputs?.cleanup || '',
+      radiusConfig: parsed.outputs?.radius || '',
+      debugInfo: buildDebugInfo(content)
+    };
+  };
+
+  // Parse through the bridge when it is up so the tab is not blocked,
+  // falling back to the local parser for any file the bridge did not return
+  const analyseFiles = async (files: { content: string; filename: string }[]) => {
+    const parsed: (ParsedResult | undefined)[] = new Array(files.length);
+
+    if (await bridgeClient.checkAvailability()) {
+      const response = await bridgeClient.parseConfigurations(
+        files.map(file => new File([file.content], file.filename)),
+        (result) => {
+          const file = files[result.index];
+          if (file && !result.error) {
+            parsed[result.index] = createBridgeResult(file.content, file.filename, result);
+            setResults(parsed.filter((item): item is ParsedResult => item !== undefined));
+          }
+        }
+      );
+      if (!response.success) {
+        console.warn('Bridge parse failed, using local parser:', response.error);
+      }
+    }
+
+    setResults(files.map((file, index) => parsed[index] ?? createParsedResult(file.content, file.filename)));
+  };
+
+  const buildDebugInfo = (content: string) => {
     const lines = content.split('\n');
     const vlan160Lines = lines.filter(line => line.includes('irb.160') || line.includes('vlan.160') || line.includes('vlan unit 160'));
     const accessLines = lines.filter(line => 
@@ -48,7 +107,7 @@ const Index = () => {
       line.match(/^set interfaces (ge|xe|et)-\d+\/\d+\/\d+/)
     );
     
-    const debugInfo = {
+    return {
       totalLines: lines.length,
       vlan160Matches: vlan160Lines.length,
       vlan160Samples: vlan160Lines.slice(0, 3),
@@ -61,23 +120,10 @@ const Index = () => {
         et: interfaceLines.filter(l => l.includes('et-')).length,
       }
     };
-
-    return {
-      filename,
-      configContent: content,
-      parser,
-      switchInfo,
-      interfaces,
-      dot1xConfig,
-      cleanupConfig,
-      radiusConfig,
-      debugInfo
-    };
   };
 
   const handleFileRead = (content: string, name: string) => {
-    const result = createParsedResult(content, name);
-    setResults([result]);
+    analyseFiles([{ content, filename: name }]);
     // Save single file for compatibility
     saveJuniperUpload({ configContent: content, filename: name });
     // Save as multi-file format
@@ -85,8 +131,7 @@ const Index = () => {
   };
 
   const handleFilesRead = (files: { content: string; filename: string }[]) => {
-    const newResults = files.map(file => createParsedResult(file.content, file.filename));
-    setResults(newResults);
+    analyseFiles(files);
     // Save to multi-file storage
     saveJuniperMultiUpload({ 
       files: files.map(f => ({ configContent: f.content, filename: f.filename }))
@@ -181,18 +226,14 @@ ${result.radiusConfig}
     // Priority 2: Load multi-file uploads from storage
     const savedMultiUpload = loadJuniperMultiUpload();
     if (savedMultiUpload && savedMultiUpload.files.length > 0) {
-      const loadedResults = savedMultiUpload.files.map(file => 
-        createParsedResult(file.configContent, file.filename)
-      );
-      setResults(loadedResults);
+      analyseFiles(savedMultiUpload.files.map(file => ({ content: file.configContent, filename: file.filename })));
       return;
     }
     
     // Priority 3: Load single file upload for backward compatibility
     const savedUpload = loadJuniperUpload();
     if (savedUpload) {
-      const result = createParsedResult(savedUpload.configContent, savedUpload.filename);
-      setResults([result]);
+      analyseFiles([{ content: savedUpload.configContent, filename: savedUpload.filename }]);
     }
   }, [location.state]);
 